@@ -8,6 +8,22 @@ import time
 import queue
 import webbrowser
 import platform
+import subprocess
+import json
+import socket
+import socketserver
+import uuid
+import shutil
+import tempfile
+import hashlib
+import hmac
+import secrets
+import argparse
+import inspect
+import re
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # 버전 정보
 APP_VERSION = "1.0.0"
@@ -78,6 +94,1964 @@ def check_dependencies():
         pass
 
 
+# 해상도별 인코딩 파라미터 (FFMPEG 직접 호출 방식)
+ENCODING_PARAMS = {
+    1080: {"bitrate": "2.5M", "maxrate": "2.75M", "bufsize": "5M", "crf": "24"},
+    720: {"bitrate": "1.8M", "maxrate": "2.0M", "bufsize": "3.6M", "crf": "24"},
+    480: {"bitrate": "1.0M", "maxrate": "1.2M", "bufsize": "2.0M", "crf": "24"},
+    360: {"bitrate": "0.3M", "maxrate": "0.4M", "bufsize": "0.8M", "crf": "26"},
+}
+
+
+def get_encoding_params(height, tier=0, rate_factor=1.0):
+    """해상도에 따른 최적 파라미터 선택 (표에 없는 해상도는 그 이하의 가장 가까운 단계, 360p 미만은 360p 값 사용)
+    
+    tier는 화질 검사 미달 시 재인코딩 단계로, 한 단계마다 한 단계 위 해상도의 비트레이트와
+    2만큼 낮은 CRF를 사용합니다. rate_factor는 샘플 인코딩으로 정한 비트레이트 배율로,
+    비트레이트에 곱하고 CRF는 절반마다 6씩 올립니다.
+    """
+    heights = sorted(ENCODING_PARAMS)
+    base = max((index for index, step in enumerate(heights) if step <= height), default=0)
+    params = dict(ENCODING_PARAMS[heights[base]])
+    if tier:
+        upper = ENCODING_PARAMS[heights[min(base + tier, len(heights) - 1)]]
+        params.update(bitrate=upper["bitrate"], maxrate=upper["maxrate"], bufsize=upper["bufsize"])
+        params["crf"] = str(max(0, int(params["crf"]) - 2 * tier))
+    if rate_factor != 1.0:
+        for key in ("bitrate", "maxrate", "bufsize"):
+            params[key] = f"{float(params[key].rstrip('M')) * rate_factor:.2f}M"
+        params["crf"] = str(min(51, int(params["crf"]) + round(-6 * math.log2(rate_factor))))
+    return params
+
+
+def get_video_codec():
+    """운영 체제에 따라 최적의 코덱 선택 (코덱, 프로파일, 코덱 태그)"""
+    if platform.system() == "Windows":
+        return "libx265", "main", "hvc1"  # Windows는 H.265 지원이 더 좋음
+    # Mac에서는 H.264가 더 안정적일 수 있음
+    return "libx264", "high", "avc1"
+
+
+def get_seek_args(time_range):
+    """입력 측 탐색(-ss를 -i 앞에 배치)으로 구간만 디코딩하도록 FFMPEG 인자 구성"""
+    if not time_range:
+        return [], []
+    start, end = time_range
+    input_args, output_args = [], []
+    if start:
+        input_args += ["-ss", f"{start:.3f}"]
+    if end is not None:
+        output_args += ["-t", f"{end - (start or 0):.3f}"]
+    return input_args, output_args
+
+
+def get_encoder_args(height, tier=0, rate_factor=1.0):
+    """출력 비디오 / 오디오 인코더 인자 (코덱, 프로파일, 비트레이트, CRF)"""
+    params = get_encoding_params(height, tier, rate_factor)
+    codec, profile, _ = get_video_codec()
+    return [
+        "-c:v", codec,
+        "-profile:v", profile,
+        "-level:v", "4.1",
+        "-b:v", params["bitrate"],
+        "-maxrate", params["maxrate"],
+        "-bufsize", params["bufsize"],
+        "-c:a", "aac",
+        "-b:a", "128k",
+        "-pix_fmt", "yuv420p",
+        "-movflags", "+faststart",
+        "-preset", "medium",
+        "-crf", params["crf"],
+    ]
+
+
+def build_ffmpeg_command(input_path, output_path, height, fps, threads=None, time_range=None, tier=0, crop=None,
+                         decimate=False, rate_factor=1.0, audio=True):
+    """HEVC/H.265 파라미터와 일치하는 FFMPEG 명령어 구성
+    
+    threads 지정 시 인코더 스레드 수를 제한하고, time_range(시작, 끝) 지정 시 해당 구간만 변환합니다.
+    tier는 화질 검사 미달로 재인코딩할 때의 품질 단계, crop은 크기 변경 전에 잘라낼 검은 여백 영역입니다.
+    decimate=True면 거의 같은 프레임을 제거하고 가변 프레임 레이트(최대 fps)로 출력합니다.
+    rate_factor는 샘플 인코딩으로 정한 비트레이트 배율, audio=False면 오디오를 제외하고 비디오만 인코딩합니다.
+    오디오는 build_audio_command와 같이 모든 트랙을 유지합니다 (오디오를 따로 인코딩하는지와 관계없이 같은 출력).
+    """
+    input_args, output_args = get_seek_args(time_range)
+    video_filter = get_scale_filter(height, crop)
+    if decimate:
+        # 축소된 프레임을 목표 FPS로 맞춘 후 비교하여 중복 프레임 제거 (-r은 다시 복제하므로 사용하지 않음)
+        rate_args = ["-vf", f"{video_filter},fps={fps},mpdecimate", "-vsync", "vfr"]
+    else:
+        rate_args = ["-vf", video_filter, "-r", str(fps)]
+    
+    cmd = [
+        "ffmpeg", "-y",
+        *input_args,
+        "-i", input_path,
+        *output_args,
+        "-map", "0:v:0",
+        *(["-map", "0:a?"] if audio else ["-an"]),
+        *rate_args,
+        *get_encoder_args(height, tier, rate_factor),
+    ]
+    if threads:
+        cmd += ["-threads", str(threads)]
+    return cmd + [output_path]
+
+
+# 외부 프로세스 실행 설정 (FFMPEG / ffprobe 공통)
+PROCESS_STDERR_TAIL_LINES = 50  # 오류 보고용으로 보관하는 stderr 마지막 줄 수
+PROCESS_IDLE_TIMEOUT = 600  # 초, 출력이 없는 상태로 이 시간이 지나면 멈춘 것으로 보고 종료
+PROCESS_POLL_INTERVAL = 0.5  # 초, 종료 / 시간 초과 / 중지 요청 확인 주기
+PROCESS_KILL_GRACE = 5  # 초, 종료 요청 후 강제 종료까지 대기 시간
+PROCESS_READ_SIZE = 65536
+
+FFMPEG_PROGRESS_PATTERN = re.compile(r"(frame|fps|time|speed)=\s*(\S+)")
+
+
+def parse_ffmpeg_progress(line):
+    """FFMPEG 진행 줄 (frame=... fps=... time=... speed=...) 파싱 - 진행 줄이 아니면 None"""
+    fields = dict(FFMPEG_PROGRESS_PATTERN.findall(line))
+    if "time" not in fields:
+        return None
+    progress = {}
+    try:
+        progress["time"] = parse_time(fields["time"])
+    except ValueError:
+        return None  # 시작 직후에는 time=N/A
+    for key, convert in (("frame", int), ("fps", float), ("speed", lambda value: float(value.rstrip("x")))):
+        try:
+            progress[key] = convert(fields[key])
+        except (KeyError, ValueError):
+            progress[key] = None
+    return progress
+
+
+def stop_process(process):
+    """프로세스 종료 요청 후 응답이 없으면 강제 종료"""
+    try:
+        process.terminate()
+        process.wait(PROCESS_KILL_GRACE)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    except OSError:
+        pass
+
+
+def read_process_rss_mb(pid):
+    """프로세스의 메모리 사용량 (MB) - /proc/<pid>/status 또는 psutil, 확인할 수 없으면 None"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+    except Exception:
+        return None
+
+
+def read_ffmpeg_stderr(stream, tail, on_progress=None, on_output=None):
+    """stderr를 끝까지 읽어 진행 줄은 on_progress(dict)로 전달하고 나머지 줄은 tail(deque)에 보관
+    
+    FFMPEG 진행 줄은 '\r'로 끝나므로 줄바꿈과 함께 구분하고, 출력이 있을 때마다 on_output()을 호출합니다.
+    """
+    def handle_line(raw_line):
+        line = raw_line.decode("utf-8", "replace").strip()
+        if not line:
+            return
+        progress = parse_ffmpeg_progress(line) if on_progress else None
+        if progress:
+            on_progress(progress)
+        else:
+            tail.append(line)
+    
+    pending = b""
+    while True:
+        chunk = stream.read1(PROCESS_READ_SIZE)
+        if not chunk:
+            break
+        if on_output:
+            on_output()
+        lines = re.split(rb"[\r\n]", pending + chunk)
+        pending = lines.pop()[-PROCESS_READ_SIZE:]
+        for raw_line in lines:
+            handle_line(raw_line)
+    handle_line(pending)
+
+
+class ProcessMemoryGroup:
+    """한 작업에서 동시에 실행하는 프로세스들의 메모리 사용량 합계를 추적하여 작업 단위로 상한 적용
+    
+    한 프로세스라도 합계가 상한을 넘은 것을 확인하면 그룹의 모든 프로세스가 다음 확인 때 종료됩니다.
+    """
+    
+    def __init__(self, limit_mb=None):
+        self.limit_mb = limit_mb
+        self.lock = threading.Lock()
+        self.current = {}  # PID -> 현재 메모리 사용량 (MB)
+        self.peak_mb = None  # 동시에 실행한 프로세스 합계의 최대값
+        self.exceeded = False
+    
+    def update(self, pid, rss):
+        """프로세스의 현재 사용량을 갱신하고 그룹 합계가 상한을 넘었는지 반환"""
+        with self.lock:
+            if rss is not None:
+                self.current[pid] = rss
+                total = sum(self.current.values())
+                self.peak_mb = max(self.peak_mb or 0.0, total)
+                if self.limit_mb and total > self.limit_mb:
+                    self.exceeded = True
+            return self.exceeded
+    
+    def remove(self, pid):
+        """종료된 프로세스를 합계에서 제외"""
+        with self.lock:
+            self.current.pop(pid, None)
+
+
+def run_process(cmd, timeout=None, idle_timeout=PROCESS_IDLE_TIMEOUT, on_progress=None, stop_check=None,
+                capture_stdout=False, tail_lines=PROCESS_STDERR_TAIL_LINES, memory_limit_mb=None, memory_group=None,
+                **popen_kwargs):
+    """외부 프로세스를 실행하고 출력을 읽어 가며 종료될 때까지 대기
+    
+    stderr는 마지막 tail_lines줄만 보관하고 FFMPEG 진행 줄은 on_progress(dict)로 바로 전달하므로
+    몇 시간짜리 인코딩도 메모리 사용량이 일정합니다. 전체 시간이 timeout을 넘거나, 출력 없이
+    idle_timeout이 지나거나, 메모리 사용량이 memory_limit_mb(MB)를 넘거나, stop_check()가 True를
+    반환하면 프로세스를 종료합니다. memory_group(ProcessMemoryGroup)을 지정하면 이 프로세스만이 아니라
+    그룹에서 동시에 실행 중인 프로세스들의 합계에 그룹의 상한을 적용합니다.
+    
+    반환값: {"returncode", "stdout", "stderr", "interrupted", "peak_rss_mb"}
+    (interrupted: None, "timeout", "idle", "memory", "stopped" 중 하나, peak_rss_mb: 확인할 수 없으면 None)
+    """
+    if memory_group is None and memory_limit_mb:
+        memory_group = ProcessMemoryGroup(memory_limit_mb)
+    process = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        **popen_kwargs
+    )
+    tail = deque(maxlen=tail_lines)
+    stdout_chunks = []
+    last_output = [time.time()]
+    
+    def touch():
+        last_output[0] = time.time()
+    
+    def read_stderr():
+        read_ffmpeg_stderr(process.stderr, tail, on_progress, touch)
+    
+    def read_stdout():
+        for chunk in iter(lambda: process.stdout.read(PROCESS_READ_SIZE), b""):
+            last_output[0] = time.time()
+            stdout_chunks.append(chunk)
+    
+    readers = [threading.Thread(target=read_stderr, daemon=True)]
+    if capture_stdout:
+        readers.append(threading.Thread(target=read_stdout, daemon=True))
+    for reader in readers:
+        reader.start()
+    
+    # 감시: 종료될 때까지 시간 초과 / 멈춤 / 중지 요청 확인
+    # (stderr가 닫히면 바로 깨어나도록 Popen.wait의 폴링 대신 읽기 스레드를 기다림)
+    start_time = time.time()
+    interrupted = None
+    peak_rss = None
+    while True:
+        if readers[0].is_alive():
+            readers[0].join(PROCESS_POLL_INTERVAL)
+        else:
+            try:
+                process.wait(PROCESS_POLL_INTERVAL)
+            except subprocess.TimeoutExpired:
+                pass
+        if process.poll() is not None:
+            break
+        now = time.time()
+        rss = read_process_rss_mb(process.pid)
+        if rss is not None:
+            peak_rss = max(peak_rss or 0.0, rss)
+        over_memory = memory_group is not None and memory_group.update(process.pid, rss)
+        if stop_check and stop_check():
+            interrupted = "stopped"
+        elif timeout and now - start_time > timeout:
+            interrupted = "timeout"
+        elif idle_timeout and now - last_output[0] > idle_timeout:
+            interrupted = "idle"
+        elif over_memory:
+            interrupted = "memory"
+        if interrupted:
+            stop_process(process)
+            break
+    if memory_group is not None:
+        memory_group.remove(process.pid)
+    
+    for reader in readers:
+        reader.join()
+    for stream in (process.stdout, process.stderr):
+        if stream:
+            stream.close()
+    
+    return {
+        "returncode": process.returncode,
+        "stdout": b"".join(stdout_chunks).decode("utf-8", "replace"),
+        "stderr": "\n".join(tail),
+        "interrupted": interrupted,
+        "peak_rss_mb": peak_rss,
+    }
+
+
+def describe_process_error(result):
+    """run_process 실패 결과를 로그용 문자열로 변환"""
+    reasons = {
+        "timeout": "시간 초과로 종료됨",
+        "idle": "출력 없이 멈춰 있어 종료됨",
+        "stopped": "중지 요청으로 종료됨",
+        "memory": "메모리 상한 초과로 종료됨",
+    }
+    message = reasons.get(result["interrupted"], f"종료 코드 {result['returncode']}")
+    return f"{message}\n{result['stderr']}" if result["stderr"] else message
+
+
+# 오디오 처리 설정 (오디오 전용 입력, 비디오와 동시에 인코딩하는 오디오 작업)
+AUDIO_EXTENSIONS = (".m4a", ".mp3", ".wav", ".aac", ".flac")
+SPLIT_AUDIO_MIN_DURATION = 120  # 초, 이보다 긴 입력만 오디오를 별도 프로세스로 동시에 인코딩 (합치기 비용 상쇄)
+
+
+def is_audio_file(file_path):
+    """확장자로 오디오 전용 입력인지 확인 (비디오 파이프라인을 건너뜀)"""
+    return Path(file_path).suffix.lower() in AUDIO_EXTENSIONS
+
+
+def probe_audio_codecs(file_path):
+    """입력의 오디오 스트림별 코덱 이름 목록 (오디오가 없으면 빈 목록, 확인 실패 시 None)"""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "a",
+        "-show_entries", "stream=codec_type,codec_name",
+        "-of", "json",
+        file_path
+    ]
+    try:
+        result = run_process(cmd, timeout=60, capture_stdout=True)
+        info = json.loads(result["stdout"] or "{}")
+        return [stream.get("codec_name") for stream in info["streams"] if stream.get("codec_type") == "audio"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def probe_duration(file_path):
+    """ffprobe로 입력 길이 (초) 확인 - 실패 시 None"""
+    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "json", file_path]
+    try:
+        result = run_process(cmd, timeout=60, capture_stdout=True)
+        return float(json.loads(result["stdout"] or "{}")["format"]["duration"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def get_split_output_paths(output_path):
+    """비디오 / 오디오를 따로 인코딩할 때의 임시 파일 경로 (출력과 같은 폴더)"""
+    root, extension = os.path.splitext(output_path)
+    return f"{root}.video{extension}", f"{root}.audio.m4a"
+
+
+def build_audio_command(input_path, output_path, time_range=None, copy=False, all_tracks=True):
+    """오디오 스트림을 AAC로 인코딩하는 FFMPEG 명령어 (copy=True면 재인코딩 없이 스트림 복사)
+    
+    all_tracks=True면 모든 오디오 트랙을 유지하고 (build_ffmpeg_command와 같은 기준),
+    False면 FFMPEG가 기본으로 선택하는 트랙 하나만 사용합니다 (MoviePy와 같은 기준).
+    """
+    input_args, output_args = get_seek_args(time_range)
+    return [
+        "ffmpeg", "-y",
+        *input_args,
+        "-i", input_path,
+        *output_args,
+        "-vn",
+        *(["-map", "0:a"] if all_tracks else []),
+        *(["-c:a", "copy"] if copy else ["-c:a", "aac", "-b:a", "128k"]),
+        "-movflags", "+faststart",
+        output_path
+    ]
+
+
+def build_mux_command(video_path, audio_path, output_path):
+    """따로 인코딩한 비디오와 오디오를 스트림 복사로 합치는 FFMPEG 명령어"""
+    return [
+        "ffmpeg", "-y",
+        "-i", video_path,
+        "-i", audio_path,
+        "-map", "0:v:0",
+        "-map", "1:a",
+        "-c", "copy",
+        "-movflags", "+faststart",
+        output_path
+    ]
+
+
+def start_background_process(cmd, stop_check=None, **popen_kwargs):
+    """별도 스레드에서 run_process 실행 시작 - 반환값: (결과 Future, 중지 이벤트)"""
+    cancel = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(run_process, cmd, stop_check=lambda: cancel.is_set() or bool(stop_check and stop_check()),
+                             **popen_kwargs)
+    executor.shutdown(wait=False)
+    return future, cancel
+
+
+def finish_split_encode(audio_future, mux_cmd, stop_check=None, **popen_kwargs):
+    """동시에 인코딩한 오디오가 끝나기를 기다린 후 비디오와 스트림 복사로 합침 (run_process 결과 형식)"""
+    audio_result = audio_future.result()
+    if audio_result["returncode"] != 0 or audio_result["interrupted"]:
+        return audio_result
+    return run_process(mux_cmd, stop_check=stop_check, **popen_kwargs)
+
+
+def run_split_encode(video_cmd, audio_cmd, mux_cmd, on_progress=None, stop_check=None, memory_limit_mb=None,
+                     **popen_kwargs):
+    """비디오와 오디오를 별도 프로세스로 동시에 인코딩한 후 스트림 복사로 합침 (run_process 결과 형식)
+    
+    진행률은 비디오 프로세스 기준으로 보고하고, 비디오가 실패하면 오디오 작업도 중지합니다.
+    memory_limit_mb는 프로세스별이 아니라 동시에 실행 중인 프로세스들의 합계에 적용합니다.
+    """
+    memory_group = ProcessMemoryGroup(memory_limit_mb)
+    audio_future, cancel_audio = start_background_process(audio_cmd, stop_check, memory_group=memory_group,
+                                                          **popen_kwargs)
+    video_result = run_process(video_cmd, on_progress=on_progress, stop_check=stop_check, memory_group=memory_group,
+                               **popen_kwargs)
+    if video_result["returncode"] != 0 or video_result["interrupted"]:
+        cancel_audio.set()
+        audio_future.result()
+        result = video_result
+    else:
+        result = finish_split_encode(audio_future, mux_cmd, stop_check, memory_group=memory_group, **popen_kwargs)
+    # 최대 메모리 사용량은 동시에 실행한 프로세스들의 합계 기준
+    if memory_group.peak_mb is not None:
+        result["peak_rss_mb"] = memory_group.peak_mb
+    return result
+
+
+def parse_time(text):
+    """시간 문자열을 초 단위로 변환 ('90', '01:30', '00:01:30.5' 형식, 빈 값은 None)"""
+    text = text.strip()
+    if not text:
+        return None
+    seconds = 0.0
+    for part in text.split(":"):
+        value = float(part)
+        # nan / inf와 음수 부분('1:-30' 등)은 거부
+        if not math.isfinite(value) or value < 0:
+            raise ValueError(f"잘못된 시간: {text}")
+        seconds = seconds * 60 + value
+    return seconds
+
+
+def format_time(seconds):
+    """초를 HH:MM:SS 형식으로 변환 (소수점 이하가 있으면 1/100초까지 함께 표시)"""
+    # 1/100초 단위로 먼저 반올림해야 5.999초가 00:00:06으로 올림 처리됨
+    whole, fraction = divmod(int(round(seconds * 100)), 100)
+    hours, remainder = divmod(whole, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    text = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    if fraction:
+        text += f".{fraction:02d}"
+    return text
+
+
+def parse_time_range(text):
+    """'시작-끝' 문자열을 (시작, 끝) 초 단위 튜플로 변환 (생략한 쪽은 None)"""
+    start_text, separator, end_text = text.partition("-")
+    if not separator:
+        raise ValueError(f"잘못된 구간: {text}")
+    start, end = parse_time(start_text), parse_time(end_text)
+    if start is not None and end is not None and end <= start:
+        raise ValueError(f"구간 끝이 시작보다 앞에 있습니다: {text}")
+    return start, end
+
+
+def split_file_range(argument):
+    """명령행의 '파일@시작-끝' 인자를 (파일 경로, 구간) 으로 분리 (구간이 없으면 None)"""
+    path, separator, range_text = argument.rpartition("@")
+    if separator and not os.path.exists(argument):
+        try:
+            return path, parse_time_range(range_text)
+        except ValueError:
+            pass
+    return argument, None
+
+
+def get_range_duration(duration, time_range):
+    """구간을 적용한 실제 변환 길이 (초)"""
+    if not time_range:
+        return duration
+    start, end = time_range
+    start = start or 0
+    if end is None or (duration and end > duration):
+        end = duration
+    return max(0, (end or 0) - start)
+
+
+def clamp_target(height, fps, source_height=None, source_fps=None):
+    """원본보다 높은 해상도 / 프레임 레이트로 변환하지 않도록 출력 목표 제한
+    
+    원본 정보를 모르면 선택한 값을 그대로 사용하며, 비트레이트는 get_encoding_params가
+    제한된 해상도에 맞는 단계를 선택합니다. 반환값: (출력 높이, 출력 FPS)
+    """
+    if source_height and source_height < height:
+        height = max(2, int(source_height) // 2 * 2)
+    if source_fps and source_fps < fps:
+        fps = round(source_fps, 3)
+        if fps == int(fps):
+            fps = int(fps)
+    return height, fps
+
+
+def format_target(height, fps):
+    """출력 해상도 / FPS 표시 문자열"""
+    return f"{height}p/{fps:g}fps"
+
+
+def get_target_size(source_width, source_height, height):
+    """가로세로 비율을 유지한 출력 크기 (yuv420p 인코딩을 위해 너비는 짝수로 맞춤)"""
+    width = int(round(source_width * height / source_height / 2)) * 2
+    return max(2, width), height
+
+
+def get_cropped_target_size(crop, height):
+    """검은 여백을 자른 영역의 출력 크기 (원본 전체를 height에 맞출 때와 같은 배율, 짝수 크기)"""
+    scale = height / crop["source_height"]
+    return (max(2, int(crop["width"] * scale / 2) * 2),
+            max(2, int(crop["height"] * scale / 2) * 2))
+
+
+def get_scale_filter(height, crop=None):
+    """FFMPEG 크기 변경 필터 (crop 지정 시 크기 변경 전에 검은 여백 제거)"""
+    if not crop:
+        return f"scale=-2:{height}"
+    width, cropped_height = get_cropped_target_size(crop, height)
+    return f"crop={crop['width']}:{crop['height']}:{crop['x']}:{crop['y']},scale={width}:{cropped_height}"
+
+
+def get_supported_options(function, options):
+    """function이 받는 인자만 남긴 옵션 (MoviePy 버전마다 VideoFileClip 인자가 다름)"""
+    try:
+        parameters = inspect.signature(function).parameters
+    except (TypeError, ValueError):
+        return dict(options)
+    if any(parameter.kind == inspect.Parameter.VAR_KEYWORD for parameter in parameters.values()):
+        return dict(options)
+    return {key: value for key, value in options.items() if key in parameters}
+
+
+def describe_decimation(duration, fps, output_frames):
+    """정지 화면 제거 결과 (고정 프레임 레이트로 출력했을 때의 프레임 수 대비) - 계산할 수 없으면 None
+    
+    반환값: (제거한 프레임 수, 고정 프레임 레이트 기준 프레임 수)
+    """
+    total_frames = int(round(duration * fps))
+    if not total_frames or output_frames is None:
+        return None
+    return max(0, total_frames - output_frames), total_frames
+
+
+def get_unique_output_path(output_folder, stem, height, fps, reserved=(), audio_only=False):
+    """출력 파일 경로 생성 (중복 시 _1, _2 ... 접미사 추가, 오디오 전용 입력은 AAC .m4a)"""
+    name, extension = (f"{stem}_aac", ".m4a") if audio_only else (f"{stem}_{height}p_{fps}fps", ".mp4")
+    output_path = os.path.join(output_folder, f"{name}{extension}")
+    
+    # 파일명 중복 확인 및 처리 (같은 배치에서 이미 예약된 경로도 제외)
+    counter = 1
+    while os.path.exists(output_path) or output_path in reserved:
+        output_path = os.path.join(output_folder, f"{name}_{counter}{extension}")
+        counter += 1
+    
+    # 중단된 이전 변환이 이 이름으로 남긴 임시 파일 정리 (이전 버전의 'x.mp4.part' 형식 포함)
+    partial_path = get_partial_output_path(output_path)
+    for path in (partial_path, output_path + ".part", *get_split_output_paths(partial_path)):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    return output_path
+
+
+# 출력 검사 설정 (임시 이름으로 쓴 결과를 확인한 후에만 최종 이름으로 변경)
+OUTPUT_VERIFY_TOLERANCE = 0.02  # 예상 길이 대비 허용 오차 비율
+OUTPUT_VERIFY_MIN_TOLERANCE = 1.0  # 초, 짧은 영상의 최소 허용 오차
+OUTPUT_VERIFY_HEIGHT_TOLERANCE = 2  # 픽셀, 디코딩 단계 축소 후 자르기 등으로 생기는 짝수 반올림 차이
+OUTPUT_WRITE_RETRIES = 1  # 인코딩 실패 또는 출력 검사 실패 시 다시 쓰는 횟수
+ENCODER_CODEC_NAMES = {"libx264": "h264", "libx265": "hevc"}  # 인코더 → ffprobe 코덱 이름
+
+
+def get_partial_output_path(output_path):
+    """출력과 같은 폴더의 임시 파일 경로 (확장자를 유지해야 FFMPEG / MoviePy가 컨테이너를 결정)"""
+    root, extension = os.path.splitext(output_path)
+    return f"{root}.part{extension}"
+
+
+def verify_output_file(output_path, expected_duration=None, expected_height=None, encoder=None, audio_only=False):
+    """컨테이너 / 스트림 빠른 검사 - 문제가 없으면 None, 있으면 이유 반환
+    
+    길이는 예상 길이(expected_duration) 기준 허용 오차 이내, 비디오 코덱은 인코더(encoder)에 맞는 코덱,
+    높이는 expected_height, 오디오가 있으면 AAC인지 확인합니다. audio_only=True면 비디오 대신
+    오디오 스트림이 있는지 확인합니다. ffprobe가 없으면 검사를 건너뜁니다.
+    """
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "stream=codec_type,codec_name,height:format=duration",
+        "-of", "json",
+        output_path
+    ]
+    try:
+        result = run_process(cmd, timeout=60, capture_stdout=True)
+    except OSError:
+        return None
+    try:
+        info = json.loads(result["stdout"] or "{}")
+        streams = info["streams"]
+        duration = float(info.get("format", {}).get("duration", 0))
+    except (ValueError, KeyError):
+        return f"컨테이너를 읽을 수 없음 ({describe_process_error(result)})"
+    
+    audio = [stream.get("codec_name") for stream in streams if stream.get("codec_type") == "audio"]
+    if any(name != "aac" for name in audio):
+        return f"오디오 코덱 {', '.join(audio)} (예상 aac)"
+    video = next((stream for stream in streams if stream.get("codec_type") == "video"), None)
+    if audio_only:
+        if not audio:
+            return "오디오 스트림 없음"
+    elif video is None:
+        return "비디오 스트림 없음"
+    codec = ENCODER_CODEC_NAMES.get(encoder)
+    if video and codec and video.get("codec_name") != codec:
+        return f"비디오 코덱 {video.get('codec_name')} (예상 {codec})"
+    if video and expected_height and abs(int(video.get("height") or 0) - expected_height) > OUTPUT_VERIFY_HEIGHT_TOLERANCE:
+        return f"높이 {video.get('height')}px (예상 {expected_height}px)"
+    if expected_duration:
+        tolerance = max(OUTPUT_VERIFY_MIN_TOLERANCE, expected_duration * OUTPUT_VERIFY_TOLERANCE)
+        if abs(duration - expected_duration) > tolerance:
+            return f"길이 {duration:.1f}초 (예상 {expected_duration:.1f}초)"
+    return None
+
+
+# 리소스 제한 기본값
+GOVERNOR_CPU_LIMIT = 0.85  # 전체 CPU 대비 사용 상한 (다른 서비스를 위한 여유 확보)
+GOVERNOR_MIN_FREE_MEMORY_MB = 1024  # 이보다 여유 메모리가 적으면 새 작업 시작 보류
+GOVERNOR_MAX_IOWAIT = 0.25  # 디스크 I/O 대기 비율 상한
+GOVERNOR_JOB_MEMORY_MB = 1500  # 작업당 예상 메모리 사용량 (동시 작업 수 계산용)
+GOVERNOR_NICE = 10  # FFMPEG 프로세스 우선순위 (높을수록 낮은 우선순위)
+MEMORY_LIMIT_MIN_MB = 256  # 메모리 제한 모드에서 설정할 수 있는 작업당 최소 상한
+
+
+class ResourceGovernor:
+    """CPU 부하, 여유 메모리, 디스크 I/O 대기를 기준으로 작업 시작을 제어
+    
+    동시 작업 수와 작업당 스레드 수를 실시간 부하에 맞춰 정하고, FFMPEG 프로세스의
+    우선순위를 낮추며(nice/ionice), 필요하면 작업별로 CPU 코어를 고정합니다.
+    """
+    
+    def __init__(self, max_jobs=0, cpu_limit=GOVERNOR_CPU_LIMIT,
+                 min_free_memory_mb=GOVERNOR_MIN_FREE_MEMORY_MB, max_iowait=GOVERNOR_MAX_IOWAIT,
+                 low_priority=True, pin_cpus=False, job_memory_mb=GOVERNOR_JOB_MEMORY_MB, log=print):
+        self.max_jobs = max_jobs  # 0이면 자동
+        self.cpu_limit = cpu_limit
+        self.min_free_memory_mb = min_free_memory_mb
+        self.max_iowait = max_iowait
+        self.job_memory_mb = job_memory_mb  # 작업당 메모리 (메모리 제한 모드에서는 작업별 상한)
+        self.low_priority = low_priority
+        self.taskset = shutil.which("taskset") if platform.system() == "Linux" else None
+        self.pin_cpus = pin_cpus and hasattr(os, "sched_setaffinity") and bool(self.taskset)
+        self.log = log
+        
+        if hasattr(os, "sched_getaffinity"):
+            self.cpus = sorted(os.sched_getaffinity(0))
+        else:
+            self.cpus = list(range(os.cpu_count() or 1))
+        
+        self.active = {}  # 슬롯 ID -> 슬롯 정보
+        self.condition = threading.Condition()
+        self.last_cpu_times = self.read_cpu_times()
+        self.throttled = False
+        self.lowered_threads = set()  # 이미 우선순위를 낮춘 작업 스레드 (자식 프로세스가 상속하므로 다시 낮추지 않음)
+        self.ionice = shutil.which("ionice") if platform.system() == "Linux" else None
+        self.nice = shutil.which("nice") if platform.system() != "Windows" else None
+    
+    @staticmethod
+    def read_cpu_times():
+        """/proc/stat의 전체 CPU 시간 (Linux 전용, 없으면 None)"""
+        try:
+            with open("/proc/stat") as f:
+                return [int(value) for value in f.readline().split()[1:]]
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def read_free_memory_mb():
+        """사용 가능한 메모리 (MB) - /proc/meminfo 또는 psutil, 확인할 수 없으면 None"""
+        try:
+            with open("/proc/meminfo") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) / 1024
+        except (OSError, ValueError):
+            pass
+        try:
+            import psutil
+            return psutil.virtual_memory().available / (1024 * 1024)
+        except ImportError:
+            return None
+    
+    def sample(self):
+        """현재 시스템 부하 측정 (CPU 부하 비율, 여유 메모리, I/O 대기 비율)"""
+        try:
+            cpu_load = os.getloadavg()[0] / len(self.cpus)
+        except (AttributeError, OSError):
+            try:
+                import psutil
+                cpu_load = psutil.cpu_percent() / 100
+            except ImportError:
+                cpu_load = 0.0
+        
+        # I/O 대기: 직전 측정 이후 iowait 시간 비율
+        iowait = 0.0
+        cpu_times = self.read_cpu_times()
+        if cpu_times and self.last_cpu_times and len(cpu_times) > 4:
+            deltas = [now - before for now, before in zip(cpu_times, self.last_cpu_times)]
+            total = sum(deltas)
+            if total > 0:
+                iowait = deltas[4] / total
+        self.last_cpu_times = cpu_times
+        
+        return {"cpu_load": cpu_load, "free_memory_mb": self.read_free_memory_mb(), "iowait": iowait}
+    
+    def target_concurrency(self, load=None):
+        """CPU 수와 여유 메모리로 동시 작업 수 결정"""
+        if self.max_jobs:
+            return self.max_jobs
+        
+        concurrency = max(1, int(len(self.cpus) * self.cpu_limit) // 4)
+        free_memory = (load or {}).get("free_memory_mb")
+        if free_memory is not None:
+            # 실행 중인 작업 외에 여유 메모리로 추가 시작할 수 있는 작업 수
+            extra_jobs = int((free_memory - self.min_free_memory_mb) // self.job_memory_mb)
+            concurrency = min(concurrency, len(self.active) + max(0, extra_jobs))
+        return max(1, concurrency)
+    
+    def limit_exceeded(self, load):
+        """새 작업을 시작하면 안 되는 상태인지 확인 (사유 반환)"""
+        # 실행 중인 변환 작업의 스레드는 제외 (자기 작업 때문에 새 작업을 보류하지 않도록)
+        own_threads = sum(slot["threads"] for slot in self.active.values())
+        external_load = max(0.0, load["cpu_load"] - own_threads / len(self.cpus))
+        if external_load > self.cpu_limit:
+            return f"CPU 부하 {external_load * 100:.0f}% (변환 작업 제외)"
+        if load["free_memory_mb"] is not None and load["free_memory_mb"] < self.min_free_memory_mb:
+            return f"여유 메모리 {load['free_memory_mb']:.0f} MB"
+        if load["iowait"] > self.max_iowait:
+            return f"I/O 대기 {load['iowait'] * 100:.0f}%"
+        return None
+    
+    def acquire(self, stop_check=None, poll_interval=2.0):
+        """작업 시작 슬롯 획득 - 동시 작업 수나 부하 상한을 넘으면 여유가 생길 때까지 대기"""
+        with self.condition:
+            while True:
+                if stop_check and stop_check():
+                    return None
+                
+                load = self.sample()
+                concurrency = self.target_concurrency(load)
+                # 실행 중인 작업이 없으면 부하와 관계없이 시작 (교착 방지)
+                reason = self.limit_exceeded(load) if self.active else None
+                if len(self.active) < concurrency and reason is None:
+                    break
+                
+                if reason and not self.throttled:
+                    self.log(f"시스템 부하로 새 작업 시작을 보류합니다: {reason}")
+                self.throttled = bool(reason)
+                self.condition.wait(poll_interval)
+            
+            if self.throttled:
+                self.log("시스템 부하가 낮아져 작업을 재개합니다.")
+                self.throttled = False
+            
+            slot = {
+                "id": uuid.uuid4().hex,
+                "threads": self.threads_per_job(load, concurrency),
+                "cpus": self.allocate_cpus(concurrency),
+                "memory_mb": self.job_memory_mb,
+            }
+            self.active[slot["id"]] = slot
+            return slot
+    
+    def release(self, slot):
+        """작업 종료 후 슬롯 반환"""
+        if slot is None:
+            return
+        with self.condition:
+            self.active.pop(slot["id"], None)
+            self.condition.notify_all()
+    
+    def threads_per_job(self, load, concurrency):
+        """다른 프로세스가 사용 중인 CPU를 제외하고 작업당 스레드 수 결정"""
+        own_threads = sum(slot["threads"] for slot in self.active.values())
+        external_load = max(0.0, load["cpu_load"] * len(self.cpus) - own_threads)
+        available = len(self.cpus) * self.cpu_limit - external_load
+        return max(1, int(available // concurrency))
+    
+    def allocate_cpus(self, concurrency):
+        """CPU 고정 사용 시 다른 작업과 겹치지 않는 코어 묶음 할당"""
+        if not self.pin_cpus:
+            return None
+        group_size = max(1, len(self.cpus) // concurrency)
+        used = {cpu for slot in self.active.values() for cpu in (slot["cpus"] or ())}
+        free = [cpu for cpu in self.cpus if cpu not in used]
+        return (free or self.cpus)[:group_size]
+    
+    def wrap_command(self, cmd, slot=None):
+        """우선순위를 낮추고(ionice / nice) 슬롯의 CPU 코어에 고정하도록(taskset) 명령어 감싸기
+        
+        preexec_fn은 여러 스레드에서 프로세스를 시작하는 이 앱에서 안전하지 않으므로 사용하지 않습니다.
+        현재 스레드를 이미 낮췄으면 자식 프로세스가 그 우선순위를 상속하므로 nice를 다시 더하지 않습니다.
+        """
+        prefix = []
+        lower = self.low_priority and threading.get_native_id() not in self.lowered_threads
+        if lower and self.ionice:
+            prefix += [self.ionice, "-c", "2", "-n", "7"]
+        if lower and self.nice:
+            prefix += [self.nice, "-n", str(GOVERNOR_NICE)]
+        if self.pin_cpus and slot and slot["cpus"]:
+            prefix += [self.taskset, "-c", ",".join(str(cpu) for cpu in slot["cpus"])]
+        return prefix + list(cmd)
+    
+    def popen_kwargs(self, slot):
+        """subprocess.Popen에 전달할 우선순위 옵션 (Windows 전용, 그 외에는 wrap_command가 처리)"""
+        if platform.system() == "Windows" and self.low_priority:
+            return {"creationflags": subprocess.BELOW_NORMAL_PRIORITY_CLASS}
+        return {}
+    
+    def apply_to_current_thread(self, slot):
+        """MoviePy처럼 내부에서 FFMPEG를 실행하는 경우 현재 스레드에 제한 적용 (자식 프로세스에 상속됨)
+        
+        스레드별 우선순위 / CPU 고정은 Linux에서만 가능하며 (다른 OS에서는 프로세스 전체에 적용됨),
+        일반 사용자는 낮춘 우선순위를 되돌릴 수 없으므로 스레드마다 한 번만 낮춥니다.
+        """
+        if platform.system() != "Linux":
+            return
+        try:
+            thread_id = threading.get_native_id()
+            if self.low_priority and thread_id not in self.lowered_threads:
+                os.setpriority(os.PRIO_PROCESS, thread_id, GOVERNOR_NICE)
+                if self.ionice:
+                    subprocess.call([self.ionice, "-c", "2", "-n", "7", "-p", str(thread_id)],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                self.lowered_threads.add(thread_id)
+            if self.pin_cpus and slot and slot["cpus"]:
+                os.sched_setaffinity(thread_id, slot["cpus"])
+        except (AttributeError, OSError) as e:
+            self.log(f"우선순위 설정 오류: {e} (무시 가능)")
+
+
+# 출력 캐시 설정 (같은 내용의 입력을 다시 인코딩하지 않도록 결과 재사용)
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".video_converter", "cache")
+CACHE_MAX_SIZE_MB = 20 * 1024  # 캐시 용량 상한 (초과 시 오래 사용하지 않은 항목부터 삭제)
+CACHE_SAMPLE_SIZE = 1024 * 1024  # 부분 해시에 사용할 샘플 크기 (앞/중간/뒤 각각)
+
+
+def compute_content_hash(file_path, full_hash=False):
+    """입력 파일 내용 해시 - 파일 크기와 앞/중간/뒤 샘플로 빠르게 계산 (full_hash=True면 전체 내용)"""
+    size = os.path.getsize(file_path)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(str(size).encode("utf-8"))
+    
+    with open(file_path, "rb") as f:
+        if full_hash:
+            for chunk in iter(lambda: f.read(8 * 1024 * 1024), b""):
+                digest.update(chunk)
+        else:
+            for offset in (0, max(0, size // 2 - CACHE_SAMPLE_SIZE // 2), max(0, size - CACHE_SAMPLE_SIZE)):
+                f.seek(offset)
+                digest.update(f.read(CACHE_SAMPLE_SIZE))
+    
+    return digest.hexdigest()
+
+
+def link_or_copy(source, destination):
+    """하드링크 → reflink → 복사 순서로 파일 연결 (사용한 방식 반환)"""
+    try:
+        os.link(source, destination)
+        return "하드링크"
+    except OSError:
+        pass
+    
+    # 같은 파일 시스템의 CoW 복제 (btrfs/XFS 등, Linux 전용)
+    if platform.system() == "Linux":
+        try:
+            import fcntl
+            FICLONE = 0x40049409
+            with open(source, "rb") as src, open(destination, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return "reflink"
+        except (OSError, ImportError):
+            if os.path.exists(destination):
+                os.remove(destination)
+    
+    shutil.copy2(source, destination)
+    return "복사"
+
+
+class OutputCache:
+    """입력 내용 해시 + 인코딩 설정 해시를 키로 기존 변환 결과를 재사용하는 캐시
+    
+    캐시 디렉터리에 결과 파일(가능하면 하드링크)과 index.json을 보관하며,
+    용량 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+    """
+    
+    def __init__(self, cache_dir=CACHE_DIR, max_size_mb=CACHE_MAX_SIZE_MB, full_hash=False, log=print):
+        self.cache_dir = cache_dir
+        self.max_size = max_size_mb * 1024 * 1024
+        self.full_hash = full_hash
+        self.log = log
+        self.lock = threading.Lock()
+        self.index_path = os.path.join(cache_dir, "index.json")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self.load_index()
+    
+    def load_index(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_index(self):
+        """index.json을 임시 파일에 쓴 후 교체 (중간에 종료되어도 손상되지 않도록)"""
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        os.replace(temp_path, self.index_path)
+    
+    def make_key(self, file_path, settings):
+        """입력 내용 해시와 인코딩 설정 해시를 결합한 캐시 키"""
+        content_hash = compute_content_hash(file_path, self.full_hash)
+        settings_hash = hashlib.blake2b(json.dumps(settings, sort_keys=True).encode("utf-8"), digest_size=12).hexdigest()
+        return f"{content_hash}-{settings_hash}"
+    
+    def lookup(self, key, output_path):
+        """캐시에 결과가 있으면 출력 경로에 연결하고 사용한 방식을 반환 (없으면 None)"""
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is None:
+                return None
+            cached_path = os.path.join(self.cache_dir, entry["file"])
+            if not os.path.exists(cached_path):
+                del self.index[key]
+                self.save_index()
+                return None
+            entry["last_used"] = time.time()
+            self.save_index()
+        
+        # 복사 중 중단되어도 잘린 파일이 최종 이름으로 남지 않도록 임시 이름으로 연결 후 이름 변경
+        partial_path = get_partial_output_path(output_path)
+        try:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            method = link_or_copy(cached_path, partial_path)
+            os.replace(partial_path, output_path)
+            return method
+        except OSError as e:
+            self.log(f"캐시 파일 연결 오류: {e}")
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            return None
+    
+    def store(self, key, output_path):
+        """변환 결과를 캐시에 등록 후 용량 상한에 맞게 정리 (오디오 전용 결과 등 출력의 확장자 유지)"""
+        cached_name = key + (os.path.splitext(output_path)[1] or ".mp4")
+        cached_path = os.path.join(self.cache_dir, cached_name)
+        try:
+            if not os.path.exists(cached_path):
+                link_or_copy(output_path, cached_path)
+        except OSError as e:
+            self.log(f"캐시 저장 오류: {e}")
+            return
+        
+        with self.lock:
+            self.index[key] = {
+                "file": cached_name,
+                "size": os.path.getsize(cached_path),
+                "last_used": time.time(),
+                "source": output_path,
+            }
+            self.evict()
+            self.save_index()
+    
+    def evict(self):
+        """용량 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (lock 보유 상태에서 호출)"""
+        total_size = sum(entry["size"] for entry in self.index.values())
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]["last_used"]):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, entry["file"]))
+            except OSError:
+                pass
+            total_size -= entry["size"]
+            del self.index[key]
+    
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self.lock:
+            for entry in self.index.values():
+                try:
+                    os.remove(os.path.join(self.cache_dir, entry["file"]))
+                except OSError:
+                    pass
+            self.index = {}
+            self.save_index()
+
+
+# 로컬 임시 폴더 설정 (네트워크 드라이브의 입력/출력을 로컬에서 처리)
+STAGING_DIR = os.path.join(tempfile.gettempdir(), "video_converter_staging")
+STAGING_MAX_SIZE_MB = 20 * 1024  # 로컬 임시 폴더 용량 상한 (입력 사전 복사 + 이동 대기 중인 출력)
+
+
+class ScratchStager:
+    """네트워크 입력을 로컬 임시 폴더로 미리 복사하고, 로컬에 쓴 출력을 비동기로 최종 위치에 이동
+    
+    파일 N을 인코딩하는 동안 다음 파일들을 용량 상한 안에서 차례로 복사하고,
+    완료된 출력은 별도 스레드가 옮기므로 네트워크 I/O가 인코딩과 겹쳐서 진행됩니다.
+    """
+    
+    def __init__(self, scratch_dir=STAGING_DIR, max_size_mb=STAGING_MAX_SIZE_MB, log=print):
+        self.scratch_dir = os.path.join(scratch_dir, uuid.uuid4().hex)
+        self.input_dir = os.path.join(self.scratch_dir, "input")
+        self.output_dir = os.path.join(self.scratch_dir, "output")
+        os.makedirs(self.input_dir)
+        os.makedirs(self.output_dir)
+        
+        self.max_size = max_size_mb * 1024 * 1024
+        self.used_size = 0
+        self.log = log
+        self.staged = {}  # 원본 경로 -> {"path", "size", "ready", "error", "copying", "claimed"}
+        self.condition = threading.Condition()
+        self.closed = False
+        
+        self.prefetch_queue = queue.Queue()
+        self.move_queue = queue.Queue()
+        threading.Thread(target=self.prefetch_loop, daemon=True).start()
+        threading.Thread(target=self.move_loop, daemon=True).start()
+    
+    def prefetch(self, file_paths):
+        """변환 순서대로 입력 파일 사전 복사 예약"""
+        for file_path in file_paths:
+            with self.condition:
+                if file_path in self.staged:
+                    continue
+                self.staged[file_path] = {"path": None, "size": 0, "ready": threading.Event(), "error": None,
+                                          "copying": False, "claimed": False}
+            self.prefetch_queue.put(file_path)
+    
+    def prefetch_loop(self):
+        """백그라운드 복사 스레드 - 용량 상한을 넘지 않도록 공간이 생길 때까지 대기"""
+        while True:
+            file_path = self.prefetch_queue.get()
+            if file_path is None:
+                return
+            entry = self.staged.get(file_path)
+            if entry is None:
+                continue
+            
+            try:
+                size = os.path.getsize(file_path)
+            except OSError as e:
+                self.fail_input(file_path, entry, e)
+                continue
+            with self.condition:
+                # 다른 파일이 임시 폴더를 사용 중이면 공간이 생길 때까지 대기
+                # (그동안 작업이 이 파일을 요청하면 get_input이 직접 처리)
+                while (self.used_size and self.used_size + size > self.max_size
+                       and not self.closed and not entry["claimed"]):
+                    self.condition.wait()
+                if entry["claimed"]:
+                    continue
+                if self.closed or file_path not in self.staged:
+                    entry["ready"].set()
+                    continue
+                self.used_size += size
+                entry["copying"] = True
+            self.copy_input(file_path, entry, size)
+    
+    def copy_input(self, file_path, entry, size):
+        """용량을 예약한 입력 파일을 로컬 임시 폴더로 복사 (실패하면 예약을 해제하고 원본 사용)"""
+        local_path = os.path.join(self.input_dir, f"{uuid.uuid4().hex}_{Path(file_path).name}")
+        try:
+            start_time = time.time()
+            shutil.copyfile(file_path, local_path)
+            elapsed = max(time.time() - start_time, 0.001)
+            
+            with self.condition:
+                entry["path"] = local_path
+                entry["size"] = size
+            self.log(f"로컬 복사 완료: {Path(file_path).name} ({size / (1024 * 1024) / elapsed:.1f} MB/s)")
+        except OSError as e:
+            if os.path.exists(local_path):
+                os.remove(local_path)
+            with self.condition:
+                self.used_size -= size
+                self.condition.notify_all()
+            self.fail_input(file_path, entry, e)
+        finally:
+            entry["ready"].set()
+    
+    def fail_input(self, file_path, entry, error):
+        """복사할 수 없는 입력은 원본을 직접 읽도록 표시"""
+        entry["error"] = str(error)
+        entry["ready"].set()
+        self.log(f"로컬 복사 오류: {Path(file_path).name} - {error} (원본을 직접 읽습니다)")
+    
+    def get_input(self, file_path):
+        """인코딩에 사용할 입력 경로 (복사가 끝날 때까지 대기, 실패하면 원본 경로)
+        
+        아직 복사를 시작하지 않은 파일을 요청하면 순서를 기다리지 않고 바로 복사하며, 요청하지 않은
+        파일들이 공간을 차지하고 있으면 기다리지 않고 원본을 직접 읽습니다 (서로 기다리는 교착 방지).
+        """
+        entry = self.staged.get(file_path)
+        if entry is None:
+            return file_path
+        
+        if not entry["ready"].is_set() and not entry["copying"]:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = None
+            with self.condition:
+                if not entry["ready"].is_set() and not entry["copying"] and not entry["claimed"]:
+                    entry["claimed"] = True
+                    self.condition.notify_all()  # 이 파일의 공간을 기다리는 복사 스레드가 건너뛰도록
+                    if size is not None and (not self.used_size or self.used_size + size <= self.max_size):
+                        self.used_size += size
+                        entry["copying"] = True
+                    else:
+                        entry["ready"].set()
+                        self.log(f"로컬 임시 폴더 공간이 부족하여 원본을 직접 읽습니다: {Path(file_path).name}")
+                        return file_path
+                    copy_here = True
+                else:
+                    copy_here = False
+            if copy_here:
+                self.copy_input(file_path, entry, size)
+        
+        entry["ready"].wait()
+        return entry["path"] or file_path
+    
+    def release_input(self, file_path):
+        """인코딩이 끝난 입력의 로컬 사본 삭제"""
+        with self.condition:
+            entry = self.staged.pop(file_path, None)
+            if entry is None:
+                return
+            if entry["path"]:
+                try:
+                    os.remove(entry["path"])
+                except OSError:
+                    pass
+                self.used_size -= entry["size"]
+            self.condition.notify_all()
+    
+    def local_output_path(self, final_path):
+        """최종 출력 경로에 대응하는 로컬 출력 경로 (파일명은 그대로 유지)"""
+        output_dir = os.path.join(self.output_dir, uuid.uuid4().hex)
+        os.makedirs(output_dir)
+        return os.path.join(output_dir, Path(final_path).name)
+    
+    def finalize_output(self, local_path, final_path):
+        """로컬 출력을 최종 위치로 비동기 이동 예약"""
+        size = os.path.getsize(local_path)
+        with self.condition:
+            self.used_size += size
+        self.move_queue.put((local_path, final_path, size))
+    
+    def move_loop(self):
+        """백그라운드 이동 스레드 - 최종 위치에 임시 이름으로 복사 후 이름 변경"""
+        while True:
+            item = self.move_queue.get()
+            if item is None:
+                self.move_queue.task_done()
+                return
+            
+            local_path, final_path, size = item
+            partial_path = get_partial_output_path(final_path)
+            try:
+                shutil.copyfile(local_path, partial_path)
+                os.replace(partial_path, final_path)
+                os.remove(local_path)
+                os.rmdir(os.path.dirname(local_path))
+                self.log(f"출력 이동 완료: {Path(final_path).name}")
+            except OSError as e:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+                self.log(f"출력 이동 오류: {Path(final_path).name} - {e} (로컬 파일 유지: {local_path})")
+            finally:
+                with self.condition:
+                    self.used_size -= size
+                    self.condition.notify_all()
+                self.move_queue.task_done()
+    
+    def close(self):
+        """이동 대기 중인 출력을 모두 옮긴 후 임시 폴더 정리"""
+        self.move_queue.join()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.prefetch_queue.put(None)
+        self.move_queue.put(None)
+        shutil.rmtree(self.input_dir, ignore_errors=True)
+        try:
+            os.rmdir(self.output_dir)
+            os.rmdir(self.scratch_dir)
+        except OSError:
+            pass  # 이동하지 못한 출력은 남겨둠
+
+
+# UI 갱신 주기 (밀리초) - 변환 스레드의 이벤트 수와 관계없이 이 주기로만 화면을 그림
+UI_REFRESH_INTERVAL_MS = 200
+ESTIMATED_PROGRESS_PER_SECOND = 2  # 실제 진행률을 알 수 없는 작업의 추정 진행 속도 (%/초)
+
+# 작업 상태 표시 문자열
+JOB_STATUS_LABELS = {
+    "pending": "대기",
+    "running": "변환 중",
+    "done": "완료",
+    "cached": "캐시",
+    "failed": "실패",
+}
+
+
+class BatchState:
+    """변환 스레드가 갱신하고 UI 타이머가 주기적으로 그리는 배치 진행 상태
+    
+    작업별 상태/진행률/FPS와 전체 카운터, 대기 중인 로그를 잠금으로 보호하며,
+    UI는 collect_changes()로 마지막 갱신 이후 바뀐 부분만 가져가 화면에 반영합니다.
+    """
+    
+    def __init__(self, file_paths=(), total_duration=0):
+        self.lock = threading.Lock()
+        self.pending_logs = []
+        self.reset(file_paths, total_duration)
+    
+    def reset(self, file_paths=(), total_duration=0):
+        """새 배치 시작 시 상태 초기화 (아직 출력하지 않은 로그는 유지)"""
+        with self.lock:
+            self.jobs = {
+                file_path: {"status": "pending", "progress": 0.0, "fps": None, "started": None, "estimated": False,
+                            "estimate": None}
+                for file_path in file_paths
+            }
+            self.total_files = len(self.jobs)
+            self.total_duration = total_duration
+            self.completed_files = 0
+            self.failed_files = 0
+            self.completed_duration = 0
+            self.phase = None  # 작업 외 진행 단계 표시 (예: 출력 파일 이동 중)
+            self.parallel_jobs = 1
+            self.estimated_seconds = 0.0  # 완료된 작업의 예상 시간 합계 (보정 비율 계산용)
+            self.actual_seconds = 0.0  # 완료된 작업의 실제 시간 합계
+            self.changed_jobs = set(self.jobs)
+            self.summary_changed = True
+    
+    def log(self, message):
+        """로그 메시지 추가 (다음 UI 갱신 때 한 번에 출력)"""
+        with self.lock:
+            self.pending_logs.append(f"[{time.strftime('%H:%M:%S')}] {message}\n")
+    
+    def start_job(self, file_path, estimated=True):
+        """작업 시작 (estimated=True면 실제 진행률이 보고될 때까지 시간 기반으로 추정)"""
+        self.update_job(file_path, status="running", progress=0.0, started=time.time(), estimated=estimated)
+    
+    def update_job(self, file_path, **fields):
+        """작업 상태 갱신 (진행률이 보고되면 추정 모드 해제)"""
+        with self.lock:
+            job = self.jobs.setdefault(file_path, {"status": "pending", "progress": 0.0, "fps": None,
+                                                   "started": None, "estimated": False, "estimate": None})
+            if "progress" in fields and "estimated" not in fields:
+                fields["estimated"] = False
+            job.update(fields)
+            self.changed_jobs.add(file_path)
+    
+    def set_estimates(self, estimates, parallel_jobs=1):
+        """작업별 예상 변환 시간 (초) 설정 - 남은 시간 계산 및 진행률 추정에 사용"""
+        with self.lock:
+            for file_path, seconds in estimates.items():
+                if file_path in self.jobs:
+                    self.jobs[file_path]["estimate"] = seconds
+                    self.changed_jobs.add(file_path)
+            self.parallel_jobs = max(1, parallel_jobs)
+            self.summary_changed = True
+    
+    def correction(self):
+        """이번 배치에서 실제 시간 / 예상 시간 비율 (완료된 작업 기준, lock 보유 상태에서 호출)"""
+        if self.estimated_seconds > 0 and self.actual_seconds > 0:
+            return self.actual_seconds / self.estimated_seconds
+        return 1.0
+    
+    def finish_job(self, file_path, status, duration=0):
+        """작업 종료 처리 및 전체 카운터 갱신"""
+        with self.lock:
+            job = self.jobs.get(file_path)
+            if job is not None and status == "done" and job["estimate"] and job["started"]:
+                # 예상과 실제 시간 차이를 남은 작업의 예상 시간에 반영
+                self.estimated_seconds += job["estimate"]
+                self.actual_seconds += time.time() - job["started"]
+            if job is not None:
+                if job["status"] == "cached" and status == "done":
+                    status = "cached"  # 캐시에서 가져온 결과는 캐시로 표시
+                job.update(status=status, progress=100.0 if status != "failed" else job["progress"], estimated=False)
+                self.changed_jobs.add(file_path)
+            if status == "failed":
+                self.failed_files += 1
+            else:
+                self.completed_files += 1
+                self.completed_duration += duration
+            self.summary_changed = True
+    
+    def get_job(self, file_path):
+        """작업 상태 사본 (없으면 None)"""
+        with self.lock:
+            job = self.jobs.get(file_path)
+            return dict(job) if job else None
+    
+    def set_phase(self, phase):
+        with self.lock:
+            self.phase = phase
+            self.summary_changed = True
+    
+    def job_progress(self, job, now):
+        """작업 진행률 (추정 모드면 예상 시간 또는 경과 시간 기반, 100%는 완료 시에만)"""
+        if job["estimated"] and job["started"]:
+            elapsed = now - job["started"]
+            if job["estimate"]:
+                return min(99.0, elapsed / (job["estimate"] * self.correction()) * 100)
+            return min(99.0, elapsed * ESTIMATED_PROGRESS_PER_SECOND)
+        return job["progress"]
+    
+    def remaining_seconds(self, now):
+        """남은 예상 시간 (대기 작업 + 실행 중 작업의 남은 시간을 동시 작업 수로 나눔, lock 보유 상태에서 호출)"""
+        correction = self.correction()
+        remaining = 0.0
+        for job in self.jobs.values():
+            if job["status"] == "pending":
+                if not job["estimate"]:
+                    return None
+                remaining += job["estimate"] * correction
+            elif job["status"] == "running":
+                if not job["estimate"]:
+                    return None
+                progress = self.job_progress(job, now)
+                remaining += job["estimate"] * correction * (1 - progress / 100)
+        return remaining / self.parallel_jobs
+    
+    def collect_changes(self):
+        """마지막 호출 이후 바뀐 작업, 대기 중인 로그, 요약 정보를 반환하고 변경 표시 초기화"""
+        now = time.time()
+        with self.lock:
+            running = [path for path, job in self.jobs.items() if job["status"] == "running"]
+            # 진행률을 추정 중인 작업은 매 갱신마다 다시 그림
+            changed = self.changed_jobs | {path for path in running if self.jobs[path]["estimated"]}
+            jobs = {path: dict(self.jobs[path], progress=self.job_progress(self.jobs[path], now)) for path in changed}
+            logs, self.pending_logs = self.pending_logs, []
+            
+            summary = None
+            if self.summary_changed or running:
+                summary = {
+                    "completed_files": self.completed_files,
+                    "failed_files": self.failed_files,
+                    "total_files": self.total_files,
+                    "running": running,
+                    "running_progress": (sum(self.job_progress(self.jobs[path], now) for path in running) / len(running)
+                                         if running else None),
+                    "phase": self.phase,
+                    "eta": self.remaining_seconds(now),
+                }
+            self.changed_jobs = set()
+            self.summary_changed = False
+        return jobs, logs, summary
+
+
+# 처리 속도 모델 설정 (이 컴퓨터에서 측정한 인코딩 속도로 변환 시간 예측)
+THROUGHPUT_MODEL_PATH = os.path.join(os.path.expanduser("~"), ".video_converter", "throughput.json")
+THROUGHPUT_SMOOTHING = 0.3  # 새 측정값 반영 비율 (지수 이동 평균)
+
+
+def get_stream_rotation(stream):
+    """ffprobe 스트림 정보의 회전 각도 (0, 90, 180, 270) - 표시 행렬(side data) 우선, 없으면 rotate 태그"""
+    rotation = stream.get("tags", {}).get("rotate", 0)
+    for side_data in stream.get("side_data_list", []):
+        if "rotation" in side_data:
+            rotation = side_data["rotation"]
+    return int(round(float(rotation))) % 360
+
+
+def probe_video(file_path):
+    """ffprobe로 동영상 정보 확인 (너비, 높이, 길이, FPS, 회전) - 실패 시 None
+    
+    너비 / 높이는 회전을 적용한 표시 크기 (FFMPEG가 디코딩 후 자동으로 회전하므로 필터와 같은 기준)
+    """
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream=width,height,avg_frame_rate:stream_tags=rotate:stream_side_data=rotation"
+                         ":format=duration",
+        "-of", "json",
+        file_path
+    ]
+    try:
+        result = run_process(cmd, timeout=60, capture_stdout=True)
+        info = json.loads(result["stdout"] or "{}")
+        stream = info["streams"][0]
+        numerator, _, denominator = stream.get("avg_frame_rate", "0/1").partition("/")
+        width, height = int(stream["width"]), int(stream["height"])
+        rotation = get_stream_rotation(stream)
+        if rotation in (90, 270):
+            width, height = height, width
+        return {
+            "width": width,
+            "height": height,
+            "duration": float(info.get("format", {}).get("duration", 0)),
+            "fps": float(numerator) / float(denominator or 1) if float(denominator or 1) else 0.0,
+            "rotation": rotation,
+        }
+    except (OSError, ValueError, KeyError, IndexError):
+        return None
+
+
+# 여러 입력 합치기 설정 (카메라가 나눠 저장한 파일 등을 하나의 출력으로 변환)
+MERGE_STREAM_FIELDS = ("codec_type", "codec_name", "profile", "width", "height", "pix_fmt", "sample_rate", "channels")
+MERGE_AUDIO_RATE = 48000  # 스트림 구성이 다른 입력을 합칠 때 맞추는 오디오 샘플 레이트
+
+
+def probe_stream_layout(file_path):
+    """합치기 호환성 확인용 스트림 구성 (스트림별 코덱 / 크기 / 형식)과 길이 - 실패 시 None"""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", f"stream={','.join(MERGE_STREAM_FIELDS)}:format=duration",
+        "-of", "json",
+        file_path
+    ]
+    try:
+        result = run_process(cmd, timeout=60, capture_stdout=True)
+        info = json.loads(result["stdout"] or "{}")
+        streams = [tuple(stream.get(field) for field in MERGE_STREAM_FIELDS) for stream in info["streams"]
+                   if stream.get("codec_type") in ("video", "audio")]
+        video = next(stream for stream in info["streams"] if stream.get("codec_type") == "video")
+        return {
+            "streams": streams,
+            "width": int(video["width"]),
+            "height": int(video["height"]),
+            "has_audio": any(stream[0] == "audio" for stream in streams),
+            "duration": float(info.get("format", {}).get("duration", 0)),
+        }
+    except (OSError, ValueError, KeyError, StopIteration):
+        return None
+
+
+def write_concat_list(inputs, list_path):
+    """concat demuxer 입력 목록 파일 작성 - inputs: [(경로, 구간)], 구간은 inpoint / outpoint로 지정"""
+    lines = ["ffconcat version 1.0"]
+    for path, time_range in inputs:
+        escaped = os.path.abspath(path).replace("'", "'\\''")
+        lines.append(f"file '{escaped}'")
+        if time_range:
+            start, end = time_range
+            if start:
+                lines.append(f"inpoint {start:.3f}")
+            if end is not None:
+                lines.append(f"outpoint {end:.3f}")
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def build_merge_command(inputs, output_path, height, fps, layouts, list_path, threads=None, tier=0,
+                        rate_factor=1.0, decimate=False):
+    """여러 입력을 순서대로 이어 한 번에 인코딩하는 FFMPEG 명령어 구성 - 반환값: (명령어, 스트림 복사 여부)
+    
+    inputs는 [(경로, 구간)], layouts는 입력별 probe_stream_layout 결과입니다.
+    모든 입력의 스트림 구성이 같으면 concat demuxer가 패킷을 스트림 복사로 이어 붙여 하나의 입력으로
+    전달하고 (list_path에 목록 작성), 다르면 concat 필터로 각 입력의 크기 / FPS / 오디오 형식을 맞춰
+    하나의 연속된 입력으로 인코딩합니다. 중간 파일을 만들지 않으므로 원본을 한 번만 읽습니다.
+    """
+    if len(inputs) < 2 or any(layout is None for layout in layouts):
+        raise ValueError("합칠 입력의 스트림 정보를 확인할 수 없습니다.")
+    
+    if all(layout["streams"] == layouts[0]["streams"] for layout in layouts):
+        write_concat_list(inputs, list_path)
+        cmd = build_ffmpeg_command(list_path, output_path, height, fps, threads, tier=tier, decimate=decimate,
+                                   rate_factor=rate_factor)
+        index = cmd.index("-i")
+        cmd[index:index] = ["-f", "concat", "-safe", "0"]
+        return cmd, True
+    
+    # 첫 번째 입력 기준 출력 크기 (비율이 다른 입력은 여백을 넣어 맞춤)
+    width, target_height = get_target_size(layouts[0]["width"], layouts[0]["height"], height)
+    has_audio = any(layout["has_audio"] for layout in layouts)
+    input_args, silence_args, filters, segments = [], [], [], []
+    for index, ((path, time_range), layout) in enumerate(zip(inputs, layouts)):
+        start, end = time_range or (None, None)
+        if start:
+            input_args += ["-ss", f"{start:.3f}"]
+        if end is not None:
+            input_args += ["-t", f"{end - (start or 0):.3f}"]
+        input_args += ["-i", path]
+        filters.append(f"[{index}:v:0]scale={width}:{target_height}:force_original_aspect_ratio=decrease,"
+                       f"pad={width}:{target_height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps},format=yuv420p[v{index}]")
+        segments.append(f"[v{index}]")
+        if not has_audio:
+            continue
+        # 오디오가 없는 입력은 같은 길이의 무음으로 채움 (concat 필터는 모든 입력의 스트림 구성이 같아야 함)
+        source = f"{index}:a:0"
+        if not layout["has_audio"]:
+            source = f"{len(inputs) + silence_args.count('-i')}:a"
+            silence_args += ["-f", "lavfi", "-t", f"{get_range_duration(layout['duration'], time_range):.3f}",
+                             "-i", f"anullsrc=r={MERGE_AUDIO_RATE}:cl=stereo"]
+        filters.append(f"[{source}]aresample={MERGE_AUDIO_RATE},"
+                       f"aformat=sample_fmts=fltp:channel_layouts=stereo[a{index}]")
+        segments.append(f"[a{index}]")
+    
+    concat = f"{''.join(segments)}concat=n={len(inputs)}:v=1:a={1 if has_audio else 0}[merged_v]"
+    if has_audio:
+        concat += "[merged_a]"
+    filters.append(concat)
+    video_label = "[merged_v]"
+    rate_args = []
+    if decimate:
+        filters.append("[merged_v]mpdecimate[decimated_v]")
+        video_label = "[decimated_v]"
+        rate_args = ["-vsync", "vfr"]
+    
+    cmd = [
+        "ffmpeg", "-y",
+        *input_args,
+        *silence_args,
+        "-filter_complex", ";".join(filters),
+        "-map", video_label,
+        *(["-map", "[merged_a]"] if has_audio else []),
+        *rate_args,
+        *get_encoder_args(height, tier, rate_factor),
+    ]
+    if threads:
+        cmd += ["-threads", str(threads)]
+    return cmd + [output_path], False
+
+
+def get_primary_encoder(system=None):
+    """MoviePy 방식에서 사용하는 인코더와 프리셋 (처리 속도 기록 키)"""
+    if (system or platform.system()) == "Darwin":
+        return "libx264", "medium"
+    return "libx265", "medium"
+
+
+class ThroughputModel:
+    """완료된 작업의 처리 속도(영상 초 / 실제 초)를 기록하고 변환 시간을 예측
+    
+    (인코더, 프리셋, 원본 해상도, 출력 해상도) 조합별로 지수 이동 평균을 저장하고,
+    기록이 없는 조합은 같은 인코더의 기록으로 '영상 1초당 처리 시간 = a + b × 메가픽셀'
+    직선을 맞춰 추정합니다 (메가픽셀은 원본과 출력 프레임 크기의 합).
+    """
+    
+    def __init__(self, path=THROUGHPUT_MODEL_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.records = json.load(f)
+        except (OSError, ValueError):
+            self.records = {}
+    
+    @staticmethod
+    def make_key(encoder, preset, source_height, target_height):
+        return f"{encoder}|{preset}|{int(source_height)}|{int(target_height)}"
+    
+    @staticmethod
+    def megapixels(source_height, target_height):
+        """원본 + 출력 프레임 크기 (16:9 기준 메가픽셀)"""
+        return (source_height ** 2 + target_height ** 2) * 16 / 9 / 1e6
+    
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.records, f, indent=1)
+        os.replace(temp_path, self.path)
+    
+    def record(self, encoder, preset, source_height, target_height, media_seconds, wall_seconds):
+        """완료된 작업의 처리 속도 기록"""
+        if not source_height or media_seconds <= 0 or wall_seconds <= 0:
+            return
+        speed = media_seconds / wall_seconds
+        key = self.make_key(encoder, preset, source_height, target_height)
+        with self.lock:
+            record = self.records.get(key)
+            if record:
+                record["speed"] = (1 - THROUGHPUT_SMOOTHING) * record["speed"] + THROUGHPUT_SMOOTHING * speed
+                record["count"] += 1
+            else:
+                self.records[key] = {"speed": speed, "count": 1}
+            try:
+                self.save()
+            except OSError:
+                pass
+    
+    def predict_speed(self, encoder, preset, source_height, target_height):
+        """예상 처리 속도 (영상 초 / 실제 초) - 예측할 수 없으면 None"""
+        if not source_height:
+            return None
+        with self.lock:
+            record = self.records.get(self.make_key(encoder, preset, source_height, target_height))
+            if record:
+                return record["speed"]
+            
+            # 같은 인코더의 기록으로 영상 1초당 처리 시간을 메가픽셀에 대한 직선으로 추정
+            points = []
+            for key, record in self.records.items():
+                record_encoder, record_preset, record_source, record_target = key.split("|")
+                if record_encoder == encoder and record_preset == preset:
+                    points.append((self.megapixels(int(record_source), int(record_target)), 1 / record["speed"]))
+        
+        if not points:
+            return None
+        x = self.megapixels(source_height, target_height)
+        mean_x = sum(px for px, _ in points) / len(points)
+        mean_y = sum(py for _, py in points) / len(points)
+        variance = sum((px - mean_x) ** 2 for px, _ in points)
+        if variance > 0:
+            slope = sum((px - mean_x) * (py - mean_y) for px, py in points) / variance
+            cost = mean_y + slope * (x - mean_x)
+        else:
+            # 한 가지 크기의 기록만 있으면 픽셀 수에 비례한다고 가정
+            cost = mean_y * x / mean_x
+        # 기록 범위를 벗어난 외삽으로 0 이하가 되지 않도록 최소값 적용
+        cost = max(cost, min(py for _, py in points) * 0.25)
+        return 1 / cost
+    
+    def estimate(self, media_seconds, encoder, preset, source_height, target_height):
+        """예상 변환 시간 (초) - 예측할 수 없으면 None"""
+        speed = self.predict_speed(encoder, preset, source_height, target_height)
+        if not speed or not media_seconds:
+            return None
+        return media_seconds / speed
+
+
+def estimate_batch(file_paths, height, concurrency=1, model=None):
+    """파일별 / 전체 예상 변환 시간 계산 (GUI 없이 사용하는 API)
+    
+    반환값: {"files": {파일 경로: 예상 초 또는 None}, "total": 전체 예상 초 또는 None}
+    """
+    model = model or ThroughputModel()
+    encoder, preset = get_video_codec()[0], "medium"
+    estimates = {}
+    for file_path in file_paths:
+        file_path, time_range = split_file_range(file_path)
+        info = probe_video(file_path)
+        if info is None:
+            estimates[file_path] = None
+            continue
+        media_seconds = get_range_duration(info["duration"], time_range)
+        target_height = clamp_target(height, 0, info["height"])[0]
+        estimates[file_path] = model.estimate(media_seconds, encoder, preset, info["height"], target_height)
+    
+    known = [seconds for seconds in estimates.values() if seconds]
+    total = sum(known) / max(1, concurrency) if known else None
+    return {"files": estimates, "total": total}
+
+
+# 샘플 화질 검사 설정 (파일 전체 대신 고르게 분포한 짧은 구간만 원본과 비교)
+QUALITY_METRICS = {
+    # 지표: (FFMPEG 필터, 기본 기준값)
+    "SSIM": ("ssim", 0.95),
+    "PSNR": ("psnr", 35.0),
+    "VMAF": ("libvmaf", 85.0),
+}
+QUALITY_SAMPLE_WINDOWS = 5  # 비교할 구간 수
+QUALITY_WINDOW_SECONDS = 2.0  # 구간 길이 (초)
+QUALITY_MAX_TIER = 2  # 기준 미달 시 상위 품질 단계로 재인코딩하는 최대 횟수
+
+
+def parse_quality_score(metric, stderr):
+    """FFMPEG 화질 필터 출력에서 점수 추출 - 찾지 못하면 None"""
+    patterns = {
+        "SSIM": r"SSIM .*All:([\d.]+)",
+        "PSNR": r"PSNR .*average:([\d.]+|inf)",
+        "VMAF": r"VMAF score[:=]\s*([\d.]+)",
+    }
+    match = None
+    for match in re.finditer(patterns[metric], stderr or ""):
+        pass
+    if not match:
+        return None
+    # 두 구간이 완전히 같으면 PSNR이 inf로 표시됨
+    return 100.0 if match.group(1) == "inf" else float(match.group(1))
+
+
+def measure_quality_window(source_path, output_path, output_start, source_start, duration, fps, metric="SSIM",
+                           crop=None):
+    """출력의 한 구간을 원본의 같은 구간과 비교한 화질 점수 - 측정 실패 시 None
+    
+    원본 구간은 출력과 같은 영역(crop), 프레임 레이트, 크기로 맞춘 후 비교합니다.
+    (정지 화면 제거로 가변 프레임 레이트인 출력도 같은 프레임 레이트로 맞춤)
+    """
+    source_filter = f"crop={crop['width']}:{crop['height']}:{crop['x']}:{crop['y']}," if crop else ""
+    graph = (
+        f"[0:v]settb=AVTB,setpts=PTS-STARTPTS,fps={fps}[main];"
+        f"[1:v]{source_filter}settb=AVTB,setpts=PTS-STARTPTS,fps={fps}[source];"
+        "[source][main]scale2ref=flags=bicubic[reference][distorted];"
+        f"[distorted][reference]{QUALITY_METRICS[metric][0]}"
+    )
+    cmd = [
+        "ffmpeg", "-hide_banner", "-nostats",
+        "-ss", f"{output_start:.3f}", "-t", f"{duration:.3f}", "-i", output_path,
+        "-ss", f"{source_start:.3f}", "-t", f"{duration:.3f}", "-i", source_path,
+        "-filter_complex", graph,
+        "-an", "-f", "null", "-"
+    ]
+    try:
+        result = run_process(cmd, timeout=max(60, duration * 30), idle_timeout=None)
+    except OSError:
+        return None
+    if result["returncode"] != 0:
+        return None
+    return parse_quality_score(metric, result["stderr"])
+
+
+def spread_sample_points(start, length, count, window=0.0):
+    """start부터 length초 구간에 고르게 분포한 count개 샘플 시작 지점 (각 샘플 길이 window)"""
+    return [start + (length - window) * (index + 0.5) / count for index in range(count)]
+
+
+def check_sampled_quality(source_path, output_path, fps, metric="SSIM", time_range=None,
+                          windows=QUALITY_SAMPLE_WINDOWS, window_seconds=QUALITY_WINDOW_SECONDS,
+                          max_workers=None, crop=None):
+    """출력 전체에 고르게 분포한 짧은 구간만 병렬로 원본과 비교하여 화질 확인
+    
+    반환값: {"metric", "scores", "min", "mean"} - 측정된 구간이 없으면 None
+    """
+    info = probe_video(output_path)
+    if not info or info["duration"] <= 0:
+        return None
+    duration = info["duration"]
+    window_seconds = min(window_seconds, duration)
+    count = max(1, min(windows, int(duration // window_seconds)))
+    
+    # 출력의 0초는 원본의 구간 시작 지점에 해당
+    offset = (time_range[0] or 0) if time_range else 0
+    starts = spread_sample_points(0.0, duration, count, window_seconds)
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(count, max_workers or count))) as executor:
+        scores = list(executor.map(
+            lambda start: measure_quality_window(source_path, output_path, start, offset + start,
+                                                 window_seconds, fps, metric, crop),
+            starts
+        ))
+    scores = [score for score in scores if score is not None]
+    if not scores:
+        return None
+    return {"metric": metric, "scores": scores, "min": min(scores), "mean": sum(scores) / len(scores)}
+
+
+# 샘플 인코딩 기반 파라미터 조정 설정 (정적인 영상은 더 낮은 비트레이트로도 목표 화질 달성)
+TUNING_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".video_converter", "tuning.json")
+TUNING_RATE_FACTORS = (0.5, 0.75, 1.0)  # 기본 비트레이트 대비 후보 배율 (저렴한 순서)
+TUNING_SAMPLE_WINDOWS = 3  # 후보별로 인코딩할 구간 수
+TUNING_SAMPLE_SECONDS = 2.0  # 구간 길이 (초)
+
+
+def encode_tuning_sample(source_path, sample_path, start, duration, height, fps, rate_factor, crop=None):
+    """한 후보 배율로 짧은 구간을 인코딩 - 성공 시 파일 크기 (바이트), 실패 시 None"""
+    cmd = build_ffmpeg_command(source_path, sample_path, height, fps, threads=1, time_range=(start, start + duration),
+                               crop=crop, rate_factor=rate_factor)
+    try:
+        result = run_process(cmd, timeout=max(120, duration * 60), idle_timeout=None)
+    except OSError:
+        return None
+    if result["returncode"] != 0 or not os.path.exists(sample_path):
+        return None
+    return os.path.getsize(sample_path)
+
+
+class EncoderTuner:
+    """파일마다 짧은 구간을 여러 비트레이트 배율로 병렬 인코딩하여 목표 화질을 만족하는
+    가장 저렴한 배율을 선택하고, 입력 내용 해시를 키로 결정을 저장하여 같은 입력은 분석을 건너뜀
+    """
+    
+    def __init__(self, path=TUNING_CACHE_PATH, metric="SSIM", threshold=None, full_hash=False, log=print):
+        self.path = path
+        self.metric = metric
+        self.threshold = QUALITY_METRICS[metric][1] if threshold is None else threshold
+        self.full_hash = full_hash
+        self.log = log
+        self.lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.decisions = json.load(f)
+        except (OSError, ValueError):
+            self.decisions = {}
+    
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.decisions, f, indent=1)
+        os.replace(temp_path, self.path)
+    
+    def make_key(self, file_path, settings):
+        """입력 내용 해시와 분석 조건 해시를 결합한 키"""
+        content_hash = compute_content_hash(file_path, self.full_hash)
+        settings = dict(settings, metric=self.metric, threshold=self.threshold, factors=TUNING_RATE_FACTORS)
+        settings_hash = hashlib.blake2b(json.dumps(settings, sort_keys=True).encode("utf-8"), digest_size=12).hexdigest()
+        return f"{content_hash}-{settings_hash}"
+    
+    def choose(self, file_path, source_path, height, fps, time_range=None, crop=None, max_workers=None):
+        """파일에 사용할 비트레이트 배율 결정 - 반환값: (배율, 저장된 결정 사용 여부)"""
+        key = self.make_key(file_path, {"height": height, "fps": fps, "codec": get_video_codec(),
+                                        "range": time_range, "crop": crop})
+        with self.lock:
+            decision = self.decisions.get(key)
+        if decision:
+            return decision["rate_factor"], True
+        
+        results = self.analyze(source_path, height, fps, time_range, crop, max_workers)
+        if not results:
+            # 샘플을 인코딩 / 측정할 수 없으면 저장하지 않고 기본 비트레이트 사용 (다음 배치에서 다시 분석)
+            self.log("  샘플 인코딩 / 화질 측정 실패 - 기본 비트레이트 사용")
+            return 1.0, False
+        passing = [factor for factor, result in results.items() if result["min"] >= self.threshold]
+        # 목표 화질을 만족하는 후보가 없으면 기본 비트레이트 유지 (화질 검사 / 재인코딩이 처리)
+        rate_factor = min(passing, key=lambda factor: results[factor]["size"]) if passing else 1.0
+        
+        for factor in TUNING_RATE_FACTORS:
+            if factor in results:
+                self.log(f"  배율 {factor:g}: 샘플 {results[factor]['size'] / 1024:.0f} KB, "
+                         f"{self.metric} 최소 {results[factor]['min']:.3f}")
+        
+        with self.lock:
+            self.decisions[key] = {"rate_factor": rate_factor, "results": {str(factor): result
+                                                                          for factor, result in results.items()}}
+            try:
+                self.save()
+            except OSError:
+                pass
+        return rate_factor, False
+    
+    def analyze(self, source_path, height, fps, time_range=None, crop=None, max_workers=None):
+        """모든 후보 배율 x 샘플 구간을 병렬로 인코딩하고 크기와 화질 측정
+        
+        반환값: {배율: {"size": 전체 샘플 크기, "min": 최소 화질 점수}} - 실패한 후보는 제외
+        """
+        info = probe_video(source_path)
+        if not info or info["duration"] <= 0:
+            return {}
+        start = (time_range[0] or 0) if time_range else 0
+        end = time_range[1] if time_range and time_range[1] is not None else info["duration"]
+        length = max(0.0, min(end, info["duration"]) - start)
+        window_seconds = min(TUNING_SAMPLE_SECONDS, length)
+        if window_seconds <= 0:
+            return {}
+        starts = spread_sample_points(start, length, TUNING_SAMPLE_WINDOWS, window_seconds)
+        
+        with tempfile.TemporaryDirectory(prefix="tuning_") as sample_dir:
+            def measure(task):
+                factor, index, window_start = task
+                sample_path = os.path.join(sample_dir, f"{factor:g}_{index}.mp4")
+                size = encode_tuning_sample(source_path, sample_path, window_start, window_seconds, height, fps,
+                                            factor, crop)
+                if size is None:
+                    return factor, None, None
+                score = measure_quality_window(source_path, sample_path, 0, window_start, window_seconds, fps,
+                                               self.metric, crop)
+                return factor, size, score
+            
+            tasks = [(factor, index, window_start) for factor in TUNING_RATE_FACTORS
+                     for index, window_start in enumerate(starts)]
+            with ThreadPoolExecutor(max_workers=max(1, min(len(tasks), max_workers or len(tasks)))) as executor:
+                measurements = list(executor.map(measure, tasks))
+        
+        results = {}
+        for factor in TUNING_RATE_FACTORS:
+            samples = [(size, score) for sample_factor, size, score in measurements if sample_factor == factor]
+            if not samples or any(size is None or score is None for size, score in samples):
+                continue
+            results[factor] = {"size": sum(size for size, _ in samples), "min": min(score for _, score in samples)}
+        return results
+
+
+# 검은 여백 자동 검출 설정
+CROP_SAMPLE_POINTS = 6  # 검출할 지점 수 (파일 전체에 고르게 분포)
+CROP_SAMPLE_FRAMES = 10  # 지점별로 분석할 프레임 수
+CROP_MIN_SAVING = 0.02  # 줄어드는 면적이 이 비율보다 작으면 자르지 않음
+
+
+def detect_crop_window(file_path, start, frames=CROP_SAMPLE_FRAMES):
+    """한 지점의 프레임에서 검출한 화면 영역 (너비, 높이, x, y) - 검출 실패 시 None"""
+    cmd = [
+        "ffmpeg", "-hide_banner", "-nostats",
+        "-ss", f"{start:.3f}", "-i", file_path,
+        "-frames:v", str(frames),
+        "-vf", "cropdetect=limit=24:round=2:reset=0",
+        "-an", "-f", "null", "-"
+    ]
+    try:
+        result = run_process(cmd, timeout=120, idle_timeout=None)
+    except OSError:
+        return None
+    # reset=0이면 마지막 줄이 분석한 모든 프레임을 포함하는 영역
+    matches = re.findall(r"crop=(-?\d+):(-?\d+):(\d+):(\d+)", result["stderr"])
+    if not matches:
+        return None
+    width, height, x, y = map(int, matches[-1])
+    if width <= 0 or height <= 0:
+        return None  # 완전히 검은 프레임
+    return width, height, x, y
+
+
+def detect_crop(file_path, time_range=None, points=CROP_SAMPLE_POINTS, max_workers=None):
+    """여러 지점에서 병렬로 검은 여백을 검출하여 모든 지점의 화면을 포함하는 자르기 영역 결정
+    
+    어두운 장면에서 화면 일부가 여백으로 검출되더라도 다른 지점의 영역에 포함되므로 잘리지 않습니다.
+    반환값: {"width", "height", "x", "y", "source_width", "source_height"} - 여백이 없거나 검출 실패 시 None
+    """
+    info = probe_video(file_path)
+    if not info or info["duration"] <= 0:
+        return None
+    # cropdetect는 자동 회전된 프레임을 분석하므로 회전을 적용한 표시 크기 기준
+    source_width, source_height = info["width"], info["height"]
+    start = (time_range[0] or 0) if time_range else 0
+    end = time_range[1] if time_range and time_range[1] is not None else info["duration"]
+    length = max(0.0, min(end, info["duration"]) - start)
+    starts = [start + length * (index + 0.5) / points for index in range(points)]
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(points, max_workers or points))) as executor:
+        rects = [rect for rect in executor.map(lambda point: detect_crop_window(file_path, point), starts) if rect]
+    
+    # 절반 이상의 지점에서 검출되지 않으면 신뢰할 수 없음
+    if len(rects) * 2 < points:
+        return None
+    
+    left = max(0, min(x for _, _, x, _ in rects))
+    top = max(0, min(y for _, _, _, y in rects))
+    right = min(source_width, max(x + width for width, _, x, _ in rects))
+    bottom = min(source_height, max(y + height for _, height, _, y in rects))
+    width = (right - left) // 2 * 2
+    height = (bottom - top) // 2 * 2
+    if width <= 0 or height <= 0 or width * height >= source_width * source_height * (1 - CROP_MIN_SAVING):
+        return None
+    return {"width": width, "height": height, "x": left, "y": top,
+            "source_width": source_width, "source_height": source_height}
+
+
 class MultiFileVideoConverterApp:
     def __init__(self, root):
         self.root = root
@@ -104,15 +2078,81 @@ class MultiFileVideoConverterApp:
         self.total_video_duration = 0
         self.video_durations = {}  # 파일 경로를 키로, 길이를 값으로 저장
         
+        self.video_sizes = {}  # 파일 경로를 키로, 원본 해상도 (너비, 높이)를 값으로 저장
+        self.video_fps = {}  # 파일 경로를 키로, 원본 FPS를 값으로 저장
+        self.file_targets = {}  # 배치 시작 시 파일별로 정한 출력 (높이, FPS) - 원본보다 높지 않게 제한
+        
+        # 변환 스레드가 갱신하고 UI 타이머가 그리는 배치 진행 상태
+        self.batch_state = BatchState()
+        
+        # 이 컴퓨터의 처리 속도 기록 (예상 변환 시간 계산용)
+        self.throughput_model = ThroughputModel()
+        self.file_ranges = {}  # 파일 경로를 키로, 변환 구간 (시작, 끝) 초를 값으로 저장
+        self.file_items = {}  # 파일 경로를 키로, 파일 목록(Treeview) 항목 ID를 값으로 저장
+        self.merge_groups = {}  # 합칠 첫 번째 파일 경로를 키로, 순서대로 합칠 파일 경로 목록을 값으로 저장
+        self.batch_files = []  # 배치 작업 목록 (합치기 그룹은 첫 번째 파일 하나로 처리)
+        
         # 다운로드 경로 설정
         self.download_path = os.path.expanduser("~/Downloads")
         
         # 해상도 설정 변수 (360p 기본값)
         self.resolution_var = tk.IntVar(value=360)
         
+        # 설정을 바꾸면 파일 목록의 파일별 출력 해상도 / FPS 다시 표시
+        self.fps_var.trace_add("write", lambda *args: self.refresh_targets())
+        self.resolution_var.trace_add("write", lambda *args: self.refresh_targets())
+        
         # 출력 폴더 변경 가능하도록 설정
         self.output_folder_var = tk.StringVar(value=self.download_path)
         
+        # 분산 인코딩 설정 (코디네이터 모드)
+        self.distributed_var = tk.BooleanVar(value=False)
+        self.coordinator_host_var = tk.StringVar(value=DISTRIBUTED_DEFAULT_HOST)
+        self.coordinator_port_var = tk.IntVar(value=DISTRIBUTED_DEFAULT_PORT)
+        
+        # 리소스 제한 설정 (동시 작업 수 0 = 자동)
+        self.max_jobs_var = tk.IntVar(value=0)
+        self.low_priority_var = tk.BooleanVar(value=True)
+        self.pin_cpus_var = tk.BooleanVar(value=False)
+        self.governor = None
+        
+        # 메모리 제한 모드 (고정 크기 프레임 버퍼로 인코딩, 작업당 메모리 상한)
+        self.bounded_memory_var = tk.BooleanVar(value=False)
+        self.memory_limit_var = tk.IntVar(value=GOVERNOR_JOB_MEMORY_MB)
+        
+        # 배치 시작 시점의 변환 설정 (변환 스레드에서 사용)
+        self.batch_settings = {}
+        
+        # 출력 캐시 설정 (같은 내용의 입력은 기존 결과 재사용)
+        self.use_cache_var = tk.BooleanVar(value=True)
+        self.full_hash_var = tk.BooleanVar(value=False)
+        self.output_cache = None
+        
+        # 로컬 임시 폴더 사용 설정 (네트워크 드라이브 입력/출력)
+        self.use_staging_var = tk.BooleanVar(value=False)
+        self.staging_dir_var = tk.StringVar(value=STAGING_DIR)
+        self.stager = None
+        
+        # 샘플 화질 검사 설정 (기준 미달 시 상위 품질 단계로 재인코딩)
+        self.verify_quality_var = tk.BooleanVar(value=False)
+        self.quality_metric_var = tk.StringVar(value="SSIM")
+        self.quality_threshold_var = tk.StringVar(value="")
+        
+        # 샘플 인코딩 기반 비트레이트 조정 (화질 검사 지표 / 기준을 목표로 사용)
+        self.tune_encoder_var = tk.BooleanVar(value=False)
+        self.encoder_tuner = None
+        self.file_rate_factors = {}  # 파일 경로를 키로, 선택한 비트레이트 배율을 값으로 저장
+        
+        # 내용별 처리 설정 (검은 여백 자동 자르기, 강의/화면 녹화의 정지 화면 제거)
+        self.auto_crop_var = tk.BooleanVar(value=False)
+        self.decimate_var = tk.BooleanVar(value=False)
+        self.file_crops = {}  # 파일 경로를 키로, 검출한 자르기 영역(없으면 None)을 값으로 저장
+        self.memory_single_thread = False  # 메모리 제한 모드에서 상한을 넘은 적이 있으면 이후 파일은 스레드 1개 사용
+        
+        # 병렬 변환 시 같은 출력 파일명을 중복 사용하지 않도록 예약
+        self.reserved_output_paths = set()
+        self.output_path_lock = threading.Lock()
+        
         # 메뉴 바 생성
         self.create_menu_bar()
         
@@ -149,15 +2189,21 @@ class MultiFileVideoConverterApp:
         file_list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         
         # 파일 목록 표시 (Treeview)
-        self.file_list = ttk.Treeview(file_list_frame, columns=("size", "duration", "fps"), height=10)
+        self.file_list = ttk.Treeview(file_list_frame, columns=("size", "duration", "fps", "target", "range", "status"), height=10)
         self.file_list.heading("#0", text="파일명")
         self.file_list.heading("size", text="크기")
         self.file_list.heading("duration", text="길이")
         self.file_list.heading("fps", text="FPS")
+        self.file_list.heading("target", text="출력")
+        self.file_list.heading("range", text="구간")
+        self.file_list.heading("status", text="상태")
         self.file_list.column("#0", width=180)
         self.file_list.column("size", width=70, anchor="center")
         self.file_list.column("duration", width=70, anchor="center")
         self.file_list.column("fps", width=50, anchor="center")
+        self.file_list.column("target", width=120, anchor="center")
+        self.file_list.column("range", width=130, anchor="center")
+        self.file_list.column("status", width=110, anchor="center")
         self.file_list.pack(fill=tk.BOTH, expand=True)
         
         # 파일 목록 스크롤바
@@ -165,6 +2211,26 @@ class MultiFileVideoConverterApp:
         self.file_list.configure(yscrollcommand=file_list_scrollbar.set)
         file_list_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # 변환 구간 설정 (선택된 파일의 시작/끝 시간, 비워두면 처음/끝까지)
+        range_frame = ttk.Frame(file_list_frame)
+        range_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        self.range_start_var = tk.StringVar()
+        self.range_end_var = tk.StringVar()
+        ttk.Label(range_frame, text="구간:").pack(side=tk.LEFT)
+        ttk.Entry(range_frame, textvariable=self.range_start_var, width=9).pack(side=tk.LEFT, padx=(5, 2))
+        ttk.Label(range_frame, text="~").pack(side=tk.LEFT)
+        ttk.Entry(range_frame, textvariable=self.range_end_var, width=9).pack(side=tk.LEFT, padx=(2, 5))
+        ttk.Button(range_frame, text="해제", command=self.clear_selected_range).pack(side=tk.RIGHT)
+        ttk.Button(range_frame, text="구간 적용", command=self.apply_selected_range).pack(side=tk.RIGHT, padx=(0, 5))
+        
+        # 선택된 파일을 목록 순서대로 하나의 출력으로 합치기 (카메라가 나눠 저장한 파일 등)
+        merge_frame = ttk.Frame(file_list_frame)
+        merge_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        ttk.Button(merge_frame, text="선택 파일 합치기", command=self.merge_selected_files).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Button(merge_frame, text="합치기 해제", command=self.clear_selected_merge).pack(side=tk.RIGHT, padx=(5, 0))
+        
         # 선택된 파일 제거 버튼
         remove_btn = ttk.Button(file_list_frame, text="선택된 파일 제거", command=self.remove_selected_file)
         remove_btn.pack(fill=tk.X, pady=(5, 0))
@@ -195,6 +2261,66 @@ class MultiFileVideoConverterApp:
         ttk.Radiobutton(resolution_frame, text="720p", variable=self.resolution_var, value=720).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Radiobutton(resolution_frame, text="1080p", variable=self.resolution_var, value=1080).pack(side=tk.LEFT)
         
+        # 분산 인코딩 설정 (다른 호스트의 워커 프로세스에 작업 임대)
+        distributed_frame = ttk.Frame(settings_frame)
+        distributed_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Checkbutton(distributed_frame, text="분산 인코딩 (코디네이터)", variable=self.distributed_var).pack(side=tk.LEFT)
+        ttk.Label(distributed_frame, text="수신 주소:").pack(side=tk.LEFT, padx=(10, 5))
+        ttk.Entry(distributed_frame, textvariable=self.coordinator_host_var, width=15).pack(side=tk.LEFT)
+        ttk.Label(distributed_frame, text="포트:").pack(side=tk.LEFT, padx=(10, 5))
+        ttk.Entry(distributed_frame, textvariable=self.coordinator_port_var, width=7).pack(side=tk.LEFT)
+        
+        # 리소스 제한 설정 (다른 서비스가 CPU를 사용할 수 있도록)
+        governor_frame = ttk.Frame(settings_frame)
+        governor_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(governor_frame, text="동시 작업 (0=자동):").pack(side=tk.LEFT)
+        ttk.Spinbox(governor_frame, from_=0, to=16, textvariable=self.max_jobs_var, width=4).pack(side=tk.LEFT, padx=(5, 10))
+        ttk.Checkbutton(governor_frame, text="낮은 우선순위", variable=self.low_priority_var).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Checkbutton(governor_frame, text="CPU 코어 고정", variable=self.pin_cpus_var).pack(side=tk.LEFT)
+        
+        # 메모리 제한 모드 (메모리가 적은 서버에서 작업당 사용량을 상한 이하로 유지)
+        memory_frame = ttk.Frame(settings_frame)
+        memory_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Checkbutton(memory_frame, text="메모리 제한 모드", variable=self.bounded_memory_var).pack(side=tk.LEFT)
+        ttk.Label(memory_frame, text="작업당 상한 (MB):").pack(side=tk.LEFT, padx=(10, 5))
+        ttk.Spinbox(memory_frame, from_=MEMORY_LIMIT_MIN_MB, to=65536, increment=256,
+                    textvariable=self.memory_limit_var, width=6).pack(side=tk.LEFT)
+        
+        # 출력 캐시 설정
+        cache_frame = ttk.Frame(settings_frame)
+        cache_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Checkbutton(cache_frame, text="변환 결과 캐시 사용", variable=self.use_cache_var).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Checkbutton(cache_frame, text="전체 내용 해시", variable=self.full_hash_var).pack(side=tk.LEFT)
+        
+        # 로컬 임시 폴더 설정 (입력 사전 복사 및 출력 비동기 이동)
+        staging_frame = ttk.Frame(settings_frame)
+        staging_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Checkbutton(staging_frame, text="로컬 임시 폴더 사용:", variable=self.use_staging_var).pack(side=tk.LEFT)
+        ttk.Entry(staging_frame, textvariable=self.staging_dir_var, width=20).pack(side=tk.LEFT, padx=(5, 0), fill=tk.X, expand=True)
+        
+        # 샘플 화질 검사 설정 (기준값을 비워두면 지표별 기본값 사용)
+        quality_frame = ttk.Frame(settings_frame)
+        quality_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Checkbutton(quality_frame, text="샘플 화질 검사", variable=self.verify_quality_var).pack(side=tk.LEFT)
+        ttk.Combobox(quality_frame, textvariable=self.quality_metric_var, values=list(QUALITY_METRICS),
+                     state="readonly", width=6).pack(side=tk.LEFT, padx=(5, 10))
+        ttk.Label(quality_frame, text="기준:").pack(side=tk.LEFT)
+        ttk.Entry(quality_frame, textvariable=self.quality_threshold_var, width=6).pack(side=tk.LEFT, padx=(5, 10))
+        ttk.Checkbutton(quality_frame, text="샘플로 비트레이트 조정", variable=self.tune_encoder_var).pack(side=tk.LEFT)
+        
+        # 내용별 처리 (검은 여백은 검출한 영역만, 정지 화면은 바뀐 프레임만 인코딩)
+        content_frame = ttk.Frame(settings_frame)
+        content_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Checkbutton(content_frame, text="검은 여백 자동 자르기", variable=self.auto_crop_var).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Checkbutton(content_frame, text="정지 화면 제거 (강의/화면 녹화)", variable=self.decimate_var).pack(side=tk.LEFT)
+        
         # 고정 설정 정보
         fixed_settings_frame = ttk.Frame(settings_frame)
         fixed_settings_frame.pack(fill=tk.X, pady=(0, 10))
@@ -271,6 +2397,9 @@ class MultiFileVideoConverterApp:
         
         # 업데이트 확인
         self.check_for_updates()
+        
+        # 배치 상태 주기적 갱신 시작
+        self.root.after(UI_REFRESH_INTERVAL_MS, self.refresh_ui)
     
     def create_menu_bar(self):
         """메뉴 바 생성"""
@@ -290,6 +2419,7 @@ class MultiFileVideoConverterApp:
         menubar.add_cascade(label="도구", menu=tools_menu)
         tools_menu.add_command(label="모든 파일 제거", command=self.clear_file_list)
         tools_menu.add_command(label="출력 폴더 열기", command=self.open_output_folder)
+        tools_menu.add_command(label="변환 캐시 비우기", command=self.clear_output_cache)
         tools_menu.add_separator()
         tools_menu.add_command(label="설정 초기화", command=self.reset_settings)
         
@@ -322,6 +2452,7 @@ class MultiFileVideoConverterApp:
 
 1. '동영상 파일 선택' 버튼을 클릭하여 변환할 파일을 선택합니다.
 2. 원하는 프레임 레이트와 해상도를 선택합니다.
+   (필요하면 파일을 선택하고 구간 시작/끝을 입력한 뒤 '구간 적용'을 누르면 해당 구간만 변환합니다.)
 3. '모든 파일 변환 시작' 버튼을 클릭하여 변환을 시작합니다.
 4. 변환된 파일은 선택한 출력 폴더에 저장됩니다.
 
@@ -347,8 +2478,29 @@ class MultiFileVideoConverterApp:
             self.fps_var.set(30)
             self.resolution_var.set(360)
             self.output_folder_var.set(self.download_path)
+            self.distributed_var.set(False)
+            self.coordinator_host_var.set(DISTRIBUTED_DEFAULT_HOST)
+            self.coordinator_port_var.set(DISTRIBUTED_DEFAULT_PORT)
+            self.max_jobs_var.set(0)
+            self.low_priority_var.set(True)
+            self.pin_cpus_var.set(False)
+            self.bounded_memory_var.set(False)
+            self.memory_limit_var.set(GOVERNOR_JOB_MEMORY_MB)
+            self.use_cache_var.set(True)
+            self.full_hash_var.set(False)
+            self.use_staging_var.set(False)
+            self.staging_dir_var.set(STAGING_DIR)
             self.log("설정이 초기화되었습니다.")
     
+    def clear_output_cache(self):
+        """변환 캐시 비우기"""
+        if messagebox.askyesno("변환 캐시 비우기", f"변환 캐시를 모두 삭제하시겠습니까?\n{CACHE_DIR}"):
+            try:
+                OutputCache(log=self.log).clear()
+                self.log("변환 캐시를 비웠습니다.")
+            except OSError as e:
+                messagebox.showerror("오류", f"캐시를 비울 수 없습니다: {e}")
+    
     def select_output_folder(self):
         """출력 폴더 선택"""
         folder_path = filedialog.askdirectory(title="변환된 파일을 저장할 폴더 선택")
@@ -376,15 +2528,70 @@ class MultiFileVideoConverterApp:
             messagebox.showerror("오류", f"폴더를 열 수 없습니다: {e}")
     
     def log(self, message):
-        """로그 메시지 추가"""
+        """로그 메시지 추가 (다른 스레드에서 호출하면 다음 UI 갱신 때 한 번에 출력)"""
+        if threading.current_thread() is not threading.main_thread():
+            self.batch_state.log(message)
+            return
         self.log_text.insert(tk.END, f"[{time.strftime('%H:%M:%S')}] {message}\n")
         self.log_text.see(tk.END)
         self.root.update_idletasks()
     
+    def refresh_ui(self):
+        """UI 타이머 - 변환 이벤트 수와 관계없이 일정 주기로 배치 상태를 화면에 반영"""
+        try:
+            self.render_batch_state()
+        finally:
+            self.root.after(UI_REFRESH_INTERVAL_MS, self.refresh_ui)
+    
+    def render_batch_state(self):
+        """마지막 갱신 이후 바뀐 작업 행, 로그, 진행 표시줄만 다시 그림"""
+        jobs, logs, summary = self.batch_state.collect_changes()
+        
+        if logs:
+            self.log_text.insert(tk.END, "".join(logs))
+            self.log_text.see(tk.END)
+        
+        for file_path, job in jobs.items():
+            item = self.file_items.get(file_path)
+            if item is not None and self.file_list.exists(item):
+                self.file_list.set(item, "status", self.format_job_status(job))
+        
+        if summary:
+            completed, total = summary["completed_files"], summary["total_files"]
+            progress_percent = (completed / total) * 100 if total else 0
+            self.total_progress_var.set(progress_percent)
+            text = f"{completed}/{total} 파일 완료 ({progress_percent:.1f}%)"
+            if summary["eta"] is not None and completed < total:
+                text += f" - 남은 시간 약 {format_time(int(summary['eta']))}"
+            self.total_progress_label.config(text=text)
+            
+            running = summary["running"]
+            if summary["phase"]:
+                self.current_file_label.config(text=summary["phase"])
+            elif running:
+                text = Path(running[0]).name
+                if len(running) > 1:
+                    text += f" 외 {len(running) - 1}개 동시 변환 중"
+                self.current_file_label.config(text=text)
+            if summary["running_progress"] is not None:
+                self.file_progress_var.set(summary["running_progress"])
+    
+    def format_job_status(self, job):
+        """파일 목록 상태 열에 표시할 문자열"""
+        text = JOB_STATUS_LABELS.get(job["status"], job["status"])
+        if job["status"] == "pending" and job.get("estimate"):
+            text += f" (예상 {format_time(int(job['estimate']))})"
+        if job["status"] == "running":
+            text += f" {job['progress']:.0f}%"
+            if job["fps"]:
+                text += f" ({job['fps']:.0f}fps)"
+        return text
+    
     def select_files(self):
         """여러 동영상 파일 선택"""
         filetypes = [
-            ("비디오 파일", "*.mp4 *.avi *.mov *.mkv *.webm *.flv"),
+            ("비디오 / 오디오 파일", "*.mp4 *.avi *.mov *.mkv *.webm *.flv "
+                                   + " ".join(f"*{extension}" for extension in AUDIO_EXTENSIONS)),
             ("모든 파일", "*.*")
         ]
         
@@ -455,18 +2662,33 @@ class MultiFileVideoConverterApp:
             # 파일명
             file_name = Path(file_path).name
             
-            # 비디오 길이 및 FPS 추출 (시간이 걸릴 수 있음)
+            # 비디오 길이 및 FPS 추출 (시간이 걸릴 수 있음, 오디오 전용 입력은 길이만 확인)
             try:
+                if is_audio_file(file_path):
+                    duration = probe_duration(file_path)
+                    if duration is None:
+                        raise ValueError("오디오 길이를 확인할 수 없습니다.")
+                    self.video_durations[file_path] = duration
+                    hours, remainder = divmod(int(duration), 3600)
+                    minutes, seconds = divmod(remainder, 60)
+                    self.root.after(0, lambda: self.insert_file_row(
+                        file_path, file_name,
+                        (f"{file_size:.1f} MB", f"{hours:02d}:{minutes:02d}:{seconds:02d}", "-")))
+                    return
+                
                 # 필요한 모듈 임포트
                 from moviepy.video.io.VideoFileClip import VideoFileClip
                 
                 # Mac에서는 타임아웃 문제 방지를 위해 파라미터 조정
-                clip = VideoFileClip(file_path, verbose=False, audio=False, has_mask=False)
+                clip = VideoFileClip(file_path, **get_supported_options(
+                    VideoFileClip, {"verbose": False, "audio": False, "has_mask": False}))
                 duration = clip.duration  # 초 단위
                 fps = clip.fps  # 원본 FPS
                 
-                # 파일 경로와 길이 저장
+                # 파일 경로와 길이, 해상도, FPS 저장
                 self.video_durations[file_path] = duration
+                self.video_sizes[file_path] = tuple(clip.size)
+                self.video_fps[file_path] = fps
                 
                 # 시간 포맷팅 (HH:MM:SS)
                 hours, remainder = divmod(int(duration), 3600)
@@ -486,11 +2708,157 @@ class MultiFileVideoConverterApp:
                 self.log(f"동영상 정보를 읽을 수 없어도 변환은 가능합니다.")
             
             # UI 스레드에서 안전하게 업데이트
-            self.root.after(0, lambda: self.file_list.insert("", "end", text=file_name, 
-                                                       values=(f"{file_size:.1f} MB", duration_str, f"{fps:.1f}" if isinstance(fps, float) else fps)))
+            self.root.after(0, lambda: self.insert_file_row(file_path, file_name,
+                                                       (f"{file_size:.1f} MB", duration_str, f"{fps:.1f}" if isinstance(fps, float) else fps)))
         except Exception as e:
             self.log(f"파일 목록 추가 오류: {e}")
     
+    def insert_file_row(self, file_path, file_name, values):
+        """파일 목록에 행 추가 (UI 스레드에서 실행) - 행이 추가되기 전에 제거된 파일은 건너뜀"""
+        if file_path not in self.video_files:
+            return
+        self.file_items[file_path] = self.file_list.insert(
+            "", "end", text=file_name,
+            values=(*values, self.format_target(file_path), self.format_range(file_path), "대기"))
+    
+    def get_file_target(self, file_path, height=None, fps=None):
+        """파일의 출력 (높이, FPS) - 배치 중에는 시작 시 정한 값, 그 외에는 선택한 설정을 원본 기준으로 제한"""
+        if height is None and file_path in self.file_targets:
+            return self.file_targets[file_path]
+        if height is None:
+            height, fps = self.batch_settings["height"], self.batch_settings["fps"]
+        source_height = self.video_sizes.get(file_path, (0, 0))[1]
+        return clamp_target(height, fps, source_height, self.video_fps.get(file_path))
+    
+    def format_target(self, file_path):
+        """파일 목록에 표시할 출력 해상도 / FPS (원본 때문에 낮춘 경우, 합치기 그룹 표시)"""
+        if is_audio_file(file_path):
+            return "오디오 (AAC)"
+        leader = self.get_merge_leader(file_path)
+        if leader and leader != file_path:
+            return f"합치기 → {Path(leader).name}"
+        try:
+            height, fps = self.resolution_var.get(), self.fps_var.get()
+        except tk.TclError:
+            return ""
+        target = self.get_file_target(file_path, height, fps)
+        text = format_target(*target)
+        if target != (height, fps):
+            text += " (원본)"
+        if leader:
+            text += f" (합치기 {len(self.merge_groups[leader])}개)"
+        return text
+    
+    def refresh_targets(self):
+        """설정 변경 시 모든 행의 출력 해상도 / FPS 갱신"""
+        for file_path, item in self.file_items.items():
+            if self.file_list.exists(item):
+                self.file_list.set(item, "target", self.format_target(file_path))
+    
+    def get_item_file_path(self, item):
+        """파일 목록 항목에 해당하는 파일 경로"""
+        for file_path, file_item in self.file_items.items():
+            if file_item == item:
+                return file_path
+        return None
+    
+    def get_merge_leader(self, file_path):
+        """파일이 속한 합치기 그룹의 첫 번째 파일 경로 (그룹에 속하지 않으면 None)"""
+        for leader, members in self.merge_groups.items():
+            if file_path in members:
+                return leader
+        return None
+    
+    def merge_selected_files(self):
+        """선택된 파일을 목록 순서대로 하나의 출력으로 합치도록 묶음 (기존 그룹에서는 제외)"""
+        file_paths = {self.get_item_file_path(item) for item in self.file_list.selection()}
+        members = [file_path for file_path in self.video_files if file_path in file_paths]
+        if len(members) < 2:
+            messagebox.showinfo("알림", "합칠 파일을 두 개 이상 선택해주세요.")
+            return
+        if any(is_audio_file(file_path) for file_path in members):
+            messagebox.showinfo("알림", "오디오 파일은 동영상과 합칠 수 없습니다.")
+            return
+        
+        for file_path in members:
+            self.discard_from_merge(file_path)
+        self.merge_groups[members[0]] = members
+        self.refresh_targets()
+        self.log(f"파일 합치기 설정: {' + '.join(Path(file_path).name for file_path in members)}")
+    
+    def clear_selected_merge(self):
+        """선택된 파일이 속한 합치기 그룹 해제 (각 파일을 따로 변환)"""
+        for item in self.file_list.selection():
+            leader = self.get_merge_leader(self.get_item_file_path(item))
+            if leader:
+                del self.merge_groups[leader]
+                self.log(f"파일 합치기 해제: {Path(leader).name}")
+        self.refresh_targets()
+    
+    def discard_from_merge(self, file_path):
+        """합치기 그룹에서 파일 제외 (남은 파일이 하나뿐이면 그룹 해제)"""
+        leader = self.get_merge_leader(file_path)
+        if not leader:
+            return
+        members = [member for member in self.merge_groups.pop(leader) if member != file_path]
+        if len(members) > 1:
+            self.merge_groups[members[0]] = members
+    
+    def format_range(self, file_path):
+        """파일 목록에 표시할 구간 문자열"""
+        time_range = self.file_ranges.get(file_path)
+        if not time_range:
+            return "전체"
+        start, end = time_range
+        return f"{format_time(start or 0)}~{format_time(end) if end is not None else '끝'}"
+    
+    def apply_selected_range(self):
+        """선택된 파일에 변환 구간 적용"""
+        selected_items = self.file_list.selection()
+        if not selected_items:
+            messagebox.showinfo("알림", "구간을 적용할 파일을 선택해주세요.")
+            return
+        
+        try:
+            start = parse_time(self.range_start_var.get())
+            end = parse_time(self.range_end_var.get())
+            if start is not None and end is not None and end <= start:
+                raise ValueError("구간 끝이 시작보다 앞에 있습니다.")
+        except ValueError as e:
+            messagebox.showerror("오류", f"잘못된 시간 형식입니다 (예: 90, 01:30, 00:01:30): {e}")
+            return
+        
+        for item in selected_items:
+            file_path = self.get_item_file_path(item)
+            if file_path is None:
+                continue
+            
+            duration = self.video_durations.get(file_path, 0)
+            if duration and start is not None and start >= duration:
+                self.log(f"구간 시작이 영상 길이를 넘습니다: {Path(file_path).name}")
+                continue
+            
+            if start is None and end is None:
+                self.file_ranges.pop(file_path, None)
+            else:
+                self.file_ranges[file_path] = (start, end)
+            self.file_list.set(item, "range", self.format_range(file_path))
+            self.log(f"변환 구간 설정: {Path(file_path).name} ({self.format_range(file_path)})")
+    
+    def clear_selected_range(self):
+        """선택된 파일의 변환 구간 해제 (전체 변환)"""
+        for item in self.file_list.selection():
+            file_path = self.get_item_file_path(item)
+            if file_path in self.file_ranges:
+                del self.file_ranges[file_path]
+                self.file_list.set(item, "range", self.format_range(file_path))
+                self.log(f"변환 구간 해제: {Path(file_path).name}")
+    
+    def get_effective_duration(self, file_path):
+        """구간을 적용한 실제 변환 길이 (초, 합치기 그룹은 모든 파일의 합)"""
+        return sum(get_range_duration(self.video_durations.get(member, 0), self.file_ranges.get(member))
+                   for member in self.merge_groups.get(file_path, [file_path]))
+    
     def remove_selected_file(self):
         """선택된 파일 제거"""
         selected_items = self.file_list.selection()
@@ -501,17 +2869,22 @@ class MultiFileVideoConverterApp:
         for item in selected_items:
             file_name = self.file_list.item(item, "text")
             # 목록에서 해당 파일 찾기
-            for file_path in self.video_files[:]:
-                if Path(file_path).name == file_name:
-                    self.video_files.remove(file_path)
-                    # 영상 길이 정보도 제거
-                    if file_path in self.video_durations:
-                        del self.video_durations[file_path]
-                    self.log(f"파일 제거됨: {file_name}")
-                    break
+            file_path = self.get_item_file_path(item)
+            if file_path in self.video_files:
+                self.video_files.remove(file_path)
+                # 영상 길이 및 구간 정보도 제거
+                self.video_durations.pop(file_path, None)
+                self.video_sizes.pop(file_path, None)
+                self.video_fps.pop(file_path, None)
+                self.file_targets.pop(file_path, None)
+                self.file_ranges.pop(file_path, None)
+                self.file_items.pop(file_path, None)
+                self.discard_from_merge(file_path)
+                self.log(f"파일 제거됨: {file_name}")
             
             # 트리뷰에서 삭제
             self.file_list.delete(item)
+        self.refresh_targets()
         
         # 파일 개수 업데이트
         self.update_file_count()
@@ -529,6 +2902,12 @@ class MultiFileVideoConverterApp:
             
         self.video_files.clear()
         self.video_durations.clear()  # 영상 길이 정보도 모두 제거
+        self.video_sizes.clear()
+        self.video_fps.clear()
+        self.file_targets.clear()
+        self.file_ranges.clear()
+        self.file_items.clear()
+        self.merge_groups.clear()
         self.file_list.delete(*self.file_list.get_children())
         self.log("모든 파일이 제거되었습니다.")
         self.convert_btn.config(state=tk.DISABLED)
@@ -567,24 +2946,129 @@ class MultiFileVideoConverterApp:
         self.stop_conversion = False
         self.output_video_paths = []
         
-        # 총 비디오 시간 계산
-        self.total_video_duration = sum(self.video_durations.values())
+        # 배치 작업 목록 (합치기 그룹은 첫 번째 파일이 그룹 전체를 하나의 출력으로 변환)
+        self.batch_files = [file_path for file_path in self.video_files
+                            if self.get_merge_leader(file_path) in (None, file_path)]
+        
+        # 총 비디오 시간 계산 (구간이 지정된 파일은 구간 길이만 포함)
+        self.total_video_duration = sum(self.get_effective_duration(file_path) for file_path in self.batch_files)
         
         # 변환 큐 초기화
         self.conversion_queue = queue.Queue()
-        for file_path in self.video_files:
+        for file_path in self.batch_files:
             self.conversion_queue.put(file_path)
         
         # 진행 상황 초기화
+        self.batch_state.reset(self.batch_files, self.total_video_duration)
         self.total_progress_var.set(0)
         self.file_progress_var.set(0)
-        total_files = len(self.video_files)
+        total_files = len(self.batch_files)
         self.total_progress_label.config(text=f"0/{total_files} 파일 완료 (0%)")
         self.current_file_label.config(text="대기 중...")
         
+        # 변환 설정 저장 (변환 스레드에서는 tkinter 변수를 직접 읽지 않음)
+        try:
+            coordinator_port = self.coordinator_port_var.get()
+        except tk.TclError:
+            coordinator_port = DISTRIBUTED_DEFAULT_PORT
+        try:
+            max_jobs = max(0, self.max_jobs_var.get())
+        except tk.TclError:
+            max_jobs = 0
+        try:
+            memory_limit = max(MEMORY_LIMIT_MIN_MB, self.memory_limit_var.get())
+        except tk.TclError:
+            memory_limit = GOVERNOR_JOB_MEMORY_MB
+        quality_metric = self.quality_metric_var.get()
+        if quality_metric not in QUALITY_METRICS:
+            quality_metric = "SSIM"
+        try:
+            quality_threshold = float(self.quality_threshold_var.get())
+        except ValueError:
+            quality_threshold = QUALITY_METRICS[quality_metric][1]
+        self.batch_settings = {
+            "fps": self.fps_var.get(),
+            "height": self.resolution_var.get(),
+            "output_folder": output_folder,
+            "distributed": self.distributed_var.get(),
+            "coordinator_host": self.coordinator_host_var.get().strip() or DISTRIBUTED_DEFAULT_HOST,
+            "coordinator_port": coordinator_port,
+            "max_jobs": max_jobs,
+            "bounded_memory": self.bounded_memory_var.get(),
+            "memory_limit_mb": memory_limit,
+            "verify_quality": self.verify_quality_var.get(),
+            "quality_metric": quality_metric,
+            "quality_threshold": quality_threshold,
+            "tune_encoder": self.tune_encoder_var.get(),
+            "auto_crop": self.auto_crop_var.get(),
+            "decimate": self.decimate_var.get(),
+        }
+        self.reserved_output_paths = set()
+        self.file_crops = {}
+        self.file_rate_factors = {}
+        self.memory_single_thread = False
+        
+        # 원본보다 높은 해상도 / FPS로 변환하지 않도록 파일별 출력 목표 결정
+        self.file_targets = {}
+        for file_path in self.batch_files:
+            target = self.get_file_target(file_path, self.batch_settings["height"], self.batch_settings["fps"])
+            self.file_targets[file_path] = target
+            if target != (self.batch_settings["height"], self.batch_settings["fps"]):
+                self.log(f"원본 기준 출력 제한: {Path(file_path).name} "
+                         f"{format_target(self.batch_settings['height'], self.batch_settings['fps'])} -> "
+                         f"{format_target(*target)}")
+        
+        # 입력 내용 기반 출력 캐시
+        self.output_cache = None
+        if self.use_cache_var.get():
+            try:
+                self.output_cache = OutputCache(
+                    full_hash=self.full_hash_var.get(),
+                    log=self.log
+                )
+            except OSError as e:
+                self.log(f"캐시 디렉터리를 사용할 수 없습니다: {e}")
+        
+        # 샘플 인코딩 기반 비트레이트 조정 (분산 모드에서는 워커가 기본 비트레이트 사용)
+        self.encoder_tuner = None
+        if self.batch_settings["tune_encoder"] and not self.batch_settings["distributed"]:
+            self.encoder_tuner = EncoderTuner(
+                metric=quality_metric,
+                threshold=quality_threshold,
+                full_hash=self.full_hash_var.get(),
+                log=self.log
+            )
+            if any(self.get_planned_engine(file_path) == "moviepy" for file_path in self.batch_files):
+                self.log("비트레이트 조정은 FFMPEG 직접 호출 방식(메모리 제한 모드, 파일 합치기)에만 적용되며 "
+                         "MoviePy 방식은 기본 비트레이트를 사용합니다.")
+        
+        # 로컬 임시 폴더 (분산 모드에서는 워커가 공유 파일 시스템을 직접 사용)
+        self.stager = None
+        if self.use_staging_var.get() and not self.batch_settings["distributed"]:
+            try:
+                self.stager = ScratchStager(
+                    self.staging_dir_var.get() or STAGING_DIR,
+                    log=self.log
+                )
+                self.log(f"로컬 임시 폴더 사용: {self.stager.scratch_dir}")
+            except OSError as e:
+                self.log(f"로컬 임시 폴더를 사용할 수 없습니다: {e}")
+        
+        # 실시간 부하에 따라 동시 작업 수와 작업당 스레드 수를 정하는 리소스 관리자
+        # (메모리 제한 모드에서는 작업당 상한을 기준으로 동시 작업 수 결정)
+        self.governor = ResourceGovernor(
+            max_jobs=max_jobs,
+            low_priority=self.low_priority_var.get(),
+            pin_cpus=self.pin_cpus_var.get(),
+            job_memory_mb=memory_limit if self.batch_settings["bounded_memory"] else GOVERNOR_JOB_MEMORY_MB,
+            log=self.log
+        )
+        if self.batch_settings["bounded_memory"]:
+            self.log(f"메모리 제한 모드: 작업당 메모리 상한 {memory_limit} MB")
+        
         # 변환 설정 정보 로깅
-        fps = self.fps_var.get()
-        resolution = self.resolution_var.get()
+        fps = self.batch_settings["fps"]
+        resolution = self.batch_settings["height"]
         
         # 총 비디오 시간 로깅
         hours, remainder = divmod(int(self.total_video_duration), 3600)
@@ -592,426 +3076,1763 @@ class MultiFileVideoConverterApp:
         self.log(f"총 작업 영상 시간: {int(self.total_video_duration)}초 ({hours}시간 {minutes}분 {seconds}초)")
         
         self.log(f"변환 시작: 총 {total_files}개 파일, 해상도={resolution}p, 프레임={fps}fps, 코덱=HEVC/H.265")
+        if self.batch_settings["distributed"]:
+            self.log(f"분산 인코딩 모드: {self.batch_settings['coordinator_host']}:{coordinator_port}에서 워커 연결 대기 "
+                     f"(워커 실행 명령과 인증 토큰은 코디네이터 시작 시 표시)")
+            if self.batch_settings["verify_quality"]:
+                self.log("분산 인코딩 모드에서는 샘플 화질 검사를 사용하지 않습니다.")
+        else:
+            load = self.governor.sample()
+            free_memory = load["free_memory_mb"]
+            self.log(f"리소스 관리: 동시 작업 {max_jobs or '자동'}, CPU {len(self.governor.cpus)}개, "
+                     f"부하 {load['cpu_load'] * 100:.0f}%"
+                     + (f", 여유 메모리 {free_memory:.0f} MB" if free_memory is not None else ""))
+            if self.batch_settings["verify_quality"]:
+                self.log(f"샘플 화질 검사: {quality_metric} 기준 {quality_threshold:g} "
+                         f"({QUALITY_SAMPLE_WINDOWS}개 구간 x {QUALITY_WINDOW_SECONDS:g}초, "
+                         f"미달 시 최대 {QUALITY_MAX_TIER}단계까지 재인코딩)")
+        
+        # 이 컴퓨터에서 측정한 처리 속도로 파일별 / 전체 예상 시간 계산
+        if self.batch_settings["distributed"]:
+            parallel_jobs = 1  # 워커 수는 시작 후에 알 수 있음
+        else:
+            parallel_jobs = max_jobs or self.governor.target_concurrency(load)
+        estimates = self.estimate_files(self.batch_files)
+        self.batch_state.set_estimates(estimates, parallel_jobs)
+        known_estimates = [seconds for seconds in estimates.values() if seconds]
+        if known_estimates:
+            total_estimate = sum(known_estimates) / parallel_jobs
+            scope = "" if len(known_estimates) == total_files else f" ({len(known_estimates)}/{total_files}개 파일 기준)"
+            self.log(f"예상 변환 시간: 약 {format_time(int(total_estimate))}{scope}")
+            
+            # 여러 파일을 동시에 변환하면 오래 걸리는 파일부터 시작하여 전체 완료 시간 단축
+            if parallel_jobs > 1 or self.batch_settings["distributed"]:
+                self.conversion_queue = queue.Queue()
+                for file_path in sorted(self.batch_files, key=lambda path: estimates.get(path) or 0, reverse=True):
+                    self.conversion_queue.put(file_path)
+        else:
+            self.log("처리 속도 기록이 없어 예상 변환 시간을 계산할 수 없습니다. (변환이 끝나면 기록됩니다)")
+        
+        # 입력 사전 복사는 최종 변환 순서대로 (순서가 다르면 작업이 요청하지 않은 파일이 공간을 차지)
+        # 합치기 그룹의 나머지 파일은 첫 번째 파일과 함께 사용하므로 바로 뒤에 복사
+        if self.stager:
+            self.stager.prefetch([path for file_path in self.conversion_queue.queue
+                                  for path in [file_path] + self.merge_groups.get(file_path, [])[1:]])
+        
         self.status_var.set("변환 중...")
         
         # 별도 스레드에서 변환 실행
         self.conversion_thread = threading.Thread(target=self.process_conversion_queue, daemon=True)
         self.conversion_thread.start()
     
+    def get_file_encoder(self, file_path):
+        """파일을 인코딩할 인코더와 프리셋 (처리 속도 기록 키)
+        
+        MoviePy 방식만 get_primary_encoder를 사용하고, FFMPEG 직접 호출 / 합치기 / 분산 워커는 get_video_codec 사용
+        """
+        if self.batch_settings.get("distributed") or self.get_planned_engine(file_path) != "moviepy":
+            return get_video_codec()[0], "medium"
+        return get_primary_encoder(self.system)
+    
+    def estimate_files(self, file_paths):
+        """파일별 예상 변환 시간 (초, 예측할 수 없으면 None)"""
+        estimates = {}
+        for file_path in file_paths:
+            if is_audio_file(file_path):
+                estimates[file_path] = None  # 오디오 전용 작업은 비디오 처리 속도 기록으로 예측하지 않음
+                continue
+            encoder, preset = self.get_file_encoder(file_path)
+            source_height = self.video_sizes.get(file_path, (0, 0))[1]
+            height = self.get_file_target(file_path)[0]
+            estimates[file_path] = self.throughput_model.estimate(
+                self.get_effective_duration(file_path), encoder, preset, source_height, height)
+        return estimates
+    
+    def record_throughput(self, file_path, encoder, wall_seconds):
+        """완료된 작업의 처리 속도를 기록하고 남은 파일의 예상 시간 갱신"""
+        preset = self.get_file_encoder(file_path)[1]
+        source_height = self.video_sizes.get(file_path, (0, 0))[1]
+        self.throughput_model.record(encoder, preset, source_height, self.get_file_target(file_path)[0],
+                                     self.get_effective_duration(file_path), wall_seconds)
+    
     def process_conversion_queue(self):
         """변환 큐 처리"""
-        total_files = len(self.video_files)
-        completed_files = 0
-        completed_duration = 0  # 완료된 영상의 총 길이 (초)
+        total_files = len(self.batch_files)
+        state = self.batch_state
         
-        while not self.conversion_queue.empty() and not self.stop_conversion:
-            file_path = self.conversion_queue.get()
-            file_name = Path(file_path).name
+        # 분산 모드에서는 코디네이터가 워커에게 작업을 임대
+        if self.batch_settings.get("distributed"):
+            self.process_distributed_queue()
+        else:
+            # 리소스 관리자가 허용하는 만큼 여러 파일을 동시에 변환
+            worker_count = min(total_files, self.governor.max_jobs or len(self.governor.cpus))
+            workers = [
+                threading.Thread(target=self.run_conversion_worker, daemon=True)
+                for _ in range(max(1, worker_count))
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        
+        # 최종 위치로 이동 중인 출력이 모두 옮겨질 때까지 대기
+        if self.stager:
+            state.set_phase("출력 파일 이동 중...")
+            self.stager.close()
+            self.stager = None
+            state.set_phase(None)
+        
+        completed_files = state.completed_files
+        completed_duration = state.completed_duration
+        
+        # 변환 완료 또는 중단
+        if self.stop_conversion:
+            self.log("변환이 중단되었습니다.")
+            status = "변환 중단됨"
+            message = None
+        else:
+            # 영상 길이 총합 계산
+            seconds = int(completed_duration)
+            minutes = seconds // 60
+            hours = minutes // 60
+            minutes %= 60
             
-            # 현재 진행 상황 업데이트
-            self.root.after(0, lambda name=file_name: self.current_file_label.config(text=name))
-            self.root.after(0, lambda: self.file_progress_var.set(0))
+            self.log(f"모든 파일 변환 완료: {completed_files}/{total_files} 파일 성공")
+            self.log(f"작업 완료 영상 시간: {seconds}초 ({hours}시간 {minutes}분)")
+            status = "변환 완료"
             
-            # 현재 파일 길이
-            current_duration = self.video_durations.get(file_path, 0)
+            message = None
+            if self.output_video_paths:
+                message = f"{completed_files}개 파일 변환 완료!\n저장 위치: {self.batch_settings['output_folder']}\n총 영상 시간: {hours}시간 {minutes}분 ({seconds}초)"
+        
+        # UI 업데이트 (배치 종료 시 한 번만 실행)
+        self.schedule_ui(lambda: self.finish_batch_ui(status, message))
+    
+    def schedule_ui(self, callback):
+        """변환 스레드에서 UI 스레드로 작업 전달"""
+        self.root.after(0, callback)
+    
+    def finish_batch_ui(self, status, message=None):
+        """배치 종료 후 UI 정리 (UI 스레드에서 실행)"""
+        self.render_batch_state()
+        self.status_var.set(status)
+        self.convert_btn.config(state=tk.NORMAL)
+        self.stop_btn.config(state=tk.DISABLED)
+        self.current_file_label.config(text="대기 중...")
+        if message:
+            messagebox.showinfo("변환 완료", message)
+    
+    def run_conversion_worker(self):
+        """변환 큐에서 파일을 꺼내 변환 (리소스 관리자가 허용할 때만 새 작업 시작)"""
+        state = self.batch_state
+        while not self.stop_conversion:
+            slot = self.governor.acquire(stop_check=lambda: self.stop_conversion)
+            if slot is None:
+                break
             
-            # 파일 변환
             try:
-                self.log(f"파일 변환 시작: {file_name}")
-                output_path = self.convert_single_file(file_path)
+                try:
+                    file_path = self.conversion_queue.get_nowait()
+                except queue.Empty:
+                    break
+                file_name = Path(file_path).name
+                
+                # 현재 진행 상황 업데이트
+                state.start_job(file_path)
+                
+                # 파일 변환
+                output_path = None
+                start_time = time.time()
+                try:
+                    self.log(f"파일 변환 시작: {file_name} (스레드 {slot['threads']}개)")
+                    output_path = self.convert_single_file(file_path, slot)
+                    if output_path:
+                        self.log(f"파일 변환 완료: {file_name} -> {Path(output_path).name}")
+                    else:
+                        self.log(f"파일 변환 실패: {file_name}")
+                except Exception as e:
+                    self.log(f"파일 변환 오류: {file_name} - {e}")
+                
+                # 실제로 인코딩한 작업의 처리 속도 기록 (캐시 적중, 정지 화면 제거 모드, 오디오 전용 작업은 제외)
+                job = state.get_job(file_path) or {}
+                if (output_path and job.get("status") != "cached" and not self.batch_settings.get("decimate")
+                        and not is_audio_file(file_path)):
+                    self.record_throughput(file_path, job.get("encoder") or self.get_file_encoder(file_path)[0],
+                                           time.time() - start_time)
+                
+                # 전체 진행 상황 업데이트 (완료 시간은 구간 길이 기준)
                 if output_path:
                     self.output_video_paths.append(output_path)
-                    completed_files += 1
-                    completed_duration += current_duration
-                    self.log(f"파일 변환 완료: {file_name} -> {Path(output_path).name}")
+                    state.finish_job(file_path, "done", self.get_effective_duration(file_path))
                 else:
-                    self.log(f"파일 변환 실패: {file_name}")
-            except Exception as e:
-                self.log(f"파일 변환 오류: {file_name} - {e}")
+                    state.finish_job(file_path, "failed")
+                
+                self.conversion_queue.task_done()
+            finally:
+                self.governor.release(slot)
+    
+    def process_distributed_queue(self):
+        """분산 모드 큐 처리 - 코디네이터가 TCP로 워커에 작업 임대 (공유 파일 시스템 가정)"""
+        settings = self.batch_settings
+        state = self.batch_state
+        
+        # 변환 큐의 파일을 작업 목록으로 변환 (출력 경로는 코디네이터에서 미리 확정)
+        jobs = []
+        reserved_paths = set()
+        while not self.conversion_queue.empty():
+            file_path = self.conversion_queue.get()
+            height, fps = self.get_file_target(file_path)
+            output_path = get_unique_output_path(settings["output_folder"], Path(file_path).stem,
+                                                 height, fps, reserved_paths, is_audio_file(file_path))
+            reserved_paths.add(output_path)
+            merge_inputs = None
+            if file_path in self.merge_groups:
+                merge_inputs = [(member, self.file_ranges.get(member)) for member in self.merge_groups[file_path]]
+            jobs.append(make_conversion_job(file_path, output_path, height, fps,
+                                            self.file_ranges.get(file_path), settings["auto_crop"],
+                                            settings["decimate"], merge_inputs))
+            self.conversion_queue.task_done()
+        
+        # 워커가 작업을 임대하면 해당 파일을 변환 중으로 표시
+        def on_lease(job, worker_id):
+            state.start_job(job["input"])
+        
+        # 워커 결과 수신 시 진행 상황 업데이트
+        def on_result(job, result):
+            file_name = Path(job["input"]).name
+            metrics = result.get("metrics", {})
+            if result.get("ok"):
+                self.output_video_paths.append(result["output"])
+                if metrics.get("elapsed") and not settings["decimate"] and not is_audio_file(job["input"]):
+                    self.record_throughput(job["input"], self.get_file_encoder(job["input"])[0], metrics["elapsed"])
+                state.finish_job(job["input"], "done", self.get_effective_duration(job["input"]))
+                peak_rss = metrics.get("peak_rss_mb")
+                self.log(f"파일 변환 완료: {file_name} -> {Path(result['output']).name} "
+                         f"(워커 {metrics.get('worker', '?')}, {metrics.get('elapsed', 0):.1f}초, "
+                         f"{metrics.get('output_size', 0) / (1024 * 1024):.1f} MB"
+                         f"{f', 최대 메모리 {peak_rss:.0f} MB' if peak_rss is not None else ''})")
+                if settings["decimate"]:
+                    self.log_decimation(job["input"], metrics.get("frames"), metrics.get("elapsed", 0))
+            else:
+                state.finish_job(job["input"], "failed")
+                self.log(f"파일 변환 실패: {file_name} - {result.get('error', '')}")
+        
+        coordinator = ConversionCoordinator(
+            jobs,
+            host=settings["coordinator_host"],
+            port=settings["coordinator_port"],
+            log=self.log,
+            on_result=on_result,
+            on_lease=on_lease
+        )
+        
+        try:
+            coordinator.start()
+        except OSError as e:
+            self.log(f"코디네이터 시작 오류: {e}")
+            return
+        
+        state.set_phase("워커 작업 분배 중...")
+        
+        try:
+            # 중지 요청 시 새 작업 임대를 멈추고 진행 중인 작업이 끝날 때까지 대기
+            coordinator.wait(stop_check=lambda: self.stop_conversion)
+        finally:
+            coordinator.stop()
+            state.set_phase(None)
+    
+    def get_cache_settings(self, file_path):
+        """캐시 키에 포함할 실제 인코딩 설정 (설정이 다르면 다른 결과로 취급)"""
+        settings = self.batch_settings
+        height, fps = self.get_file_target(file_path)
+        return {
+            "version": APP_VERSION,
+            "system": self.system,
+            "fps": fps,
+            "height": height,
+            "codec": get_video_codec(),
+            "params": get_encoding_params(height),
+            "range": self.file_ranges.get(file_path),
+            # 화질 검사를 통과한 결과와 검사하지 않은 결과는 구분
+            "quality": ([settings["quality_metric"], settings["quality_threshold"]]
+                        if settings.get("verify_quality") else None),
+            # 조정된 비트레이트는 목표 화질에 따라 달라지므로 조정 조건과 선택한 배율을 포함
+            "tune_encoder": ([settings["quality_metric"], settings["quality_threshold"]]
+                             if settings.get("tune_encoder") else None),
+            "rate_factor": self.file_rate_factors.get(file_path, 1.0),
+            "auto_crop": settings.get("auto_crop", False),
+            "decimate": settings.get("decimate", False),
+            # 같은 설정이라도 인코딩 방식에 따라 결과가 다름 (MoviePy / FFMPEG 직접 호출 등)
+            "engine": self.get_planned_engine(file_path),
+            # 합치기 그룹은 뒤에 붙는 파일의 내용과 구간도 결과에 영향
+            "merge": [[compute_content_hash(member, self.output_cache.full_hash), self.file_ranges.get(member)]
+                      for member in self.merge_groups.get(file_path, [])[1:]],
+        }
+    
+    def get_planned_engine(self, file_path):
+        """설정상 사용할 인코딩 방식 (실제 방식이 다르면 대체 방식으로 변환된 것)"""
+        settings = self.batch_settings
+        if is_audio_file(file_path):
+            return "audio"
+        if file_path in self.merge_groups:
+            return "merge"
+        if settings.get("decimate"):
+            return "ffmpeg"
+        if settings.get("bounded_memory"):
+            return "ffmpeg"
+        return "moviepy"
+    
+    def convert_single_file(self, file_path, slot=None):
+        """단일 파일 변환 처리 - 출력 경로 결정, 캐시 확인 후 인코딩 (slot: 리소스 관리자가 할당한 스레드/CPU)"""
+        try:
+            # 변환 설정 가져오기 (배치 시작 시 저장한 설정 사용)
+            settings = self.batch_settings
+            height, fps = self.get_file_target(file_path)  # 사용자 선택 해상도 / FPS (원본보다 높지 않게 제한)
             
-            # 전체 진행 상황 업데이트
-            progress_percent = (completed_files / total_files) * 100
-            self.root.after(0, lambda p=progress_percent: self.total_progress_var.set(p))
-            self.root.after(0, lambda c=completed_files, t=total_files, p=progress_percent: 
-                           self.total_progress_label.config(text=f"{c}/{t} 파일 완료 ({p:.1f}%)"))
+            # 출력 폴더 가져오기
+            output_folder = settings["output_folder"]
             
-            self.conversion_queue.task_done()
+            # 출력 파일 경로 (파일명 중복 시 번호 추가, 병렬 변환 중인 파일과도 겹치지 않도록 예약)
+            input_file = Path(file_path)
+            with self.output_path_lock:
+                output_path = get_unique_output_path(output_folder, input_file.stem, height, fps,
+                                                     self.reserved_output_paths, is_audio_file(file_path))
+                self.reserved_output_paths.add(output_path)
+            output_filename = Path(output_path).name
+            
+            # 같은 내용과 설정으로 변환한 결과가 캐시에 있으면 재인코딩 없이 연결
+            cache_key = None
+            if self.output_cache:
+                # 조정된 비트레이트 배율도 결과에 영향을 주므로 캐시 확인 전에 결정 (파일별로 한 번만 분석)
+                if self.encoder_tuner:
+                    source_path = self.stager.get_input(file_path) if self.stager else file_path
+                    self.get_crop(file_path, source_path, slot)
+                    self.get_rate_factor(file_path, source_path, slot)
+                cache_key = self.output_cache.make_key(file_path, self.get_cache_settings(file_path))
+                method = self.output_cache.lookup(cache_key, output_path)
+                if method:
+                    if self.stager:
+                        self.stager.release_input(file_path)
+                    self.batch_state.update_job(file_path, status="cached", progress=100.0)
+                    self.log(f"캐시 적중: {input_file.name} -> {output_filename} ({method})")
+                    return output_path
+            
+            # 로컬 임시 폴더 사용 시 로컬에 인코딩 후 최종 위치로 비동기 이동
+            work_output_path = self.stager.local_output_path(output_path) if self.stager else output_path
+            try:
+                # 화질 검사 기준에 미달하면 상위 품질 단계로 다시 인코딩
+                tier = 0
+                while True:
+                    result_path = self.encode_verified(file_path, work_output_path, slot, tier)
+                    if (not result_path or not settings.get("verify_quality") or self.stop_conversion
+                            or is_audio_file(file_path)):
+                        break
+                    if self.check_quality(file_path, result_path, slot) or tier >= QUALITY_MAX_TIER:
+                        break
+                    tier += 1
+                    self.log(f"화질 기준 미달로 다시 인코딩: {input_file.name} (품질 단계 {tier})")
+            finally:
+                if self.stager:
+                    self.stager.release_input(file_path)
+            
+            # 변환 결과를 캐시에 등록 (대체 방식으로 만든 결과는 설정과 다른 인코딩이므로 제외)
+            if result_path and cache_key:
+                engine = (self.batch_state.get_job(file_path) or {}).get("engine")
+                if engine == self.get_planned_engine(file_path):
+                    self.output_cache.store(cache_key, result_path)
+                else:
+                    self.log(f"대체 방식({engine})으로 변환한 결과는 캐시에 등록하지 않습니다: {input_file.name}")
+            
+            if result_path and self.stager:
+                self.stager.finalize_output(result_path, output_path)
+                result_path = output_path
+            
+            return result_path
+            
+        except Exception as e:
+            self.log(f"변환 오류: {e}")
+            return None
+    
+    def encode_verified(self, file_path, output_path, slot=None, tier=0):
+        """같은 폴더의 임시 이름으로 인코딩하고 출력 검사를 통과하면 최종 이름으로 원자적으로 변경
         
-        # 변환 완료 또는 중단
-        if self.stop_conversion:
-            self.root.after(0, lambda: self.log("변환이 중단되었습니다."))
-            self.root.after(0, lambda: self.status_var.set("변환 중단됨"))
+        중단된 변환이 잘린 파일을 최종 이름으로 남기지 않으며, 인코딩 또는 검사에 실패하면
+        OUTPUT_WRITE_RETRIES번까지 다시 인코딩합니다.
+        """
+        file_name = Path(file_path).name
+        partial_path = get_partial_output_path(output_path)
+        for attempt in range(OUTPUT_WRITE_RETRIES + 1):
+            if attempt:
+                self.log(f"다시 인코딩: {file_name} ({attempt}/{OUTPUT_WRITE_RETRIES}회)")
+            self.batch_state.update_job(file_path, encoder=None, engine=None)
+            try:
+                result_path = self.encode_video(file_path, partial_path, slot, tier)
+                if result_path:
+                    error = self.check_output(file_path, result_path)
+                    if error is None:
+                        os.replace(result_path, output_path)
+                        return output_path
+                    self.log(f"출력 검사 실패: {file_name} - {error}")
+            finally:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+            if self.stop_conversion:
+                break
+        return None
+    
+    def check_output(self, file_path, output_path):
+        """인코딩 결과의 길이 / 코덱 / 해상도 검사 - 문제가 없으면 None, 있으면 이유"""
+        if is_audio_file(file_path):
+            return verify_output_file(output_path, self.get_effective_duration(file_path), audio_only=True)
+        height = self.get_file_target(file_path)[0]
+        crop = self.file_crops.get(file_path)
+        if crop:
+            height = get_cropped_target_size(crop, height)[1]
+        encoder = (self.batch_state.get_job(file_path) or {}).get("encoder") or self.get_file_encoder(file_path)[0]
+        return verify_output_file(output_path, self.get_effective_duration(file_path), height, encoder)
+    
+    def check_quality(self, file_path, output_path, slot=None):
+        """샘플 구간 화질 검사 결과를 기록하고 기준 통과 여부 반환 (측정할 수 없으면 통과로 처리)"""
+        settings = self.batch_settings
+        metric = settings["quality_metric"]
+        threshold = settings["quality_threshold"]
+        file_name = Path(file_path).name
+        
+        # 합치기 결과는 구간마다 원본 파일이 다르고 크기 / 여백을 맞춘 경우도 있어 한 원본과 비교할 수 없음
+        if file_path in self.merge_groups:
+            self.log(f"파일 합치기 결과는 샘플 화질 검사를 하지 않습니다: {file_name}")
+            return True
+        
+        source_path = self.stager.get_input(file_path) if self.stager else file_path
+        report = check_sampled_quality(source_path, output_path, self.get_file_target(file_path)[1], metric,
+                                       self.file_ranges.get(file_path),
+                                       max_workers=slot["threads"] if slot else None,
+                                       crop=self.file_crops.get(file_path))
+        if report is None:
+            self.log(f"화질 검사를 할 수 없습니다: {file_name} ({metric} 필터 또는 FFMPEG 확인 필요)")
+            return True
+        
+        passed = report["min"] >= threshold
+        self.batch_state.update_job(file_path, quality=report)
+        self.log(f"화질 검사 ({metric}, {len(report['scores'])}개 구간): {file_name} - "
+                 f"최소 {report['min']:.3f}, 평균 {report['mean']:.3f} "
+                 f"({'기준 통과' if passed else f'기준 {threshold:g} 미달'})")
+        return passed
+    
+    def get_crop(self, file_path, source_path, slot=None):
+        """검은 여백 자르기 영역 (자동 자르기 사용 시, 재인코딩에 대비해 파일별로 한 번만 검출)"""
+        if not self.batch_settings.get("auto_crop") or file_path in self.merge_groups:
+            return None  # 합치기 그룹은 파일마다 여백이 다를 수 있어 자르지 않음
+        if file_path in self.file_crops:
+            return self.file_crops[file_path]
+        
+        file_name = Path(file_path).name
+        crop = detect_crop(source_path, self.file_ranges.get(file_path),
+                           max_workers=slot["threads"] if slot else None)
+        self.file_crops[file_path] = crop
+        if crop:
+            height = self.get_file_target(file_path)[0]
+            full_width, full_height = get_target_size(crop["source_width"], crop["source_height"], height)
+            width, cropped_height = get_cropped_target_size(crop, height)
+            saved = full_width * full_height - width * cropped_height
+            self.log(f"검은 여백 자르기: {file_name} {crop['source_width']}x{crop['source_height']} -> "
+                     f"{crop['width']}x{crop['height']} (출력 {full_width}x{full_height} -> {width}x{cropped_height}, "
+                     f"프레임당 {saved:,} 픽셀 ({saved / (full_width * full_height) * 100:.0f}%) 절약)")
         else:
-            # 영상 길이 총합 계산
-            seconds = int(completed_duration)
-            minutes = seconds // 60
-            hours = minutes // 60
-            minutes %= 60
+            self.log(f"검은 여백 없음: {file_name}")
+        return crop
+    
+    def get_rate_factor(self, file_path, source_path, slot=None):
+        """샘플 인코딩으로 정한 비트레이트 배율 (조정 사용 시, 재인코딩에 대비해 파일별로 한 번만 결정)
+        
+        샘플은 FFMPEG 직접 호출 방식의 설정으로 인코딩하므로, 다른 비트레이트 표 / 인코더를 사용하는
+        MoviePy 방식에는 적용하지 않습니다 (검증하지 않은 배율이 되므로).
+        """
+        if (not self.encoder_tuner or self.batch_settings.get("decimate")
+                or self.get_planned_engine(file_path) == "moviepy"):
+            return 1.0
+        if file_path in self.file_rate_factors:
+            return self.file_rate_factors[file_path]
+        
+        file_name = Path(file_path).name
+        height, fps = self.get_file_target(file_path)
+        self.log(f"샘플 인코딩으로 비트레이트 조정 중: {file_name}")
+        try:
+            rate_factor, cached = self.encoder_tuner.choose(file_path, source_path, height, fps,
+                                                            self.file_ranges.get(file_path),
+                                                            self.file_crops.get(file_path),
+                                                            max_workers=slot["threads"] if slot else None)
+        except OSError as e:
+            self.log(f"비트레이트 조정 오류: {e} (기본 비트레이트 사용)")
+            rate_factor, cached = 1.0, False
+        self.file_rate_factors[file_path] = rate_factor
+        params = get_encoding_params(height, rate_factor=rate_factor)
+        self.log(f"비트레이트 배율 {rate_factor:g}: {file_name} (비트레이트 {params['bitrate']}, CRF {params['crf']}"
+                 f"{', 저장된 결정 사용' if cached else ''})")
+        return rate_factor
+    
+    def make_progress_callback(self, file_path, last_progress=None):
+        """FFMPEG 진행 줄을 작업 진행률 / 인코딩 FPS로 반영하는 콜백 (구간 길이 기준)
+        
+        last_progress(dict)를 전달하면 마지막 진행 정보(출력 프레임 수 등)를 함께 저장합니다.
+        """
+        duration = self.get_effective_duration(file_path)
+        
+        def on_progress(progress):
+            if last_progress is not None:
+                last_progress.update(progress)
+            if duration:
+                self.batch_state.update_job(file_path, progress=min(99.0, progress["time"] / duration * 100),
+                                            fps=progress["fps"])
+        
+        return on_progress
+    
+    def encode_with_ffmpeg(self, file_path, source_path, output_path, slot=None, tier=0, crop=None, rate_factor=1.0):
+        """FFMPEG 직접 호출 방식으로 인코딩 (MoviePy 로드 실패 시 대체 방식, 정지 화면 제거 / 메모리 제한 모드)
+        
+        메모리 제한 모드에서 작업당 상한을 넘으면 스레드 1개로 한 번 더 인코딩하고, 이번 배치의 이후
+        파일은 처음부터 스레드 1개로 인코딩하여 같은 파일을 두 번 인코딩하는 비용을 한 번으로 줄입니다.
+        """
+        settings = self.batch_settings
+        height, fps = self.get_file_target(file_path)
+        memory_limit = self.get_memory_limit()
+        if memory_limit and self.memory_single_thread:
+            slot = {"cpus": None, **(slot or {}), "threads": 1}
+        threads = slot["threads"] if slot else 0
+        time_range = self.file_ranges.get(file_path)
+        decimate = settings.get("decimate", False)
+        self.batch_state.update_job(file_path, encoder=get_video_codec()[0], engine="ffmpeg")
+        
+        # 출력 파일 생성
+        temp_output_path = output_path
+        
+        # 긴 입력은 오디오를 별도 프로세스로 동시에 인코딩한 후 스트림 복사로 합침
+        split_audio = self.should_split_audio(file_path, source_path)
+        video_path, audio_path = get_split_output_paths(temp_output_path)
+        
+        # FFMPEG 명령어 구성 - 요청한 HEVC/H.265 파라미터와 일치하도록 설정
+        ffmpeg_cmd = build_ffmpeg_command(source_path, video_path if split_audio else temp_output_path, height, fps,
+                                          threads, time_range, tier, crop, decimate, rate_factor,
+                                          audio=not split_audio)
+        audio_cmd = build_audio_command(source_path, audio_path, time_range)
+        mux_cmd = build_mux_command(video_path, audio_path, temp_output_path)
+        popen_kwargs = {}
+        if self.governor:
+            ffmpeg_cmd, audio_cmd, mux_cmd = (self.governor.wrap_command(cmd, slot)
+                                               for cmd in (ffmpeg_cmd, audio_cmd, mux_cmd))
+            popen_kwargs = self.governor.popen_kwargs(slot)
+        
+        # FFMPEG 프로세스 실행
+        try:
+            # 진행률은 FFMPEG 진행 줄이 보고될 때까지 시간 기반으로 추정 (UI 타이머가 표시)
+            self.batch_state.start_job(file_path)
+            start_time = time.time()
+            
+            # 프로세스가 완료될 때까지 출력을 읽으며 대기
+            last_progress = {}
+            on_progress = self.make_progress_callback(file_path, last_progress)
+            if split_audio:
+                result = run_split_encode(ffmpeg_cmd, audio_cmd, mux_cmd, on_progress, memory_limit_mb=memory_limit,
+                                          **popen_kwargs)
+            else:
+                result = run_process(ffmpeg_cmd, on_progress=on_progress, memory_limit_mb=memory_limit,
+                                     **popen_kwargs)
+            self.report_peak_memory(file_path, result)
+            
+            # 메모리 상한 초과 시 프레임 버퍼가 가장 적은 스레드 1개로 다시 시도 (이후 파일도 스레드 1개 사용)
+            if result["interrupted"] == "memory" and threads != 1:
+                self.log(f"메모리 상한을 넘어 스레드 1개로 다시 인코딩합니다: {Path(file_path).name} "
+                         f"(이번 배치의 남은 파일도 스레드 1개로 인코딩)")
+                self.memory_single_thread = True
+                return self.encode_with_ffmpeg(file_path, source_path, output_path,
+                                               {"cpus": None, **(slot or {}), "threads": 1}, tier, crop, rate_factor)
+            
+            # 프로세스가 정상적으로 완료되었는지 확인
+            if result["returncode"] == 0 and not result["interrupted"]:
+                # 결과 파일 크기 확인
+                if os.path.exists(temp_output_path):
+                    converted_size = os.path.getsize(temp_output_path) / (1024 * 1024)  # MB
+                    original_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
+                    reduction = (1 - converted_size / original_size) * 100  # 감소율 %
+                    
+                    # 결과 로깅
+                    self.log(f"변환 결과: {original_size:.1f} MB → {converted_size:.1f} MB ({reduction:.1f}% 감소)")
+                    if decimate:
+                        self.log_decimation(file_path, last_progress.get("frame"), time.time() - start_time)
+                    
+                    return temp_output_path
+                else:
+                    self.log("변환된 파일을 찾을 수 없습니다.")
+                    return None
+            else:
+                self.log(f"FFMPEG 오류: {describe_process_error(result)}")
+                return None
+        
+        except Exception as e:
+            self.log(f"FFMPEG 실행 오류: {e}")
+            return None
+        finally:
+            for path in (video_path, audio_path):
+                if os.path.exists(path):
+                    os.remove(path)
+    
+    def should_split_audio(self, file_path, source_path):
+        """오디오를 비디오와 별도 프로세스로 동시에 인코딩할지 여부 (오디오가 있는 긴 입력)"""
+        return (self.get_effective_duration(file_path) >= SPLIT_AUDIO_MIN_DURATION
+                and bool(probe_audio_codecs(source_path)))
+    
+    def encode_audio_only(self, file_path, source_path, output_path, slot=None):
+        """오디오 전용 입력 변환 - 비디오 파이프라인 없이 AAC로 인코딩 (이미 AAC면 스트림 복사)"""
+        file_name = Path(file_path).name
+        codecs = probe_audio_codecs(source_path)
+        if codecs == []:
+            self.log(f"오디오 스트림이 없습니다: {file_name}")
+            return None
+        copy = bool(codecs) and all(codec == "aac" for codec in codecs)
+        self.log(f"오디오 변환: {file_name} ({'스트림 복사' if copy else 'AAC 인코딩'})")
+        
+        cmd = build_audio_command(source_path, output_path, self.file_ranges.get(file_path), copy)
+        popen_kwargs = {}
+        if self.governor:
+            cmd = self.governor.wrap_command(cmd, slot)
+            popen_kwargs = self.governor.popen_kwargs(slot)
+        
+        self.batch_state.update_job(file_path, encoder="aac", engine="audio")
+        self.batch_state.start_job(file_path)
+        try:
+            result = run_process(cmd, on_progress=self.make_progress_callback(file_path),
+                                 memory_limit_mb=self.get_memory_limit(), **popen_kwargs)
+        except OSError as e:
+            self.log(f"FFMPEG 실행 오류: {e}")
+            return None
+        self.report_peak_memory(file_path, result)
+        if result["returncode"] != 0 or result["interrupted"] or not os.path.exists(output_path):
+            self.log(f"FFMPEG 오류: {describe_process_error(result)}")
+            return None
+        
+        original_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
+        converted_size = os.path.getsize(output_path) / (1024 * 1024)  # MB
+        self.log(f"변환 결과: {original_size:.1f} MB → {converted_size:.1f} MB "
+                 f"({(1 - converted_size / original_size) * 100:.1f}% 감소)")
+        return output_path
+    
+    def encode_merged(self, file_path, source_path, output_path, slot=None, tier=0):
+        """합치기 그룹 인코딩 - 스트림 구성이 같으면 스트림 복사로 이어 붙인 입력을, 다르면 concat 필터로
+        맞춘 입력을 한 번에 인코딩 (나눠 변환한 뒤 다시 합치는 두 번째 읽기 / 쓰기 없음)
+        """
+        settings = self.batch_settings
+        height, fps = self.get_file_target(file_path)
+        threads = slot["threads"] if slot else 0
+        members = self.merge_groups[file_path]
+        
+        # 첫 번째 파일은 convert_single_file이, 나머지는 여기서 로컬 사본을 정리
+        sources = [source_path] + [self.stager.get_input(member) if self.stager else member for member in members[1:]]
+        inputs = [(source, self.file_ranges.get(member)) for source, member in zip(sources, members)]
+        list_fd, list_path = tempfile.mkstemp(prefix="merge_", suffix=".ffconcat", dir=os.path.dirname(output_path))
+        os.close(list_fd)
+        try:
+            layouts = [probe_stream_layout(source) for source in sources]
+            rate_factor = self.get_rate_factor(file_path, source_path, slot)
+            try:
+                cmd, stream_copy = build_merge_command(inputs, output_path, height, fps, layouts, list_path, threads,
+                                                       tier, rate_factor, settings.get("decimate", False))
+            except ValueError as e:
+                self.log(f"파일 합치기 오류: {e}")
+                return None
+            if stream_copy:
+                self.log(f"파일 합치기: {len(members)}개 파일의 스트림 구성이 같아 스트림 복사로 이어 붙여 인코딩")
+            else:
+                self.log(f"파일 합치기: {len(members)}개 파일의 스트림 구성이 달라 크기 / FPS / 오디오 형식을 "
+                         f"맞춰 하나의 입력으로 인코딩")
             
-            self.root.after(0, lambda: self.log(f"모든 파일 변환 완료: {completed_files}/{total_files} 파일 성공"))
-            self.root.after(0, lambda: self.log(f"작업 완료 영상 시간: {seconds}초 ({hours}시간 {minutes}분)"))
-            self.root.after(0, lambda: self.status_var.set("변환 완료"))
+            popen_kwargs = {}
+            if self.governor:
+                cmd = self.governor.wrap_command(cmd, slot)
+                popen_kwargs = self.governor.popen_kwargs(slot)
             
-            if self.output_video_paths:
-                message = f"{completed_files}개 파일 변환 완료!\n저장 위치: {self.output_folder_var.get()}\n총 영상 시간: {hours}시간 {minutes}분 ({seconds}초)"
-                self.root.after(0, lambda msg=message: messagebox.showinfo("변환 완료", msg))
+            self.batch_state.update_job(file_path, encoder=get_video_codec()[0], engine="merge")
+            self.batch_state.start_job(file_path)
+            start_time = time.time()
+            last_progress = {}
+            result = run_process(cmd, on_progress=self.make_progress_callback(file_path, last_progress),
+                                 memory_limit_mb=self.get_memory_limit(), **popen_kwargs)
+            self.report_peak_memory(file_path, result)
+            if result["returncode"] != 0 or result["interrupted"] or not os.path.exists(output_path):
+                self.log(f"FFMPEG 오류: {describe_process_error(result)}")
+                return None
+            
+            original_size = sum(os.path.getsize(member) for member in members) / (1024 * 1024)  # MB
+            converted_size = os.path.getsize(output_path) / (1024 * 1024)  # MB
+            self.log(f"변환 결과: {original_size:.1f} MB ({len(members)}개 파일) → {converted_size:.1f} MB "
+                     f"({(1 - converted_size / original_size) * 100:.1f}% 감소)")
+            if settings.get("decimate"):
+                self.log_decimation(file_path, last_progress.get("frame"), time.time() - start_time)
+            return output_path
+        except Exception as e:
+            self.log(f"FFMPEG 실행 오류: {e}")
+            return None
+        finally:
+            if os.path.exists(list_path):
+                os.remove(list_path)
+            if self.stager:
+                for member in members[1:]:
+                    self.stager.release_input(member)
+    
+    def get_memory_limit(self):
+        """작업당 메모리 상한 (MB) - 메모리 제한 모드가 아니면 None"""
+        settings = self.batch_settings
+        return settings.get("memory_limit_mb") if settings.get("bounded_memory") else None
+    
+    def report_peak_memory(self, file_path, result):
+        """외부 프로세스의 최대 메모리 사용량을 작업 상태에 기록하고 로그로 알림"""
+        peak = result.get("peak_rss_mb")
+        if peak is None:
+            return
+        previous = (self.batch_state.get_job(file_path) or {}).get("peak_rss_mb") or 0.0
+        self.batch_state.update_job(file_path, peak_rss_mb=max(previous, peak))
+        memory_limit = self.get_memory_limit()
+        self.log(f"최대 메모리: {Path(file_path).name} {peak:.0f} MB"
+                 f"{f' (상한 {memory_limit} MB)' if memory_limit else ''}")
+    
+    def log_decimation(self, file_path, output_frames, elapsed):
+        """정지 화면 제거 결과 기록 - 제거한 프레임 수와 절약한 인코딩 시간"""
+        file_name = Path(file_path).name
+        duration = self.get_effective_duration(file_path)
+        decimation = describe_decimation(duration, self.get_file_target(file_path)[1], output_frames)
+        if decimation is None:
+            self.log(f"정지 화면 제거: {file_name} (프레임 수를 확인할 수 없음)")
+            return
+        dropped, total_frames = decimation
         
-        # UI 업데이트
-        self.root.after(0, lambda: self.convert_btn.config(state=tk.NORMAL))
-        self.root.after(0, lambda: self.stop_btn.config(state=tk.DISABLED))
-        self.root.after(0, lambda: self.current_file_label.config(text="대기 중..."))
+        # 절약 시간: 고정 프레임 레이트로 인코딩할 때의 예상 시간과 비교
+        # (처리 속도 기록이 없으면 프레임당 인코딩 비용이 같다고 보고 계산)
+        estimate = (self.batch_state.get_job(file_path) or {}).get("estimate")
+        if estimate:
+            saved = max(0.0, estimate - elapsed)
+        else:
+            saved = elapsed * dropped / max(1, total_frames - dropped)
+        self.log(f"정지 화면 제거: {file_name} - 프레임 {total_frames:,}개 중 {dropped:,}개 제거 "
+                 f"({dropped / total_frames * 100:.0f}%), 인코딩 시간 약 {format_time(int(saved))} 절약")
     
-    def convert_single_file(self, file_path):
-        """단일 파일 변환 처리 - FFMPEG 고급 매개변수 적용"""
+    def encode_video(self, file_path, output_path, slot=None, tier=0):
+        """동영상 인코딩 - MoviePy 방식 우선, 실패 시 FFMPEG 직접 호출 (tier: 화질 재인코딩 품질 단계)"""
+        settings = self.batch_settings
+        height, fps = self.get_file_target(file_path)
+        input_file = Path(file_path)
+        output_filename = Path(output_path).name
+        
+        # 작업당 스레드 수 (리소스 관리자가 없으면 가용한 모든 쓰레드 사용)
+        threads = slot["threads"] if slot else 0
+        
+        # 변환 구간 (시작, 끝) - 지정된 경우 해당 구간만 디코딩/인코딩
+        time_range = self.file_ranges.get(file_path)
+        
+        # 실제로 읽을 입력 경로 (로컬 임시 폴더에 복사된 경우 로컬 사본)
+        source_path = self.stager.get_input(file_path) if self.stager else file_path
+        
+        # 오디오 전용 입력은 비디오 파이프라인 없이 오디오만 변환
+        if is_audio_file(file_path):
+            return self.encode_audio_only(file_path, source_path, output_path, slot)
+        
+        # 합치기 그룹은 모든 파일을 하나의 입력으로 이어 FFMPEG로 한 번에 인코딩
+        if file_path in self.merge_groups:
+            return self.encode_merged(file_path, source_path, output_path, slot, tier)
+        
+        # 검은 여백 자르기 영역 (모든 인코딩 방식에서 크기 변경 전에 적용)
+        crop = self.get_crop(file_path, source_path, slot)
+        
+        # 샘플 인코딩으로 정한 비트레이트 배율 (자르기 영역을 반영하여 결정)
+        rate_factor = self.get_rate_factor(file_path, source_path, slot)
+        
+        # 정지 화면 제거는 가변 프레임 레이트 출력이 필요하므로 FFMPEG 직접 호출 방식 사용
+        # (MoviePy는 고정 프레임 레이트로만 기록)
+        if settings.get("decimate"):
+            return self.encode_with_ffmpeg(file_path, source_path, output_path, slot, tier, crop, rate_factor)
+        
+        # 메모리 제한 모드는 MoviePy 대신 FFMPEG 직접 호출 방식 사용 (MoviePy는 프레임마다 새 배열을 만들고 오디오를
+        # 임시 파일로 먼저 기록하지만, FFMPEG는 고정 크기 버퍼로 처리하고 작업의 프로세스 합계로 상한을 감시할 수 있음)
+        if settings.get("bounded_memory"):
+            return self.encode_with_ffmpeg(file_path, source_path, output_path, slot, tier, crop, rate_factor)
+        
+        # MoviePy가 내부에서 실행하는 FFMPEG에도 리소스 관리자의 우선순위 / CPU 제한 적용
+        # (직접 실행하는 FFMPEG는 wrap_command로 적용하므로 이 경로에서만 스레드를 낮춤)
+        if self.governor:
+            self.governor.apply_to_current_thread(slot)
+        
+        # 진행 상황 업데이트
+        self.log(f"동영상 로드 중: {input_file.name}")
+        
+        # 오디오를 별도 프로세스로 동시에 인코딩하면 MoviePy는 비디오만 읽고 기록
+        split_audio = self.should_split_audio(file_path, source_path)
+        
+        # 원본 비디오 로드 - Mac에서는 타임아웃 문제를 방지하기 위해 파라미터 조정
+        decode_scaled = False  # FFMPEG 리더에서 목표 해상도로 디코딩했는지 여부
         try:
-            # 변환 설정 가져오기
-            fps = self.fps_var.get()  # 사용자 선택 FPS (24 또는 30)
-            height = self.resolution_var.get()  # 사용자 선택 해상도
+            # 필요한 모듈 임포트
+            from moviepy.video.io.VideoFileClip import VideoFileClip
+            from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
             
-            # 출력 폴더 가져오기
-            output_folder = self.output_folder_var.get()
+            # Mac에서 성능 향상을 위한 옵션 (설치된 MoviePy가 지원하는 인자만 사용, 2.x에는 verbose 없음)
+            clip_options = get_supported_options(VideoFileClip, {
+                "verbose": False,   # 상세 로그 끄기
+                "audio": not split_audio,  # 별도 인코딩하지 않을 때만 오디오 리더 시작
+                "has_mask": False,  # 마스크 처리 건너뛰기
+            })
             
-            # 출력 파일 경로
-            input_file = Path(file_path)
-            output_filename = f"{input_file.stem}_{height}p_{fps}fps.mp4"
-            output_path = os.path.join(output_folder, output_filename)
+            # 원본 해상도 확인 (헤더만 읽으므로 빠름)
+            target_size = None
+            try:
+                infos = ffmpeg_parse_infos(source_path)
+                source_width, source_height = infos["video_size"]
+                # 리더는 회전된 영상을 표시 방향으로 돌려서 전달하므로 세로 영상은 크기를 바꿔 계산
+                if infos.get("video_rotation") in (90, 270):
+                    source_width, source_height = source_height, source_width
+                target_size = get_target_size(source_width, source_height, height)
+            except Exception as e:
+                self.log(f"원본 해상도 확인 오류: {e} (디코딩 후 크기 변경)")
             
-            # 파일명 중복 확인 및 처리
-            counter = 1
-            while os.path.exists(output_path):
-                output_filename = f"{input_file.stem}_{height}p_{fps}fps_{counter}.mp4"
-                output_path = os.path.join(output_folder, output_filename)
-                counter += 1
+            if target_size and get_supported_options(VideoFileClip, {"target_resolution": None}):
+                # FFMPEG 리더가 디코딩 단계에서 목표 해상도로 축소하여 전달
+                # (원본 크기 프레임을 numpy/PIL로 옮겨 다니며 축소하는 비용 제거)
+                clip = VideoFileClip(source_path, target_resolution=(target_size[1], target_size[0]), **clip_options)
+                decode_scaled = True
+            else:
+                # 해상도 확인 실패 또는 target_resolution을 지원하지 않는 MoviePy 버전
+                clip = VideoFileClip(source_path, **clip_options)
             
-            # 진행 상황 업데이트
-            self.root.after(0, lambda: self.log(f"동영상 로드 중: {input_file.name}"))
+            if decode_scaled:
+                source_frame_mb = source_width * source_height * 3 / (1024 * 1024)
+                target_frame_mb = clip.w * clip.h * 3 / (1024 * 1024)
+                self.log(f"디코딩 시 크기 변경: {source_width}x{source_height} -> {clip.w}x{clip.h} "
+                         f"(프레임당 메모리 {source_frame_mb:.1f} MB -> {target_frame_mb:.2f} MB)")
             
-            # 원본 비디오 로드 - Mac에서는 타임아웃 문제를 방지하기 위해 파라미터 조정
-            try:
-                # 필요한 모듈 임포트
-                from moviepy.video.io.VideoFileClip import VideoFileClip
-                
-                # Mac에서 성능 향상을 위한 옵션
-                clip = VideoFileClip(file_path, 
-                                     verbose=False,  # 상세 로그 끄기
-                                     audio=True,     # 오디오 포함
-                                     has_mask=False, # 마스크 처리 건너뛰기
-                                     bufsize=4096)   # 버퍼 크기 증가
-                
-                self.root.after(0, lambda: self.log(f"파일을 성공적으로 불러왔습니다: {input_file.name}"))
-            except Exception as e:
-                self.root.after(0, lambda err=str(e): self.log(f"파일 로드 오류: {err}"))
-                self.root.after(0, lambda: self.log("외부 FFMPEG 프로세스를 직접 사용하는 방식으로 전환합니다."))
-                
-                # FFMPEG를 직접 호출하는 대체 방식 사용
-                import subprocess
-                
-                self.root.after(0, lambda: self.log("대체 방식으로 파일 변환을 시도합니다..."))
-                
-                # 출력 파일 생성
-                temp_output_path = output_path
-                
-                # FFMPEG 명령어 구성 - 요청한 HEVC/H.265 파라미터와 일치하도록 설정
-                # 해상도에 따른 최적 파라미터 선택
-                if height == 1080:
-                    bitrate = "2.5M"
-                    maxrate = "2.75M"
-                    bufsize = "5M"
-                    crf = "24"
-                elif height == 720:
-                    bitrate = "1.8M"
-                    maxrate = "2.0M"
-                    bufsize = "3.6M"
-                    crf = "24"
-                elif height == 480:
-                    bitrate = "1.0M"
-                    maxrate = "1.2M"
-                    bufsize = "2.0M"
-                    crf = "24"
-                else:  # 360p 또는 기타 해상도
-                    bitrate = "0.3M"
-                    maxrate = "0.4M"
-                    bufsize = "0.8M"
-                    crf = "26"
-                
-                # 운영 체제에 따라 최적의 코덱 선택
-                if platform.system() == "Windows":
-                    codec = "libx265"  # Windows는 H.265 지원이 더 좋음
-                    profile = "main"
-                    codec_tag = "hvc1"
-                else:  # Mac 및 Linux
-                    # Mac에서는 H.264가 더 안정적일 수 있음
-                    codec = "libx264"
-                    profile = "high"
-                    codec_tag = "avc1"
-                
-                # FFMPEG 기본 명령어
-                ffmpeg_cmd = [
-                    "ffmpeg", "-y",
-                    "-i", file_path,
-                    "-vf", f"scale=-2:{height}",
-                    "-r", str(fps),
-                    "-c:v", codec,
-                    "-profile:v", profile,
-                    "-level:v", "4.1",
-                    "-b:v", bitrate,
-                    "-maxrate", maxrate,
-                    "-bufsize", bufsize,
-                    "-c:a", "aac",
-                    "-b:a", "128k",
-                    "-pix_fmt", "yuv420p",
-                    "-movflags", "+faststart",
-                    "-preset", "medium",
-                    "-crf", crf,
-                    temp_output_path
-                ]
-                
-                # FFMPEG 프로세스 실행
-                try:
-                    process = subprocess.Popen(
-                        ffmpeg_cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        universal_newlines=True
-                    )
-                    
-                    # 진행 상황 모니터링을 위한 변수
-                    progress_values = {"value": 0, "last_update": time.time()}
-                    
-                    # 진행 상황 모니터링 함수
-                    def monitor_ffmpeg_progress():
-                        elapsed_time = time.time() - progress_values["last_update"]
-                        if elapsed_time > 1:  # 1초마다 업데이트
-                            progress_values["value"] += 2  # 임의로 2%씩 증가
-                            progress_values["value"] = min(progress_values["value"], 99)
-                            progress_values["last_update"] = time.time()
-                            self.root.after(0, lambda v=progress_values["value"]: self.file_progress_var.set(v))
-                        
-                        # 프로세스가 아직 실행 중인지 확인
-                        if process.poll() is None and not self.stop_conversion:
-                            self.root.after(500, monitor_ffmpeg_progress)
-                    
-                    # 모니터링 시작
-                    self.root.after(0, monitor_ffmpeg_progress)
-                    
-                    # 프로세스가 완료될 때까지 대기
-                    stdout, stderr = process.communicate()
-                    
-                    # 프로세스가 정상적으로 완료되었는지 확인
-                    if process.returncode == 0:
-                        # 파일 진행 상황 100%로 설정
-                        self.root.after(0, lambda: self.file_progress_var.set(100))
-                        
-                        # 결과 파일 크기 확인
-                        if os.path.exists(temp_output_path):
-                            converted_size = os.path.getsize(temp_output_path) / (1024 * 1024)  # MB
-                            original_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
-                            reduction = (1 - converted_size / original_size) * 100  # 감소율 %
-                            
-                            # 결과 로깅
-                            self.root.after(0, lambda o=original_size, c=converted_size, r=reduction:
-                                        self.log(f"변환 결과: {o:.1f} MB → {c:.1f} MB ({r:.1f}% 감소)"))
-                            
-                            return temp_output_path
-                        else:
-                            self.root.after(0, lambda: self.log("변환된 파일을 찾을 수 없습니다."))
-                            return None
-                    else:
-                        self.root.after(0, lambda: self.log(f"FFMPEG 오류: {stderr}"))
-                        return None
-                
-                except Exception as e:
-                    self.root.after(0, lambda err=str(e): self.log(f"FFMPEG 실행 오류: {err}"))
-                    return None
-                
-                return None
+            # 검은 여백 제거 (디코딩 단계에서 축소된 경우 축소된 좌표로 변환)
+            if crop:
+                from moviepy.video.fx.crop import crop as crop_clip
+                ratio_x = clip.w / crop["source_width"]
+                ratio_y = clip.h / crop["source_height"]
+                clip = clip.fx(crop_clip, x1=int(crop["x"] * ratio_x), y1=int(crop["y"] * ratio_y),
+                               width=max(2, int(crop["width"] * ratio_x / 2) * 2),
+                               height=max(2, int(crop["height"] * ratio_y / 2) * 2))
             
+            # 구간 지정 시 subclip으로 잘라냄 (리더가 시작 지점으로 입력 측 탐색)
+            if time_range:
+                start, end = time_range
+                clip = clip.subclip(start or 0, min(end, clip.duration) if end is not None else None)
+                self.log(f"변환 구간: {self.format_range(file_path)} ({clip.duration:.1f}초)")
+            
+            self.log(f"파일을 성공적으로 불러왔습니다: {input_file.name}")
+        except Exception as e:
+            self.log(f"파일 로드 오류: {e}")
+            self.log("외부 FFMPEG 프로세스를 직접 사용하는 방식으로 전환합니다.")
+            
+            # FFMPEG를 직접 호출하는 대체 방식 사용
+            self.log("대체 방식으로 파일 변환을 시도합니다...")
+            return self.encode_with_ffmpeg(file_path, source_path, output_path, slot, tier, crop, rate_factor)
+        
+        # 해상도 변경 (디코딩 단계에서 이미 축소된 경우 그대로 사용)
+        if decode_scaled:
+            resized_clip = clip
+        else:
             # 진행 상황 업데이트
-            self.root.after(0, lambda: self.log(f"해상도 변경 중: {input_file.name} -> {height}p"))
+            self.log(f"해상도 변경 중: {input_file.name} -> {height}p")
             
             # 해상도 변경
             try:
-                # 원본 비디오의 가로, 세로 비율 계산
-                original_width = clip.w
-                original_height = clip.h
-                aspect_ratio = original_width / original_height
-                
-                # 새 너비 계산 (가로세로 비율 유지)
-                new_width = int(height * aspect_ratio)
+                # 새 크기 계산 (가로세로 비율 유지, 짝수 너비, 여백을 자른 경우 원본 전체와 같은 배율)
+                if crop:
+                    new_width, new_height = get_cropped_target_size(crop, height)
+                else:
+                    new_width, new_height = get_target_size(clip.w, clip.h, height)
                 
                 # 직접 resize
                 if hasattr(clip, 'resize'):
-                    resized_clip = clip.resize(width=new_width, height=height)
+                    resized_clip = clip.resize(width=new_width, height=new_height)
                 else:
                     # 아예 resize 속성이 없다면 그냥 원본 사용
-                    self.root.after(0, lambda: self.log(f"경고: resize 기능을 사용할 수 없어 원본 해상도를 유지합니다."))
+                    self.log(f"경고: resize 기능을 사용할 수 없어 원본 해상도를 유지합니다.")
                     resized_clip = clip
             except Exception as e:
-                self.root.after(0, lambda err=str(e): self.log(f"해상도 변경 오류: {err}"))
+                self.log(f"해상도 변경 오류: {e}")
                 resized_clip = clip  # 오류 발생 시 원본 사용
+        
+        # FPS 설정 (사용자 선택 FPS)
+        self.log(f"FPS 변경 중: {clip.fps:.1f}fps -> {fps}fps")
+        
+        # FPS 설정
+        final_clip = resized_clip.set_fps(fps)
+        
+        # 진행 상황 업데이트
+        self.log(f"인코딩 시작: {output_filename}")
+        
+        # 예상 파일 크기를 계산하기 어려우므로 배치 상태에서 시간 기반으로 진행률 추정
+        self.batch_state.start_job(file_path)
+        
+        # MoviePy 방식은 출력 해상도와 관계없이 360p 비트레이트 사용 (화질 재인코딩 시 상위 단계)
+        # 샘플 인코딩 배율은 FFMPEG 직접 호출 설정으로 검증한 값이므로 적용하지 않음
+        rate = get_encoding_params(360, tier)
+        
+        # 운영 체제에 따른 인코딩 설정
+        if self.system == "Darwin":  # macOS
+            # Mac용 최적화된 인코딩 파라미터
+            ffmpeg_params = [
+                "-preset", "medium",       # Mac에서는 'fast'보다 'medium'이 안정적
+                "-c:v", "libx264",         # Mac에서는 libx265보다 libx264가 안정적
+                "-profile:v", "high",
+                "-level:v", "4.1",
+                "-b:v", rate["bitrate"],   # 360p에 맞게 조정된 비트레이트
+                "-maxrate", rate["maxrate"],  # 최대 비트레이트
+                "-bufsize", rate["bufsize"],  # 버퍼 크기
+                "-pix_fmt", "yuv420p",
+                "-threads", str(threads),  # 리소스 관리자가 정한 쓰레드 수 (0이면 가용한 모든 쓰레드)
+                "-movflags", "+faststart"  # 웹 스트리밍 최적화
+            ]
+        else:  # Windows 또는 Linux
+            # Windows/Linux용 H.265 파라미터
+            ffmpeg_params = [
+                "-preset", "medium",
+                "-c:v", "libx265",
+                "-tag:v", "hvc1",
+                "-profile:v", "main",
+                "-level:v", "4.1",
+                "-b:v", rate["bitrate"],
+                "-maxrate", rate["maxrate"],
+                "-bufsize", rate["bufsize"],
+                "-pix_fmt", "yuv420p",
+                "-threads", str(threads),
+                "-movflags", "+faststart"
+            ]
+        
+        # 긴 입력은 오디오를 별도 FFMPEG 프로세스로 동시에 인코딩 (MoviePy는 비디오만 기록한 후 스트림 복사로 합침)
+        video_output_path, audio_path = get_split_output_paths(output_path)
+        audio_job = None
+        popen_kwargs = self.governor.popen_kwargs(slot) if self.governor else {}
+        if split_audio:
+            # MoviePy는 기본 오디오 트랙 하나만 기록하므로 별도 인코딩도 같은 트랙만 사용
+            audio_cmd = build_audio_command(source_path, audio_path, time_range, all_tracks=False)
+            if self.governor:
+                audio_cmd = self.governor.wrap_command(audio_cmd, slot)
+            audio_job = start_background_process(audio_cmd, lambda: self.stop_conversion, **popen_kwargs)
+        
+        # 비디오 변환 및 저장
+        self.batch_state.update_job(file_path, engine="moviepy")
+        try:
+            final_clip.write_videofile(
+                video_output_path if audio_job else output_path,
+                audio=audio_job is None,
+                codec='libx264' if self.system == "Darwin" else 'libx265',
+                audio_codec='aac',
+                audio_bitrate='128k',
+                ffmpeg_params=ffmpeg_params,
+                fps=fps,             
+                preset='medium',
+                verbose=False,
+                threads=threads,
+                logger=None,
+                # 임시 오디오는 출력 파일과 같은 폴더에 생성 (로컬 임시 폴더 사용 시 로컬)
+                temp_audiofile=os.path.join(os.path.dirname(output_path), f'temp_audio_{time.time()}.m4a'),
+                write_logfile=False
+            )
+        except Exception as e:
+            self.log(f"인코딩 오류: {e}")
+            self.log("대안적인 인코딩 방식을 시도합니다...")
             
-            # FPS 설정 (사용자 선택 FPS)
-            self.root.after(0, lambda: self.log(f"FPS 변경 중: {clip.fps:.1f}fps -> {fps}fps"))
-            
-            # FPS 설정
-            final_clip = resized_clip.set_fps(fps)
-            
-            # 진행 상황 업데이트
-            self.root.after(0, lambda: self.log(f"인코딩 시작: {output_filename}"))
-            
-            # 진행 상황 모니터링을 위한 변수
-            progress_values = {"value": 0, "last_update": time.time()}
-            
-            # 진행 상황 모니터링 함수
-            def monitor_encoding_progress():
-                if os.path.exists(output_path):
-                    current_size = os.path.getsize(output_path)
-                    # 예상 파일 크기를 계산하기 어려우므로 시간 기반으로 진행률 추정
-                    elapsed_time = time.time() - progress_values["last_update"]
-                    if elapsed_time > 1:  # 1초마다 업데이트
-                        progress_values["value"] += 2  # 임의로 2%씩 증가 (실제 진행과 다를 수 있음)
-                        progress_values["value"] = min(progress_values["value"], 99)  # 100%는 완료 시에만
-                        progress_values["last_update"] = time.time()
-                        self.root.after(0, lambda v=progress_values["value"]: self.file_progress_var.set(v))
-                # 계속 모니터링
-                if not self.stop_conversion:
-                    self.root.after(1000, monitor_encoding_progress)
-            
-            # 모니터링 시작
-            self.root.after(0, monitor_encoding_progress)
-            
-            # 운영 체제에 따른 인코딩 설정
-            if self.system == "Darwin":  # macOS
-                # Mac용 최적화된 인코딩 파라미터
-                ffmpeg_params = [
-                    "-preset", "medium",       # Mac에서는 'fast'보다 'medium'이 안정적
-                    "-c:v", "libx264",         # Mac에서는 libx265보다 libx264가 안정적
-                    "-profile:v", "high",
-                    "-level:v", "4.1",
-                    "-b:v", "0.3M",            # 360p에 맞게 조정된 비트레이트
-                    "-maxrate", "0.4M",        # 최대 비트레이트
-                    "-bufsize", "0.8M",        # 버퍼 크기
-                    "-pix_fmt", "yuv420p",
-                    "-threads", "0",           # 가용한 모든 쓰레드 사용 (Mac에서 성능 향상)
-                    "-movflags", "+faststart"  # 웹 스트리밍 최적화
-                ]
-            else:  # Windows 또는 Linux
-                # Windows/Linux용 H.265 파라미터
-                ffmpeg_params = [
-                    "-preset", "medium",
-                    "-c:v", "libx265",
-                    "-tag:v", "hvc1",
-                    "-profile:v", "main",
-                    "-level:v", "4.1",
-                    "-b:v", "0.3M",
-                    "-maxrate", "0.4M",
-                    "-bufsize", "0.8M",
-                    "-pix_fmt", "yuv420p",
-                    "-threads", "0",
-                    "-movflags", "+faststart"
-                ]
-            
-            # 비디오 변환 및 저장
+            # 첫 번째 방식 실패 시 대체 방식 시도 (클립에 오디오가 없으므로 별도 오디오 작업은 계속 사용)
             try:
+                self.log("기본 설정으로 대체 인코딩 시도 중...")
+                self.batch_state.update_job(file_path, encoder="libx264", engine="moviepy-fallback")
+                # 기본 설정으로 변경
                 final_clip.write_videofile(
-                    output_path,
-                    codec='libx264' if self.system == "Darwin" else 'libx265',
+                    video_output_path if audio_job else output_path,
+                    audio=audio_job is None,
+                    codec='libx264',  # H.264는 호환성이 높음
                     audio_codec='aac',
-                    audio_bitrate='128k',
-                    ffmpeg_params=ffmpeg_params,
-                    fps=fps,             
-                    preset='medium',
-                    verbose=False,
-                    threads=0,
-                    logger=None,
-                    temp_audiofile=os.path.join(output_folder, f'temp_audio_{time.time()}.m4a'),
-                    write_logfile=False
+                    fps=fps,
+                    preset='medium',  # 안정성 위주
+                    verbose=False
                 )
-            except Exception as e:
-                self.root.after(0, lambda err=str(e): self.log(f"인코딩 오류: {err}"))
-                self.root.after(0, lambda: self.log("대안적인 인코딩 방식을 시도합니다..."))
+                self.log("기본 설정으로 인코딩 완료")
+            except Exception as e2:
+                self.log(f"대체 인코딩 오류: {e2}")
+                self.log("FFMPEG를 직접 호출하는 방식으로 마지막 시도를 합니다...")
+                self.batch_state.update_job(file_path, encoder="libx264", engine="ffmpeg-fallback")
+                
+                # FFMPEG 직접 호출은 오디오를 함께 인코딩하므로 별도 오디오 작업 중지 후 완료 대기
+                if audio_job:
+                    audio_job[1].set()
+                    audio_job[0].result()
+                    audio_job = None
+                    for path in (video_output_path, audio_path):
+                        if os.path.exists(path):
+                            os.remove(path)
                 
-                # 첫 번째 방식 실패 시 대체 방식 시도
                 try:
-                    self.root.after(0, lambda: self.log("기본 설정으로 대체 인코딩 시도 중..."))
-                    # 기본 설정으로 변경
-                    final_clip.write_videofile(
-                        output_path,
-                        codec='libx264',  # H.264는 호환성이 높음
-                        audio_codec='aac',
-                        fps=fps,
-                        preset='medium',  # 안정성 위주
-                        verbose=False
-                    )
-                    self.root.after(0, lambda: self.log("기본 설정으로 인코딩 완료"))
-                except Exception as e2:
-                    self.root.after(0, lambda err=str(e2): self.log(f"대체 인코딩 오류: {err}"))
-                    self.root.after(0, lambda: self.log("FFMPEG를 직접 호출하는 방식으로 마지막 시도를 합니다..."))
+                    # FFMPEG 직접 호출 (마지막 대안)
+                    # 파일 경로
+                    input_path = source_path
                     
-                    try:
-                        # FFMPEG 직접 호출 (마지막 대안)
-                        import subprocess
-                        
-                        # 파일 경로
-                        input_path = file_path
-                        
-                        # 기본 FFMPEG 명령어
-                        cmd = [
-                            "ffmpeg", "-y",
-                            "-i", input_path,
-                            "-vf", f"scale=-2:{height}",
-                            "-r", str(fps),
-                            "-c:v", "libx264",
-                            "-preset", "medium",
-                            "-crf", "23",
-                            "-c:a", "aac",
-                            "-b:a", "128k",
-                            output_path
-                        ]
-                        
-                        process = subprocess.Popen(
-                            cmd,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE
-                        )
-                        
-                        stdout, stderr = process.communicate()
-                        
-                        if process.returncode == 0:
-                            self.root.after(0, lambda: self.log("FFMPEG 직접 호출로 인코딩 성공"))
-                        else:
-                            self.root.after(0, lambda: self.log(f"FFMPEG 오류: {stderr}"))
-                            return None
-                            
-                    except Exception as e3:
-                        self.root.after(0, lambda err=str(e3): self.log(f"최종 인코딩 오류: {err}"))
+                    # 기본 FFMPEG 명령어 (구간 지정 시 입력 측 탐색)
+                    input_args, output_args = get_seek_args(time_range)
+                    cmd = [
+                        "ffmpeg", "-y",
+                        *input_args,
+                        "-i", input_path,
+                        *output_args,
+                        "-vf", get_scale_filter(height, crop),
+                        "-r", str(fps),
+                        "-c:v", "libx264",
+                        "-preset", "medium",
+                        "-crf", str(23 - 2 * tier),
+                        "-c:a", "aac",
+                        "-b:a", "128k",
+                    ]
+                    if threads:
+                        cmd += ["-threads", str(threads)]
+                    cmd.append(output_path)
+                    
+                    popen_kwargs = {}
+                    if self.governor:
+                        cmd = self.governor.wrap_command(cmd, slot)
+                        popen_kwargs = self.governor.popen_kwargs(slot)
+                    
+                    self.batch_state.start_job(file_path)
+                    result = run_process(cmd, on_progress=self.make_progress_callback(file_path), **popen_kwargs)
+                    
+                    if result["returncode"] == 0 and not result["interrupted"]:
+                        self.log("FFMPEG 직접 호출로 인코딩 성공")
+                    else:
+                        self.log(f"FFMPEG 오류: {describe_process_error(result)}")
                         return None
+                        
+                except Exception as e3:
+                    self.log(f"최종 인코딩 오류: {e3}")
+                    return None
+        
+        # 동시에 인코딩한 오디오를 비디오와 스트림 복사로 합침
+        if audio_job:
+            mux_cmd = build_mux_command(video_output_path, audio_path, output_path)
+            try:
+                result = finish_split_encode(audio_job[0], self.governor.wrap_command(mux_cmd, slot) if self.governor
+                                             else mux_cmd, lambda: self.stop_conversion, **popen_kwargs)
+            finally:
+                for path in (video_output_path, audio_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+            if result["returncode"] != 0 or result["interrupted"]:
+                self.log(f"오디오 인코딩 / 합치기 오류: {describe_process_error(result)}")
+                return None
+        
+        # 변환 완료 후 정보 업데이트
+        converted_size = os.path.getsize(output_path) / (1024 * 1024)  # MB
+        original_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
+        reduction = (1 - converted_size / original_size) * 100  # 감소율 %
+        
+        # 메모리 해제
+        try:
+            final_clip.close()
+            resized_clip.close()
+            clip.close()
+        except Exception as e:
+            self.log(f"메모리 해제 오류: {e} (무시 가능)")
+        
+        # 결과 로깅
+        self.log(f"변환 결과: {original_size:.1f} MB → {converted_size:.1f} MB ({reduction:.1f}% 감소)")
+        
+        return output_path
+
+
+# 분산 인코딩 설정
+DISTRIBUTED_DEFAULT_HOST = "127.0.0.1"  # 기본은 이 컴퓨터에서만 수신 (다른 호스트의 워커는 주소를 지정해야 함)
+DISTRIBUTED_DEFAULT_PORT = 50505
+DISTRIBUTED_TOKEN_ENV = "VIDEO_CONVERTER_TOKEN"  # 코디네이터 / 워커가 공유하는 인증 토큰 환경 변수
+LEASE_TIMEOUT = 30  # 초, 이 시간 동안 하트비트가 없으면 작업을 회수하여 재분배
+HEARTBEAT_INTERVAL = 5  # 초, 워커가 임대 연장을 요청하는 주기
+MAX_JOB_ATTEMPTS = 3  # 워커 장애로 인한 재분배를 포함한 최대 시도 횟수
+
+
+def make_conversion_job(input_path, output_path, height, fps, time_range=None, auto_crop=False, decimate=False,
+                        merge_inputs=None):
+    """코디네이터가 워커에 전달하는 작업 정보 생성
+    
+    time_range: 변환 구간 (시작, 끝) 초, auto_crop: 워커에서 검은 여백을 검출하여 자를지 여부,
+    decimate: 정지 화면을 제거하여 가변 프레임 레이트로 출력할지 여부,
+    merge_inputs: 순서대로 이어 하나의 출력으로 변환할 [(경로, 구간)] (input은 첫 번째 파일)
+    """
+    return {
+        "id": uuid.uuid4().hex,
+        "input": input_path,
+        "output": output_path,
+        "height": height,
+        "fps": fps,
+        "range": list(time_range) if time_range else None,
+        "auto_crop": auto_crop,
+        "decimate": decimate,
+        "merge": [[path, list(time_range) if time_range else None] for path, time_range in merge_inputs]
+                 if merge_inputs else None,
+    }
+
+
+def send_message(address, message, timeout=10):
+    """코디네이터에 JSON 메시지 전송 후 응답 수신 (한 줄에 JSON 하나)"""
+    with socket.create_connection(address, timeout=timeout) as sock:
+        sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as reader:
+            line = reader.readline()
+    return json.loads(line) if line else {}
+
+
+def parse_address(value, default_port=DISTRIBUTED_DEFAULT_PORT):
+    """'호스트:포트' 문자열을 (호스트, 포트) 튜플로 변환"""
+    host, _, port = value.rpartition(":")
+    if not host:
+        return value, default_port
+    return host, int(port)
+
+
+class ConversionCoordinator:
+    """작업 목록을 보유하고 TCP로 워커 프로세스에 작업을 임대하는 코디네이터
+    
+    워커는 lease 요청으로 작업을 받고, 인코딩 중에는 heartbeat로 임대를 연장하며,
+    완료 후 result로 결과와 측정값을 보고합니다. 임대가 만료된 작업(워커 종료 등)은
+    대기열 앞쪽으로 돌려보내 다른 워커에 재분배합니다.
+    
+    워커가 코디네이터가 지정한 경로에 출력을 쓰므로 모든 메시지에 공유 토큰이 있어야 처리하며,
+    token을 지정하지 않으면 새로 만들어 시작 시 워커 실행 명령과 함께 알립니다.
+    """
+    
+    def __init__(self, jobs, host=DISTRIBUTED_DEFAULT_HOST, port=DISTRIBUTED_DEFAULT_PORT, token=None,
+                 lease_timeout=LEASE_TIMEOUT, max_attempts=MAX_JOB_ATTEMPTS,
+                 log=print, on_result=None, on_lease=None):
+        self.jobs = {job["id"]: job for job in jobs}
+        self.pending = deque(job["id"] for job in jobs)
+        self.attempts = {job["id"]: 0 for job in jobs}
+        self.leases = {}  # 임대 ID -> {"job_id", "worker", "expires"}
+        self.results = {}  # 작업 ID -> 결과
+        self.workers = {}  # 워커 ID -> {"last_seen", "completed", "failed"}
+        self.address = (host, port)
+        self.token = token or secrets.token_urlsafe(16)
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.log = log
+        self.on_result = on_result
+        self.on_lease = on_lease
+        self.draining = False  # True이면 새 작업을 임대하지 않음
+        self.lock = threading.Lock()
+        self.server = None
+        self.stopped = threading.Event()
+    
+    def start(self):
+        """TCP 서버 및 임대 만료 감시 스레드 시작"""
+        coordinator = self
+        
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                if not line:
+                    return
+                try:
+                    response = coordinator.handle_message(json.loads(line.decode("utf-8")))
+                except Exception as e:
+                    response = {"ok": False, "error": str(e)}
+                self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+        
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer(self.address, RequestHandler)
+        self.server.daemon_threads = True
+        self.address = self.server.server_address
+        
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        threading.Thread(target=self.reap_expired_leases, daemon=True).start()
+        self.log(f"코디네이터 시작: {self.address[0]}:{self.address[1]} (작업 {len(self.jobs)}개)")
+        self.log(f"워커 실행: python converter.py --worker <코디네이터 주소>:{self.address[1]} --token {self.token}")
+    
+    def stop(self):
+        """서버 종료"""
+        self.stopped.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+    
+    def is_finished(self):
+        """모든 작업이 완료(성공 또는 최종 실패)되었는지 확인"""
+        with self.lock:
+            return len(self.results) == len(self.jobs)
+    
+    def wait(self, stop_check=None, poll_interval=0.5):
+        """모든 작업 완료 또는 중지 요청 후 진행 중인 임대가 끝날 때까지 대기"""
+        while not self.is_finished():
+            if stop_check and stop_check() and not self.draining:
+                self.draining = True
+                self.log("새 작업 분배를 중지하고 진행 중인 워커 작업을 기다립니다.")
+            if self.draining:
+                with self.lock:
+                    if not self.leases:
+                        break
+            time.sleep(poll_interval)
+        return self.results
+    
+    def handle_message(self, message):
+        """워커 메시지 처리 (lease / heartbeat / result) - 토큰이 다르면 거부"""
+        if not hmac.compare_digest(str(message.get("token", "")).encode("utf-8"), self.token.encode("utf-8")):
+            return {"ok": False, "error": "인증 실패: 토큰이 일치하지 않습니다."}
+        worker_id = message.get("worker", "?")
+        with self.lock:
+            worker = self.workers.setdefault(worker_id, {"completed": 0, "failed": 0})
+            worker["last_seen"] = time.time()
+        
+        message_type = message.get("type")
+        if message_type == "lease":
+            return self.lease_job(worker_id)
+        if message_type == "heartbeat":
+            return self.renew_lease(message.get("lease_id"))
+        if message_type == "result":
+            return self.complete_lease(message.get("lease_id"), worker_id, message.get("result", {}))
+        return {"ok": False, "error": f"알 수 없는 메시지: {message_type}"}
+    
+    def lease_job(self, worker_id):
+        """대기 중인 작업 하나를 워커에 임대"""
+        with self.lock:
+            finished = len(self.results) == len(self.jobs)
+            if self.draining or finished:
+                return {"ok": True, "job": None, "done": True}
+            if not self.pending:
+                # 다른 워커의 임대가 만료될 수 있으므로 잠시 후 다시 요청
+                return {"ok": True, "job": None, "done": False, "retry_after": 2}
             
-            # 변환 완료 후 정보 업데이트
-            converted_size = os.path.getsize(output_path) / (1024 * 1024)  # MB
-            original_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
-            reduction = (1 - converted_size / original_size) * 100  # 감소율 %
+            job_id = self.pending.popleft()
+            self.attempts[job_id] += 1
+            lease_id = uuid.uuid4().hex
+            self.leases[lease_id] = {
+                "job_id": job_id,
+                "worker": worker_id,
+                "expires": time.time() + self.lease_timeout,
+            }
+            job = self.jobs[job_id]
+        
+        self.log(f"작업 임대: {Path(job['input']).name} -> 워커 {worker_id} (시도 {self.attempts[job_id]})")
+        if self.on_lease:
+            self.on_lease(job, worker_id)
+        return {"ok": True, "job": job, "lease_id": lease_id,
+                "heartbeat_interval": min(HEARTBEAT_INTERVAL, self.lease_timeout / 3)}
+    
+    def renew_lease(self, lease_id):
+        """하트비트 수신 시 임대 기간 연장 (만료된 임대는 거부하여 워커가 작업을 중단하도록 함)"""
+        with self.lock:
+            lease = self.leases.get(lease_id)
+            if lease is None:
+                return {"ok": False, "error": "임대가 만료되었습니다."}
+            lease["expires"] = time.time() + self.lease_timeout
+        return {"ok": True}
+    
+    def complete_lease(self, lease_id, worker_id, result):
+        """워커의 작업 결과 및 측정값 수신"""
+        with self.lock:
+            lease = self.leases.pop(lease_id, None)
+            if lease is None:
+                # 이미 재분배된 작업의 늦은 결과는 무시
+                return {"ok": False, "error": "임대가 만료되었습니다."}
+            job = self.jobs[lease["job_id"]]
+            result.setdefault("metrics", {})["worker"] = worker_id
+            result.setdefault("output", job["output"])
+            self.results[job["id"]] = result
+            self.workers[worker_id]["completed" if result.get("ok") else "failed"] += 1
+        
+        if self.on_result:
+            self.on_result(job, result)
+        return {"ok": True}
+    
+    def reap_expired_leases(self):
+        """하트비트가 끊긴 워커의 임대를 회수하여 다른 워커에 재분배"""
+        while not self.stopped.wait(1):
+            now = time.time()
+            failed_jobs = []
+            with self.lock:
+                for lease_id, lease in list(self.leases.items()):
+                    if lease["expires"] > now:
+                        continue
+                    del self.leases[lease_id]
+                    job_id = lease["job_id"]
+                    self.log(f"워커 {lease['worker']} 응답 없음: {Path(self.jobs[job_id]['input']).name} 작업 회수")
+                    if self.attempts[job_id] >= self.max_attempts:
+                        result = {"ok": False, "output": self.jobs[job_id]["output"],
+                                  "error": f"최대 시도 횟수({self.max_attempts}회) 초과",
+                                  "metrics": {"worker": lease["worker"]}}
+                        self.results[job_id] = result
+                        failed_jobs.append((self.jobs[job_id], result))
+                    else:
+                        # 재분배되는 작업을 가장 먼저 처리
+                        self.pending.appendleft(job_id)
             
-            # 메모리 해제
+            for job, result in failed_jobs:
+                if self.on_result:
+                    self.on_result(job, result)
+
+
+class ConversionWorker:
+    """코디네이터에서 작업을 임대받아 FFMPEG로 인코딩하는 워커 프로세스"""
+    
+    def __init__(self, address, token, worker_id=None, log=print, max_connect_failures=30):
+        self.address = address
+        self.token = token
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.log = log
+        self.max_connect_failures = max_connect_failures
+        self.lease_lost = threading.Event()
+        self.governor = ResourceGovernor(max_jobs=1, log=log)
+    
+    def request(self, message):
+        """워커 ID와 인증 토큰을 붙여 코디네이터에 메시지 전송"""
+        message["worker"] = self.worker_id
+        message["token"] = self.token
+        return send_message(self.address, message)
+    
+    def run(self):
+        """작업이 모두 끝날 때까지 임대 요청 → 인코딩 → 결과 보고 반복"""
+        self.log(f"워커 시작: {self.worker_id} (코디네이터 {self.address[0]}:{self.address[1]})")
+        connect_failures = 0
+        
+        while True:
             try:
-                final_clip.close()
-                resized_clip.close()
-                clip.close()
-            except Exception as e:
-                self.root.after(0, lambda err=str(e): self.log(f"메모리 해제 오류: {err} (무시 가능)"))
+                response = self.request({"type": "lease"})
+                connect_failures = 0
+            except OSError as e:
+                # 코디네이터가 아직 시작되지 않았거나 일시적으로 연결할 수 없는 경우
+                connect_failures += 1
+                if connect_failures >= self.max_connect_failures:
+                    self.log(f"코디네이터에 연결할 수 없어 워커를 종료합니다: {e}")
+                    return
+                time.sleep(2)
+                continue
+            
+            if not response.get("ok"):
+                self.log(f"코디네이터가 요청을 거부하여 워커를 종료합니다: {response.get('error', '')}")
+                return
+            
+            job = response.get("job")
+            if job is None:
+                if response.get("done"):
+                    self.log("모든 작업이 완료되어 워커를 종료합니다.")
+                    return
+                time.sleep(response.get("retry_after", 2))
+                continue
             
-            # 파일 진행 상황 100%로 설정
-            self.root.after(0, lambda: self.file_progress_var.set(100))
+            lease_id = response["lease_id"]
+            self.lease_lost.clear()
             
-            # 결과 로깅
-            self.root.after(0, lambda o=original_size, c=converted_size, r=reduction:
-                        self.log(f"변환 결과: {o:.1f} MB → {c:.1f} MB ({r:.1f}% 감소)"))
+            # 인코딩 중 하트비트 전송
+            heartbeat_stop = threading.Event()
+            threading.Thread(target=self.send_heartbeats,
+                             args=(lease_id, response.get("heartbeat_interval", HEARTBEAT_INTERVAL), heartbeat_stop),
+                             daemon=True).start()
+            try:
+                result = self.process_job(job)
+            finally:
+                heartbeat_stop.set()
             
-            return output_path
+            if self.lease_lost.is_set():
+                continue
+            
+            try:
+                self.request({"type": "result", "lease_id": lease_id, "result": result})
+            except OSError as e:
+                self.log(f"결과 보고 오류: {e}")
+    
+    def send_heartbeats(self, lease_id, interval, stop_event):
+        """임대 연장 요청 - 임대가 만료되었다고 응답하면 진행 중인 인코딩 중단"""
+        while not stop_event.wait(interval):
+            try:
+                response = self.request({"type": "heartbeat", "lease_id": lease_id})
+            except OSError:
+                continue  # 일시적인 네트워크 오류는 다음 주기에 재시도
+            if not response.get("ok"):
+                self.log("임대가 만료되어 현재 작업을 중단합니다.")
+                self.lease_lost.set()  # 인코딩 중인 FFMPEG는 run_process가 종료
+                return
+    
+    def process_job(self, job):
+        """단일 작업 인코딩 후 결과 및 측정값 반환 (임시 이름으로 쓰고 출력 검사 후 최종 이름으로 변경)"""
+        file_name = Path(job["input"]).name
+        self.log(f"파일 변환 시작: {file_name}")
+        start_time = time.time()
+        partial_path = get_partial_output_path(job["output"])
+        video_path, audio_path = get_split_output_paths(partial_path)
+        audio_only = is_audio_file(job["input"])
+        
+        # 워커 호스트의 다른 서비스를 위해 스레드 수와 우선순위 제한
+        slot = self.governor.acquire()
+        list_path = None
+        try:
+            crop = None
+            split_audio = False
+            if job.get("merge"):
+                # 합치기 작업은 모든 입력을 하나의 입력으로 이어 한 번에 인코딩 (자르기 미사용)
+                list_fd, list_path = tempfile.mkstemp(prefix="merge_", suffix=".ffconcat",
+                                                      dir=os.path.dirname(job["output"]))
+                os.close(list_fd)
+                inputs = [(path, time_range) for path, time_range in job["merge"]]
+                layouts = [probe_stream_layout(path) for path, _ in inputs]
+                cmd, stream_copy = build_merge_command(inputs, partial_path, job["height"], job["fps"], layouts,
+                                                       list_path, slot["threads"], decimate=job.get("decimate", False))
+                self.log(f"파일 합치기: {len(inputs)}개 파일 ({'스트림 복사로 이어 붙임' if stream_copy else 'concat 필터'})")
+                expected_duration = sum(get_range_duration(layout["duration"], time_range)
+                                        for layout, (_, time_range) in zip(layouts, inputs))
+            elif audio_only:
+                # 오디오 전용 입력은 비디오 파이프라인 없이 AAC로 변환 (이미 AAC면 스트림 복사)
+                codecs = probe_audio_codecs(job["input"])
+                cmd = build_audio_command(job["input"], partial_path, job.get("range"),
+                                          bool(codecs) and all(codec == "aac" for codec in codecs))
+                duration = probe_duration(job["input"])
+                expected_duration = get_range_duration(duration, job.get("range")) if duration else None
+            else:
+                if job.get("auto_crop"):
+                    crop = detect_crop(job["input"], job.get("range"), max_workers=slot["threads"])
+                    if crop:
+                        self.log(f"검은 여백 자르기: {file_name} {crop['source_width']}x{crop['source_height']} -> "
+                                 f"{crop['width']}x{crop['height']}")
+                info = probe_video(job["input"])
+                expected_duration = get_range_duration(info["duration"], job.get("range")) if info else None
+                
+                # 긴 입력은 오디오를 별도 프로세스로 동시에 인코딩한 후 스트림 복사로 합침
+                split_audio = bool(expected_duration and expected_duration >= SPLIT_AUDIO_MIN_DURATION
+                                   and probe_audio_codecs(job["input"]))
+                cmd = build_ffmpeg_command(job["input"], video_path if split_audio else partial_path, job["height"],
+                                           job["fps"], slot["threads"], job.get("range"), crop=crop,
+                                           decimate=job.get("decimate", False), audio=not split_audio)
+            expected_height = get_cropped_target_size(crop, job["height"])[1] if crop else job["height"]
             
+            # 인코딩 또는 출력 검사에 실패하면 다시 인코딩 (임대를 잃으면 중단)
+            error = None
+            peak_rss = None
+            for attempt in range(OUTPUT_WRITE_RETRIES + 1):
+                if attempt:
+                    self.log(f"다시 인코딩: {file_name} ({attempt}/{OUTPUT_WRITE_RETRIES}회) - {error}")
+                last_progress = {}
+                if split_audio:
+                    result = run_split_encode(
+                        self.governor.wrap_command(cmd, slot),
+                        self.governor.wrap_command(build_audio_command(job["input"], audio_path, job.get("range")),
+                                                   slot),
+                        self.governor.wrap_command(build_mux_command(video_path, audio_path, partial_path), slot),
+                        on_progress=last_progress.update,
+                        stop_check=self.lease_lost.is_set,
+                        **self.governor.popen_kwargs(slot)
+                    )
+                else:
+                    result = run_process(
+                        self.governor.wrap_command(cmd, slot),
+                        on_progress=last_progress.update,
+                        stop_check=self.lease_lost.is_set,
+                        **self.governor.popen_kwargs(slot)
+                    )
+                if result["peak_rss_mb"] is not None:
+                    peak_rss = max(peak_rss or 0.0, result["peak_rss_mb"])
+                if result["returncode"] != 0 or result["interrupted"] or not os.path.exists(partial_path):
+                    error = f"FFMPEG 오류: {describe_process_error(result)}"
+                else:
+                    error = verify_output_file(partial_path, expected_duration, expected_height,
+                                               get_video_codec()[0], audio_only)
+                    if error is None:
+                        os.replace(partial_path, job["output"])
+                        break
+                    error = f"출력 검사 실패: {error}"
+                if result["interrupted"]:
+                    break
         except Exception as e:
-            self.root.after(0, lambda err=str(e): self.log(f"변환 오류: {err}"))
-            return None
+            return {"ok": False, "error": f"FFMPEG 실행 오류: {e}"}
+        finally:
+            self.governor.release(slot)
+            for path in (list_path, partial_path, video_path, audio_path):
+                if path and os.path.exists(path):
+                    os.remove(path)
+        
+        elapsed = time.time() - start_time
+        if error:
+            self.log(f"파일 변환 실패: {file_name}")
+            return {"ok": False, "error": error, "metrics": {"elapsed": elapsed, "peak_rss_mb": peak_rss}}
+        
+        output_size = os.path.getsize(job["output"])
+        self.log(f"파일 변환 완료: {file_name} ({elapsed:.1f}초)")
+        return {
+            "ok": True,
+            "output": job["output"],
+            "metrics": {
+                "elapsed": elapsed,
+                "input_size": sum(os.path.getsize(path) for path, _ in job.get("merge") or [[job["input"], None]]),
+                "output_size": output_size,
+                "frames": last_progress.get("frame"),
+                "peak_rss_mb": peak_rss,
+            },
+        }
+
+
+# 오케스트레이션 성능 측정 설정 (실제 인코더 대신 가짜 ffmpeg / ffprobe 사용)
+BENCHMARK_STUB_LATENCY = 0.05  # 초, 가짜 인코딩 한 건의 평균 소요 시간
+BENCHMARK_STUB_DURATION = 60.0  # 초, 가짜 입력 파일의 영상 길이
+BENCHMARK_CALIBRATION_RUNS = 5  # 가짜 도구 (ffmpeg + ffprobe) 단독 실행 시간 측정 횟수 (오케스트레이션 지연 계산 기준)
+
+# 가짜 ffmpeg / ffprobe (실행 파일 이름으로 동작 구분, 환경 변수로 지연 시간과 실패 비율 조절)
+STUB_TOOL_SOURCE = '''
+import json, os, random, re, sys, time
+
+name = os.path.basename(sys.argv[0])
+args = sys.argv[1:]
+duration = float(os.environ.get("STUB_DURATION", "60"))
+if name.startswith("ffprobe"):
+    # 가짜 ffmpeg가 쓴 출력은 기록한 스트림 정보, 그 외에는 1080p 입력으로 응답
+    try:
+        with open(args[-1], encoding="utf-8") as f:
+            print(json.dumps(json.load(f)))
+    except (OSError, ValueError):
+        print(json.dumps({"streams": [{"codec_type": "video", "codec_name": "h264", "width": 1920, "height": 1080,
+                                       "avg_frame_rate": "30/1"}],
+                          "format": {"duration": str(duration)}}))
+    sys.exit(0)
+if "-version" in args:
+    print("ffmpeg version stub")
+    sys.exit(0)
+
+latency = float(os.environ.get("STUB_LATENCY", "0.05"))
+latency *= random.uniform(1 - float(os.environ.get("STUB_JITTER", "0.5")), 1 + float(os.environ.get("STUB_JITTER", "0.5")))
+steps = max(1, int(latency / float(os.environ.get("STUB_PROGRESS_INTERVAL", "0.02"))))
+sys.stderr.write("Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'stub':\\n  Duration: 00:01:00.00\\n")
+for step in range(1, steps + 1):
+    time.sleep(latency / steps)
+    media = duration * step / steps
+    sys.stderr.write(f"frame={int(media * 30)} fps={30 * duration / max(latency, 0.001):.0f} q=28.0 "
+                     f"size={step * 10}kB time={int(media // 3600):02d}:{int(media % 3600 // 60):02d}:{media % 60:05.2f} "
+                     f"bitrate=300.0kbits/s speed={duration / max(latency, 0.001):.1f}x\\r")
+    sys.stderr.flush()
+if random.random() < float(os.environ.get("STUB_FAILURE_RATE", "0")):
+    sys.stderr.write("\\nstub: simulated encoder failure\\nConversion failed!\\n")
+    sys.exit(1)
+if args and args[-1] != "-":
+    codec = {"libx264": "h264", "libx265": "hevc"}.get(args[args.index("-c:v") + 1] if "-c:v" in args else "")
+    # 자르기 / 정지 화면 제거 / 합치기 필터가 앞뒤에 있어도 마지막 크기 변경의 높이가 출력 높이
+    filters = " ".join(args[index + 1] for index, arg in enumerate(args[:-1]) if arg in ("-vf", "-filter_complex"))
+    scales = re.findall(r"\\bscale=-?\\d+:(\\d+)", filters)
+    height = int(scales[-1]) if scales else 1080
+    with open(args[-1], "w", encoding="utf-8") as f:
+        json.dump({"streams": [{"codec_type": "video", "codec_name": codec, "height": height}],
+                   "format": {"duration": str(duration)}}, f)
+sys.stderr.write("\\n")
+'''
+
+
+def create_stub_tools(directory):
+    """가짜 ffmpeg / ffprobe 실행 파일 생성 (POSIX 전용, 현재 Python 인터프리터로 실행)"""
+    for name in ("ffmpeg", "ffprobe"):
+        path = os.path.join(directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"#!{sys.executable}\n{STUB_TOOL_SOURCE}")
+        os.chmod(path, 0o755)
+
+
+def read_rss_mb():
+    """현재 프로세스의 메모리 사용량 (MB) - /proc/self/status 또는 resource, 확인할 수 없으면 None"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage / (1024 * 1024) if platform.system() == "Darwin" else usage / 1024
+    except ImportError:
+        return None
+
+
+class CountingBatchState(BatchState):
+    """상태 갱신 / 로그 이벤트 수를 세는 배치 상태 (오케스트레이션 성능 측정용)"""
+    
+    def reset(self, file_paths=(), total_duration=0):
+        self.events = 0
+        super().reset(file_paths, total_duration)
+    
+    def log(self, message):
+        self.events += 1
+        super().log(message)
+    
+    def update_job(self, file_path, **fields):
+        self.events += 1
+        super().update_job(file_path, **fields)
+
+
+class HeadlessConverter(MultiFileVideoConverterApp):
+    """Tk 없이 변환 큐를 실행하는 변환기 (오케스트레이션 성능 측정용)
+    
+    변환 스레드가 사용하는 상태만 초기화하고, UI 타이머 대신 호출자가 batch_state.collect_changes()를
+    주기적으로 호출합니다. MoviePy는 PATH의 ffmpeg를 사용하지 않으므로 FFMPEG 직접 호출 방식으로 인코딩합니다.
+    """
+    
+    def __init__(self, file_paths, durations, settings, governor, work_dir):
+        self.root = None
+        self.system = platform.system()
+        self.video_files = list(file_paths)
+        self.video_durations = dict(durations)
+        self.video_sizes = {}
+        self.video_fps = {}
+        self.file_targets = {}
+        self.file_ranges = {}
+        self.file_crops = {}
+        self.file_rate_factors = {}
+        self.memory_single_thread = False
+        self.file_items = {}
+        self.merge_groups = {}
+        self.batch_files = self.video_files
+        self.batch_settings = settings
+        self.governor = governor
+        self.output_cache = None
+        self.encoder_tuner = None
+        self.stager = None
+        self.stop_conversion = False
+        self.output_video_paths = []
+        self.reserved_output_paths = set()
+        self.output_path_lock = threading.Lock()
+        self.throughput_model = ThroughputModel(os.path.join(work_dir, "throughput.json"))
+        self.batch_state = CountingBatchState(self.video_files, sum(self.video_durations.values()))
+        self.conversion_queue = queue.Queue()
+        for file_path in self.video_files:
+            self.conversion_queue.put(file_path)
+        self.finished = None
+    
+    def log(self, message):
+        self.batch_state.log(message)
+    
+    def schedule_ui(self, callback):
+        callback()
+    
+    def finish_batch_ui(self, status, message=None):
+        self.finished = status
+    
+    def encode_video(self, file_path, output_path, slot=None, tier=0):
+        return self.encode_with_ffmpeg(file_path, file_path, output_path, slot, tier)
+    
+    def get_planned_engine(self, file_path):
+        return "ffmpeg"
+
+
+def run_orchestration_benchmark(args):
+    """가짜 ffmpeg / ffprobe로 대량의 작업을 변환 큐에 넣어 오케스트레이션 비용 측정
+    
+    측정 항목: 작업당 오케스트레이션 지연, 상태 이벤트 / UI 갱신 처리량, 작업당 메모리 증가량,
+    중지 요청 후 큐가 멈출 때까지의 시간
+    """
+    if os.name == "nt":
+        print("성능 측정 모드는 POSIX 시스템에서만 지원합니다.")
+        return 1
+    
+    total_jobs = args.benchmark
+    concurrency = args.benchmark_concurrency or max(1, (os.cpu_count() or 1))
+    log = lambda message: print(f"[{time.strftime('%H:%M:%S')}] {message}", flush=True)
+    
+    with tempfile.TemporaryDirectory(prefix="converter_benchmark_") as work_dir:
+        bin_dir = os.path.join(work_dir, "bin")
+        input_dir = os.path.join(work_dir, "input")
+        output_dir = os.path.join(work_dir, "output")
+        for directory in (bin_dir, input_dir, output_dir):
+            os.makedirs(directory)
+        create_stub_tools(bin_dir)
+        os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
+        os.environ.update({
+            "STUB_LATENCY": str(args.stub_latency),
+            "STUB_FAILURE_RATE": str(args.stub_failure_rate),
+            "STUB_DURATION": str(BENCHMARK_STUB_DURATION),
+        })
+        
+        # 큐 / 상태 관리 없이 작업마다 실행하는 가짜 도구만 실행했을 때의 시간 (프로세스 시작 비용 포함)
+        # - 인코딩(ffmpeg)과 출력 검사(ffprobe)
+        calibration_path = os.path.join(work_dir, "calibration.mp4")
+        calibration_start = time.time()
+        for _ in range(BENCHMARK_CALIBRATION_RUNS):
+            subprocess.run(["ffmpeg", "-i", "calibration", calibration_path],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            subprocess.run(["ffprobe", "-v", "error", "-show_streams", "-show_format", "-of", "json", calibration_path],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        stub_seconds = (time.time() - calibration_start) / BENCHMARK_CALIBRATION_RUNS
+        
+        log(f"가짜 입력 파일 {total_jobs:,}개 생성 중...")
+        file_paths = []
+        for index in range(total_jobs):
+            file_path = os.path.join(input_dir, f"clip_{index:06d}.mp4")
+            with open(file_path, "wb") as f:
+                f.write(b"\0" * 1024)
+            file_paths.append(file_path)
+        
+        settings = {
+            "fps": args.fps,
+            "height": args.height,
+            "output_folder": output_dir,
+            "distributed": False,
+            "coordinator_host": args.host,
+            "coordinator_port": args.port,
+            "max_jobs": concurrency,
+        }
+        # 동시 작업 수만 고정하고 부하 상한은 끔 (가짜 인코더 자체의 부하로 측정이 보류되지 않도록)
+        governor = ResourceGovernor(max_jobs=concurrency, low_priority=False, log=log)
+        governor.limit_exceeded = lambda load: None
+        app = HeadlessConverter(file_paths, {path: BENCHMARK_STUB_DURATION for path in file_paths},
+                                settings, governor, work_dir)
+        state = app.batch_state
+        
+        # UI 타이머 대신 같은 주기로 변경 사항을 가져가는 스레드
+        ticks = []  # (소요 시간, 바뀐 작업 수, 로그 수)
+        done = threading.Event()
+        
+        def ui_loop():
+            while not done.wait(UI_REFRESH_INTERVAL_MS / 1000):
+                tick_start = time.perf_counter()
+                jobs, logs, _ = state.collect_changes()
+                ticks.append((time.perf_counter() - tick_start, len(jobs), len(logs)))
+        
+        stop_requested = []
+        
+        def request_stop():
+            stop_requested.append(time.time())
+            app.stop_conversion = True
+        
+        ui_thread = threading.Thread(target=ui_loop, daemon=True)
+        timer = threading.Timer(args.cancel_after, request_stop) if args.cancel_after else None
+        
+        log(f"측정 시작: 작업 {total_jobs:,}개, 동시 작업 {concurrency}개, "
+            f"가짜 인코딩 {args.stub_latency * 1000:.0f} ms, 실패 비율 {args.stub_failure_rate:.0%}")
+        rss_start = read_rss_mb()
+        start_time = time.time()
+        ui_thread.start()
+        if timer:
+            timer.start()
+        app.process_conversion_queue()
+        wall_seconds = time.time() - start_time
+        done.set()
+        ui_thread.join()
+        if timer:
+            timer.cancel()
+        rss_end = read_rss_mb()
+    
+    processed = state.completed_files + state.failed_files
+    ideal_seconds = processed * stub_seconds / concurrency
+    overhead_ms = (wall_seconds - ideal_seconds) * concurrency / max(1, processed) * 1000
+    tick_times = [tick for tick, _, _ in ticks] or [0.0]
+    
+    log(f"처리: {processed:,}/{total_jobs:,}개 (성공 {state.completed_files:,}, 실패 {state.failed_files:,}), "
+        f"{wall_seconds:.1f}초, {processed / wall_seconds:.1f} 작업/초")
+    log(f"오케스트레이션 지연: 작업당 약 {overhead_ms:.1f} ms "
+        f"(가짜 도구 단독 실행 작업당 {stub_seconds * 1000:.0f} ms 기준 예상 {ideal_seconds:.1f}초 대비 "
+        f"{wall_seconds - ideal_seconds:+.1f}초, CPU {os.cpu_count()}개)")
+    log(f"상태 이벤트: {state.events:,}개 ({state.events / wall_seconds:,.0f}개/초), "
+        f"UI 갱신 {len(ticks)}회 (평균 {sum(tick_times) / len(tick_times) * 1000:.2f} ms, "
+        f"최대 {max(tick_times) * 1000:.2f} ms, 갱신당 최대 작업 {max((rows for _, rows, _ in ticks), default=0)}개, "
+        f"로그 {max((lines for _, _, lines in ticks), default=0)}줄)")
+    if rss_start is not None and rss_end is not None:
+        log(f"메모리: {rss_start:.1f} MB -> {rss_end:.1f} MB "
+            f"(작업당 {(rss_end - rss_start) * 1024 * 1024 / max(1, processed):,.0f} 바이트)")
+    if stop_requested:
+        log(f"중지 요청 후 큐 종료까지 {start_time + wall_seconds - stop_requested[0]:.2f}초 "
+            f"(남은 작업 {total_jobs - processed:,}개)")
+    return 0
 
 
 def setup_appearance():
@@ -1036,27 +4857,14 @@ def setup_appearance():
 def check_ffmpeg():
     """FFMPEG 설치 확인"""
     try:
-        import subprocess
-        
         if platform.system() == "Windows":
             startupinfo = subprocess.STARTUPINFO()
             startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            process = subprocess.Popen(
-                ["ffmpeg", "-version"], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                startupinfo=startupinfo
-            )
+            result = run_process(["ffmpeg", "-version"], timeout=30, startupinfo=startupinfo)
         else:
-            process = subprocess.Popen(
-                ["ffmpeg", "-version"], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE
-            )
-        
-        stdout, stderr = process.communicate()
+            result = run_process(["ffmpeg", "-version"], timeout=30)
         
-        if process.returncode == 0:
+        if result["returncode"] == 0:
             # FFMPEG 설치됨
             return True
         else:
@@ -1067,8 +4875,152 @@ def check_ffmpeg():
         return False
 
 
+def parse_arguments(argv=None):
+    """명령행 인자 처리 (인자가 없으면 GUI 실행)"""
+    parser = argparse.ArgumentParser(description=f"{APP_NAME} v{APP_VERSION}")
+    parser.add_argument("files", nargs="*",
+                        help="변환할 동영상 파일 (코디네이터 모드, '파일@00:01:00-00:05:00' 형식으로 구간 지정 가능)")
+    parser.add_argument("--worker", metavar="HOST:PORT", help="워커 모드로 실행하여 코디네이터에서 작업 수신")
+    parser.add_argument("--coordinator", action="store_true", help="GUI 없이 코디네이터 모드로 실행")
+    parser.add_argument("--host", default=DISTRIBUTED_DEFAULT_HOST,
+                        help="코디네이터 수신 주소 (다른 호스트의 워커를 받으려면 0.0.0.0 등으로 지정)")
+    parser.add_argument("--token", default=os.environ.get(DISTRIBUTED_TOKEN_ENV),
+                        help=f"코디네이터 / 워커 인증 토큰 (기본: 환경 변수 {DISTRIBUTED_TOKEN_ENV}, "
+                             f"코디네이터는 없으면 새로 생성)")
+    parser.add_argument("--port", type=int, default=DISTRIBUTED_DEFAULT_PORT, help="코디네이터 포트")
+    parser.add_argument("--height", type=int, default=360, choices=sorted(ENCODING_PARAMS), help="출력 해상도")
+    parser.add_argument("--fps", type=int, default=30, choices=[24, 30], help="출력 프레임 레이트")
+    parser.add_argument("--output", default=os.path.expanduser("~/Downloads"), help="출력 폴더 (공유 파일 시스템)")
+    parser.add_argument("--lease-timeout", type=float, default=LEASE_TIMEOUT, help="하트비트가 없을 때 작업 회수까지의 시간 (초)")
+    parser.add_argument("--auto-crop", action="store_true", help="검은 여백을 자동으로 검출하여 자름")
+    parser.add_argument("--decimate", action="store_true",
+                        help="정지 화면(거의 같은 프레임)을 제거하고 가변 프레임 레이트로 출력")
+    parser.add_argument("--merge", action="store_true", help="입력 파일을 순서대로 이어 하나의 출력으로 변환")
+    parser.add_argument("--benchmark", type=int, metavar="JOBS",
+                        help="가짜 ffmpeg / ffprobe로 지정한 수의 작업을 처리하여 오케스트레이션 비용 측정")
+    parser.add_argument("--benchmark-concurrency", type=int, default=0, help="성능 측정 시 동시 작업 수 (0=CPU 수)")
+    parser.add_argument("--stub-latency", type=float, default=BENCHMARK_STUB_LATENCY,
+                        help="성능 측정 시 가짜 인코딩 한 건의 평균 소요 시간 (초)")
+    parser.add_argument("--stub-failure-rate", type=float, default=0.0, help="성능 측정 시 가짜 인코딩 실패 비율 (0~1)")
+    parser.add_argument("--cancel-after", type=float, default=0, help="성능 측정 시 이 시간(초) 후 변환 중지 요청")
+    parser.add_argument("--estimate", action="store_true", help="변환하지 않고 파일별 / 전체 예상 변환 시간만 출력")
+    return parser.parse_args(argv)
+
+
+def print_estimates(args):
+    """파일별 / 전체 예상 변환 시간 출력"""
+    result = estimate_batch(args.files, args.height)
+    for file_path, seconds in result["files"].items():
+        estimate = format_time(int(seconds)) if seconds else "기록 없음"
+        print(f"{Path(file_path).name}: {estimate}")
+    total = format_time(int(result["total"])) if result["total"] else "기록 없음"
+    print(f"전체 예상 시간: {total}")
+    return 0
+
+
+def run_headless_coordinator(args):
+    """GUI 없이 코디네이터 실행 - 모든 작업이 끝나면 결과 요약 출력"""
+    os.makedirs(args.output, exist_ok=True)
+    
+    model = ThroughputModel()
+    encoder = get_video_codec()[0]
+    jobs = []
+    sources = {}
+    estimates = {}
+    reserved_paths = set()
+    for argument in args.files:
+        # '파일@시작-끝' 형식이면 해당 구간만 변환
+        file_path, time_range = split_file_range(argument)
+        
+        # 원본보다 높은 해상도 / FPS로 변환하지 않도록 출력 목표 제한
+        info = probe_video(file_path)
+        height, fps = clamp_target(args.height, args.fps, *((info["height"], info["fps"]) if info else ()))
+        if (height, fps) != (args.height, args.fps):
+            print(f"원본 기준 출력 제한: {Path(file_path).name} {format_target(args.height, args.fps)} -> "
+                  f"{format_target(height, fps)}", flush=True)
+        
+        output_path = get_unique_output_path(args.output, Path(file_path).stem, height, fps, reserved_paths,
+                                             is_audio_file(file_path))
+        reserved_paths.add(output_path)
+        job = make_conversion_job(os.path.abspath(file_path), output_path, height, fps, time_range,
+                                  args.auto_crop, args.decimate)
+        if info:
+            media_seconds = get_range_duration(info["duration"], time_range)
+            sources[job["id"]] = (info["height"], media_seconds)
+            estimates[job["id"]] = model.estimate(media_seconds, encoder, "medium", info["height"], height)
+        jobs.append(job)
+    
+    # 합치기: 모든 입력을 첫 번째 파일의 출력 목표로 하나의 작업으로 묶음
+    if args.merge and len(jobs) > 1:
+        first = jobs[0]
+        merged = make_conversion_job(first["input"], first["output"], first["height"], first["fps"], first["range"],
+                                     decimate=args.decimate,
+                                     merge_inputs=[(job["input"], job["range"]) for job in jobs])
+        if all(job["id"] in sources for job in jobs):
+            media_seconds = sum(sources[job["id"]][1] for job in jobs)
+            sources[merged["id"]] = (sources[first["id"]][0], media_seconds)
+            estimates[merged["id"]] = model.estimate(media_seconds, encoder, "medium", sources[first["id"]][0],
+                                                     first["height"])
+        print(f"파일 합치기: {' + '.join(Path(job['input']).name for job in jobs)} -> "
+              f"{Path(first['output']).name}", flush=True)
+        jobs = [merged]
+    
+    # 오래 걸리는 작업부터 배분해 마지막에 긴 작업 하나만 남는 상황 방지
+    jobs.sort(key=lambda job: estimates.get(job["id"]) or 0, reverse=True)
+    
+    def on_result(job, result):
+        status = "완료" if result.get("ok") else f"실패 - {result.get('error', '')}"
+        print(f"[{time.strftime('%H:%M:%S')}] {Path(job['input']).name}: {status}", flush=True)
+        elapsed = result.get("metrics", {}).get("elapsed")
+        if not result.get("ok") or job["id"] not in sources:
+            return
+        source_height, media_seconds = sources[job["id"]]
+        if args.decimate:
+            # 정지 화면 제거 모드는 처리 속도가 내용에 따라 달라지므로 기록하지 않음
+            decimation = describe_decimation(media_seconds, job["fps"], result["metrics"].get("frames"))
+            if decimation:
+                dropped, total_frames = decimation
+                print(f"  정지 화면 제거: 프레임 {total_frames:,}개 중 {dropped:,}개 제거", flush=True)
+        elif elapsed:
+            model.record(encoder, "medium", source_height, job["height"], media_seconds, elapsed)
+    
+    log = lambda message: print(f"[{time.strftime('%H:%M:%S')}] {message}", flush=True)
+    coordinator = ConversionCoordinator(jobs, host=args.host, port=args.port, token=args.token,
+                                        lease_timeout=args.lease_timeout, log=log, on_result=on_result)
+    coordinator.start()
+    try:
+        results = coordinator.wait()
+    except KeyboardInterrupt:
+        results = coordinator.results
+    finally:
+        coordinator.stop()
+    
+    succeeded = sum(1 for result in results.values() if result.get("ok"))
+    log(f"모든 파일 변환 완료: {succeeded}/{len(jobs)} 파일 성공")
+    for worker_id, worker in coordinator.workers.items():
+        log(f"워커 {worker_id}: 성공 {worker['completed']}개, 실패 {worker['failed']}개")
+    return 0 if succeeded == len(jobs) else 1
+
+
 def main():
     """메인 함수"""
+    args = parse_arguments()
+    
+    # 워커 / 코디네이터 모드는 GUI 없이 실행
+    if args.worker:
+        if not args.token:
+            print(f"워커 모드에는 코디네이터가 알려준 --token (또는 환경 변수 {DISTRIBUTED_TOKEN_ENV})이 필요합니다.")
+            sys.exit(2)
+        log = lambda message: print(f"[{time.strftime('%H:%M:%S')}] {message}", flush=True)
+        ConversionWorker(parse_address(args.worker), args.token, log=log).run()
+        return
+    if args.benchmark:
+        sys.exit(run_orchestration_benchmark(args))
+    if args.estimate:
+        sys.exit(print_estimates(args))
+    if args.coordinator:
+        sys.exit(run_headless_coordinator(args))
+    
     try:
         # tkinter 애플리케이션 시작
         root = tk.Tk()
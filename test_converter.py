@@ -0,0 +1,331 @@
+"""converter.py의 FFMPEG 없이 실행 가능한 함수 단위 테스트 (python -m pytest)"""
+import pytest
+
+import converter
+
+
+# 시간 문자열 변환 / 구간 지정
+
+@pytest.mark.parametrize("text, seconds", [
+    ("90", 90.0),
+    ("01:30", 90.0),
+    ("00:01:30.5", 90.5),
+    ("1:00:00", 3600.0),
+    ("  12.25 ", 12.25),
+])
+def test_parse_time(text, seconds):
+    assert converter.parse_time(text) == pytest.approx(seconds)
+
+
+def test_parse_time_empty_is_none():
+    assert converter.parse_time("") is None
+    assert converter.parse_time("   ") is None
+
+
+@pytest.mark.parametrize("text", ["abc", "1:xx", "nan", "inf", "1:-30", "-5"])
+def test_parse_time_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        converter.parse_time(text)
+
+
+@pytest.mark.parametrize("seconds, text", [
+    (0, "00:00:00"),
+    (90, "00:01:30"),
+    (3661.5, "01:01:01.50"),
+    (5.999, "00:00:06"),  # 1/100초 반올림이 초 단위로 올라가야 함
+    (59.994, "00:00:59.99"),
+])
+def test_format_time(seconds, text):
+    assert converter.format_time(seconds) == text
+
+
+@pytest.mark.parametrize("seconds", [0, 1.25, 59.99, 3599.5, 86399.01])
+def test_format_time_round_trip(seconds):
+    assert converter.parse_time(converter.format_time(seconds)) == pytest.approx(seconds)
+
+
+def test_parse_time_range():
+    assert converter.parse_time_range("1:00-2:30") == (60.0, 150.0)
+    assert converter.parse_time_range("-30") == (None, 30.0)
+    assert converter.parse_time_range("10-") == (10.0, None)
+
+
+@pytest.mark.parametrize("text", ["30", "2:00-1:00", "10-10"])
+def test_parse_time_range_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        converter.parse_time_range(text)
+
+
+def test_get_range_duration():
+    assert converter.get_range_duration(100, None) == 100
+    assert converter.get_range_duration(100, (10, 40)) == 30
+    assert converter.get_range_duration(100, (None, 40)) == 40
+    assert converter.get_range_duration(100, (90, None)) == 10
+    assert converter.get_range_duration(100, (90, 200)) == 10  # 끝이 길이를 넘으면 길이까지
+
+
+# FFMPEG 진행 줄 파싱
+
+def test_parse_ffmpeg_progress():
+    line = "frame=  240 fps= 48 q=28.0 size=    1024kB time=00:00:08.00 bitrate=1048.6kbits/s speed=1.6x"
+    progress = converter.parse_ffmpeg_progress(line)
+    assert progress == {"time": 8.0, "frame": 240, "fps": 48.0, "speed": 1.6}
+
+
+def test_parse_ffmpeg_progress_missing_fields():
+    progress = converter.parse_ffmpeg_progress("size=0kB time=00:01:00.50 bitrate=N/A speed=N/A")
+    assert progress["time"] == pytest.approx(60.5)
+    assert progress["frame"] is None and progress["fps"] is None and progress["speed"] is None
+
+
+@pytest.mark.parametrize("line", [
+    "Stream #0:0: Video: h264",
+    "frame=    0 fps=0.0 q=0.0 size=0kB time=N/A bitrate=N/A speed=N/A",
+    "",
+])
+def test_parse_ffmpeg_progress_not_progress(line):
+    assert converter.parse_ffmpeg_progress(line) is None
+
+
+# 원본 기준 출력 목표 제한
+
+@pytest.mark.parametrize("target, source, expected", [
+    ((720, 30), (None, None), (720, 30)),          # 원본 정보를 모르면 그대로
+    ((720, 30), (1080, 60), (720, 30)),            # 원본이 더 크면 그대로
+    ((1080, 30), (720, 60), (720, 30)),            # 해상도만 제한
+    ((720, 60), (1080, 29.97), (720, 29.97)),      # FPS만 제한
+    ((1080, 60), (481, 24.0), (480, 24)),          # 홀수 높이는 짝수로, 정수 FPS는 int로
+    ((1080, 30), (720, 23.976023), (720, 23.976)),
+])
+def test_clamp_target(target, source, expected):
+    result = converter.clamp_target(*target, *source)
+    assert result == expected
+    assert type(result[1]) is type(expected[1])
+
+
+def test_get_target_size_even_width():
+    assert converter.get_target_size(1920, 1080, 720) == (1280, 720)
+    assert converter.get_target_size(1080, 1920, 720) == (404, 720)  # 세로 영상
+    width, _ = converter.get_target_size(1000, 1000, 361)
+    assert width % 2 == 0
+
+
+def test_get_cropped_target_size():
+    crop = {"width": 1920, "height": 800, "x": 0, "y": 140, "source_width": 1920, "source_height": 1080}
+    width, height = converter.get_cropped_target_size(crop, 720)
+    assert (width, height) == (1280, 532)
+    assert converter.get_scale_filter(720, crop) == "crop=1920:800:0:140,scale=1280:532"
+
+
+# 해상도 / 품질 단계 / 비트레이트 배율별 인코딩 파라미터
+
+@pytest.mark.parametrize("height, expected", [(1080, 1080), (900, 720), (720, 720), (540, 480), (240, 360)])
+def test_get_encoding_params_step(height, expected):
+    assert converter.get_encoding_params(height) == converter.ENCODING_PARAMS[expected]
+
+
+def test_get_encoding_params_tier():
+    params = converter.get_encoding_params(480, tier=1)
+    assert params["bitrate"] == converter.ENCODING_PARAMS[720]["bitrate"]
+    assert params["crf"] == "22"
+    # 최고 단계를 넘는 tier는 최고 단계 비트레이트에 머묾
+    params = converter.get_encoding_params(1080, tier=3)
+    assert params["bitrate"] == converter.ENCODING_PARAMS[1080]["bitrate"]
+    assert params["crf"] == "18"
+
+
+def test_get_encoding_params_rate_factor():
+    params = converter.get_encoding_params(720, rate_factor=0.5)
+    assert params["bitrate"] == "0.90M"
+    assert params["maxrate"] == "1.00M"
+    assert params["bufsize"] == "1.80M"
+    assert params["crf"] == "30"  # 비트레이트 절반마다 CRF +6
+    assert converter.get_encoding_params(720, rate_factor=1.0) == converter.ENCODING_PARAMS[720]
+
+
+def test_get_encoding_params_does_not_modify_table():
+    before = dict(converter.ENCODING_PARAMS[720])
+    converter.get_encoding_params(720, tier=1, rate_factor=0.75)
+    assert converter.ENCODING_PARAMS[720] == before
+
+
+# 샘플 인코딩 기반 비트레이트 배율 선택
+
+@pytest.fixture
+def tuner(tmp_path):
+    return converter.EncoderTuner(path=str(tmp_path / "tuning.json"), metric="SSIM", threshold=0.95,
+                                  log=lambda message: None)
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / "input.mp4"
+    path.write_bytes(b"\0" * 4096)
+    return str(path)
+
+
+def set_results(tuner, results):
+    calls = []
+    def analyze(*args, **kwargs):
+        calls.append(args)
+        return results
+    tuner.analyze = analyze
+    return calls
+
+
+def test_encoder_tuner_chooses_smallest_passing(tuner, source_file):
+    set_results(tuner, {
+        0.5: {"size": 100, "min": 0.93},
+        0.75: {"size": 150, "min": 0.96},
+        1.0: {"size": 200, "min": 0.98},
+    })
+    assert tuner.choose(source_file, source_file, 720, 30) == (0.75, False)
+
+
+def test_encoder_tuner_keeps_default_when_nothing_passes(tuner, source_file):
+    set_results(tuner, {0.5: {"size": 100, "min": 0.80}, 1.0: {"size": 200, "min": 0.90}})
+    assert tuner.choose(source_file, source_file, 720, 30) == (1.0, False)
+
+
+def test_encoder_tuner_does_not_store_failed_analysis(tuner, source_file):
+    calls = set_results(tuner, {})
+    assert tuner.choose(source_file, source_file, 720, 30) == (1.0, False)
+    assert tuner.choose(source_file, source_file, 720, 30) == (1.0, False)
+    assert len(calls) == 2
+    assert tuner.decisions == {}
+
+
+def test_encoder_tuner_reuses_decision(tuner, source_file, tmp_path):
+    calls = set_results(tuner, {0.5: {"size": 100, "min": 0.97}, 1.0: {"size": 200, "min": 0.99}})
+    assert tuner.choose(source_file, source_file, 720, 30) == (0.5, False)
+    assert tuner.choose(source_file, source_file, 720, 30) == (0.5, True)
+    assert len(calls) == 1
+    # 저장된 결정은 새 인스턴스에서도 사용
+    reloaded = converter.EncoderTuner(path=tuner.path, metric="SSIM", threshold=0.95, log=lambda message: None)
+    set_results(reloaded, {})
+    assert reloaded.choose(source_file, source_file, 720, 30) == (0.5, True)
+    # 분석 조건(해상도)이 다르면 다시 분석
+    assert tuner.choose(source_file, source_file, 480, 30) == (0.5, False)
+    assert len(calls) == 2
+
+
+# 여러 지점의 검은 여백 검출 결과 결합
+
+def fake_crop_detection(monkeypatch, rects, width=1920, height=1080):
+    monkeypatch.setattr(converter, "probe_video",
+                        lambda path: {"duration": 60.0, "width": width, "height": height})
+    windows = iter(rects)  # max_workers=1로 지점 순서대로 호출
+    monkeypatch.setattr(converter, "detect_crop_window", lambda path, start: next(windows))
+
+
+def test_detect_crop_union_of_points(monkeypatch):
+    # 어두운 장면(두 번째)에서 화면 일부만 검출되어도 다른 지점의 영역을 모두 포함
+    fake_crop_detection(monkeypatch, [
+        (1920, 800, 0, 140),
+        (1000, 400, 460, 340),
+        (1920, 804, 0, 138),
+        (1920, 800, 0, 140),
+    ])
+    crop = converter.detect_crop("input.mp4", points=4, max_workers=1)
+    assert crop == {"width": 1920, "height": 804, "x": 0, "y": 138, "source_width": 1920, "source_height": 1080}
+
+
+def test_detect_crop_needs_half_of_points(monkeypatch):
+    fake_crop_detection(monkeypatch, [(1920, 800, 0, 140), None, None, None])
+    assert converter.detect_crop("input.mp4", points=4, max_workers=1) is None
+
+
+def test_detect_crop_ignores_small_saving(monkeypatch):
+    fake_crop_detection(monkeypatch, [(1920, 1072, 0, 4)] * 4)
+    assert converter.detect_crop("input.mp4", points=4, max_workers=1) is None
+
+
+def test_detect_crop_even_size_within_frame(monkeypatch):
+    fake_crop_detection(monkeypatch, [(1921, 803, -2, 139), (1900, 801, 10, 141)])
+    crop = converter.detect_crop("input.mp4", points=2, max_workers=1)
+    assert crop["x"] == 0 and crop["y"] == 139
+    assert crop["width"] % 2 == 0 and crop["height"] % 2 == 0
+    assert crop["x"] + crop["width"] <= 1920 and crop["y"] + crop["height"] <= 1080
+
+
+# 처리 속도 기록 / 변환 시간 예측
+
+@pytest.fixture
+def throughput_model(tmp_path):
+    return converter.ThroughputModel(path=str(tmp_path / "throughput.json"))
+
+
+def test_throughput_estimate_unknown(throughput_model):
+    assert throughput_model.estimate(60, "libx264", "medium", 1080, 720) is None
+    throughput_model.record("libx264", "medium", 1080, 720, 60, 30)
+    assert throughput_model.estimate(60, "libx265", "medium", 1080, 720) is None  # 다른 인코더 기록은 사용 안 함
+    assert throughput_model.estimate(0, "libx264", "medium", 1080, 720) is None
+    assert throughput_model.estimate(60, "libx264", "medium", 0, 720) is None
+
+
+def test_throughput_estimate_exact_and_smoothing(throughput_model):
+    throughput_model.record("libx264", "medium", 1080, 720, 60, 30)  # 2배속
+    assert throughput_model.estimate(120, "libx264", "medium", 1080, 720) == pytest.approx(60)
+    throughput_model.record("libx264", "medium", 1080, 720, 60, 15)  # 4배속
+    speed = (1 - converter.THROUGHPUT_SMOOTHING) * 2 + converter.THROUGHPUT_SMOOTHING * 4
+    assert throughput_model.estimate(120, "libx264", "medium", 1080, 720) == pytest.approx(120 / speed)
+
+
+def test_throughput_estimate_fits_megapixels(throughput_model):
+    megapixels = converter.ThroughputModel.megapixels
+    # 영상 1초당 처리 시간 = 0.1 + 0.2 × 메가픽셀
+    for source, target in ((720, 480), (1080, 720), (2160, 1080)):
+        cost = 0.1 + 0.2 * megapixels(source, target)
+        throughput_model.record("libx264", "medium", source, target, 100, 100 * cost)
+    expected = 60 * (0.1 + 0.2 * megapixels(1440, 720))
+    assert throughput_model.estimate(60, "libx264", "medium", 1440, 720) == pytest.approx(expected)
+
+
+def test_throughput_estimate_single_size_scales_with_pixels(throughput_model):
+    throughput_model.record("libx264", "medium", 1080, 720, 60, 30)
+    megapixels = converter.ThroughputModel.megapixels
+    expected = 30 * megapixels(2160, 1080) / megapixels(1080, 720)
+    assert throughput_model.estimate(60, "libx264", "medium", 2160, 1080) == pytest.approx(expected)
+
+
+def test_throughput_records_persist(throughput_model):
+    throughput_model.record("libx264", "medium", 1080, 720, 60, 30)
+    reloaded = converter.ThroughputModel(path=throughput_model.path)
+    assert reloaded.estimate(60, "libx264", "medium", 1080, 720) == pytest.approx(30)
+
+
+# 작업 단위 메모리 상한
+
+def test_process_memory_group_sums_processes():
+    group = converter.ProcessMemoryGroup(limit_mb=300)
+    assert not group.update(1, 200)
+    assert not group.update(2, 50)
+    assert not group.update(1, None)  # 확인 실패는 이전 값 유지
+    assert group.update(2, 150)  # 200 + 150 > 300
+    assert group.peak_mb == 350
+    group.remove(1)
+    assert group.update(2, 10)  # 한 번 넘으면 그룹 전체가 종료 대상
+
+
+def test_process_memory_group_without_limit_tracks_peak():
+    group = converter.ProcessMemoryGroup()
+    group.update(1, 100)
+    group.update(2, 120)
+    group.remove(1)
+    group.update(2, 50)
+    assert not group.exceeded
+    assert group.peak_mb == 220
+
+
+@pytest.mark.skipif(not converter.os.path.exists("/proc/self/status"), reason="/proc 필요")
+def test_run_split_encode_limits_total_memory(tmp_path):
+    # 각 프로세스는 상한 이하지만 동시에 실행한 합계가 상한을 넘음
+    hog = [converter.sys.executable, "-c",
+           "import sys, time; data = bytearray(120 * 1024 * 1024); data[::4096] = b'x' * len(data[::4096]); "
+           "sys.stderr.write('ready\\n'); sys.stderr.flush(); time.sleep(30)"]
+    mux = [converter.sys.executable, "-c", "pass"]
+    start = converter.time.time()
+    result = converter.run_split_encode(hog, hog, mux, memory_limit_mb=200)
+    assert result["interrupted"] == "memory"
+    assert result["peak_rss_mb"] > 200
+    assert converter.time.time() - start < 20